@@ -0,0 +1,178 @@
+"""Batch validation and statistics over whole solution sets.
+
+With NumPy installed a set is turned into one (S, N) ``uint8`` array, straight
+from the packed ``SolutionStore`` buffer where possible, and every check and
+statistic runs as a handful of array operations: a solution is valid when its
+columns, diagonals and anti-diagonals are each all distinct, the occupancy
+heatmap is a single ``bincount`` over row-major cell numbers, and symmetry
+classes come from comparing each solution with its seven images under the
+board's rotations and reflections. NumPy is optional; without it the same
+results are computed one solution at a time.
+"""
+from collections import Counter, namedtuple
+
+from nqueens_solver import SymmetricSolutionSet, is_valid_solution, symmetries
+from nqueens_store import SolutionStore
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+SetStatistics = namedtuple('SetStatistics', 'count invalid heatmap first_row classes class_sizes')
+
+
+# Columns are held as uint8, like the packed store.
+MAX_ARRAY_N = 255
+
+
+def as_array(solutions, n):
+    """Returns ``solutions`` as an (S, N) ``uint8`` array."""
+    if n > MAX_ARRAY_N:
+        raise ValueError(f"solution arrays are limited to N <= {MAX_ARRAY_N}")
+    if isinstance(solutions, SymmetricSolutionSet):
+        return expand_classes(as_array(solutions.unique, n))
+    if isinstance(solutions, SolutionStore):
+        return _store_array(solutions)
+    array = np.array(list(solutions), dtype=np.uint8)
+    return array.reshape(-1, n)
+
+
+def _store_array(store):
+    records = np.frombuffer(store.view(), dtype=np.uint8).reshape(len(store), store.width)
+    if not store.packed:
+        return records
+    columns = np.empty((len(store), store.width * 2), dtype=np.uint8)
+    columns[:, 0::2] = records >> 4
+    columns[:, 1::2] = records & 0x0F
+    return columns[:, :store.n]
+
+
+def valid_mask(array):
+    """Returns a boolean per solution: True when no two queens attack each other."""
+    count, n = array.shape
+    if n == 0:
+        return np.ones(count, dtype=bool)
+    rows = np.arange(n, dtype=np.int16)
+    columns = array.astype(np.int16)
+    in_range = (columns < n).all(axis=1)
+
+    def distinct(values):
+        ordered = np.sort(values, axis=1)
+        return (ordered[:, 1:] != ordered[:, :-1]).all(axis=1)
+
+    return in_range & distinct(columns) & distinct(columns - rows) & distinct(columns + rows)
+
+
+def first_invalid(n, chunk):
+    """Returns the index of the first invalid solution in packed ``chunk``, or None."""
+    store = SolutionStore(n, chunk)
+    if np is None:
+        for index, solution in enumerate(store):
+            if not is_valid_solution(solution, n):
+                return index
+        return None
+    bad = np.flatnonzero(~valid_mask(_store_array(store)))
+    return int(bad[0]) if len(bad) else None
+
+
+def heatmap(array):
+    """Returns an (N, N) array counting how many solutions use each square."""
+    n = array.shape[1]
+    cells = np.arange(n, dtype=np.int64) * n + array
+    return np.bincount(cells.ravel(), minlength=n * n).reshape(n, n)
+
+
+def first_row_distribution(array):
+    n = array.shape[1]
+    if not len(array):
+        return np.zeros(n, dtype=np.int64)
+    return np.bincount(array[:, 0], minlength=n)
+
+
+def images(array):
+    """Returns the eight symmetric images of every solution, shape (8, S, N).
+
+    Transposing a permutation board is inverting it; together with flipping
+    the rows and mirroring the columns that generates all rotations and
+    reflections.
+    """
+    n = array.shape[1]
+    transposed = np.argsort(array, axis=1).astype(np.uint8)
+    result = []
+    for board in (array, transposed):
+        flipped = board[:, ::-1]
+        result.extend((board, n - 1 - board, flipped, n - 1 - flipped))
+    return np.stack(result)
+
+
+def _keys(boards):
+    # Packs each board into one integer that sorts like the board itself.
+    n = boards.shape[-1]
+    if n > 16:
+        raise ValueError('symmetry keys are limited to N <= 16')
+    shifts = np.arange(n - 1, -1, -1, dtype=np.uint64) * np.uint64(4)
+    return (boards.astype(np.uint64) << shifts).sum(axis=-1, dtype=np.uint64)
+
+
+def class_sizes(array):
+    """Returns the number of distinct images of each solution (1, 2, 4 or 8)."""
+    keys = np.sort(_keys(images(array)), axis=0)
+    return 1 + (keys[1:] != keys[:-1]).sum(axis=0)
+
+
+def canonical_mask(array):
+    """Returns True for solutions that are the smallest of their symmetry class."""
+    keys = _keys(images(array))
+    return keys[0] == keys.min(axis=0)
+
+
+def expand_classes(unique):
+    """Expands one solution per class into every member, in sorted order."""
+    if not len(unique):
+        return unique
+    members = images(unique).reshape(-1, unique.shape[1])
+    return np.unique(members, axis=0)
+
+
+def analyze(solutions, n):
+    """Returns ``SetStatistics`` for a whole solution set.
+
+    ``invalid`` lists the indices of invalid solutions, which are left out of
+    the other statistics; ``classes`` is the number of symmetry classes and
+    ``class_sizes`` counts classes by size.
+    """
+    if np is None or n > MAX_ARRAY_N:
+        return _analyze_python(solutions, n)
+    array = as_array(solutions, n)
+    valid = valid_mask(array)
+    invalid = np.flatnonzero(~valid).tolist()
+    if invalid:
+        array = array[valid]
+    sizes = Counter()
+    classes = 0
+    if len(array) and n <= 16:
+        canonical = canonical_mask(array)
+        classes = int(canonical.sum())
+        sizes = Counter(class_sizes(array[canonical]).tolist())
+    return SetStatistics(len(valid), invalid, heatmap(array).tolist(), first_row_distribution(array).tolist(),
+                         classes, sizes)
+
+
+def _analyze_python(solutions, n):
+    counts = [[0] * n for _ in range(n)]
+    invalid = []
+    sizes = Counter()
+    total = 0
+    for index, solution in enumerate(solutions):
+        total += 1
+        if not is_valid_solution(solution, n):
+            invalid.append(index)
+            continue
+        for row, col in enumerate(solution):
+            counts[row][col] += 1
+        members = symmetries(solution)
+        if tuple(solution) == min(members):
+            sizes[len(set(members))] += 1
+    first_row = counts[0][:] if n else []
+    return SetStatistics(total, invalid, counts, first_row, sum(sizes.values()), sizes)
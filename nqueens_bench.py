@@ -0,0 +1,240 @@
+"""Benchmarks for the solver, conflict tracking, board widgets and solution storage.
+
+Each benchmark reports named metrics with a unit and whether higher or lower
+is better. Results are written as JSON and, given a baseline from an earlier
+run, compared metric by metric; anything worse than the baseline by more than
+the tolerance is reported as a regression and makes the run exit non-zero.
+
+The board benchmarks need Kivy and open a hidden window; they are skipped
+when Kivy cannot be imported.
+
+    python nqueens_bench.py --output bench.json --baseline bench-baseline.json
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from time import perf_counter
+
+from nqueens_solver import ConflictIndex, SearchStats, get_engine, solve_bitmask
+from nqueens_store import SolutionStore
+
+DEFAULT_TOLERANCE = 0.15
+
+
+class Results:
+    def __init__(self):
+        self.metrics = {}
+
+    def add(self, name, value, unit, better):
+        self.metrics[name] = {'value': value, 'unit': unit, 'better': better}
+
+    def to_json(self):
+        return {
+            'meta': {
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'machine': platform.machine(),
+                'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            },
+            'metrics': self.metrics,
+        }
+
+
+def timed(func, min_time=0.2):
+    """Returns the best time of ``func()`` over repeated runs lasting ``min_time``."""
+    best = float('inf')
+    spent = 0.0
+    runs = 0
+    while spent < min_time or runs < 3:
+        start = perf_counter()
+        func()
+        elapsed = perf_counter() - start
+        best = min(best, elapsed)
+        spent += elapsed
+        runs += 1
+        if spent > 10 * min_time:
+            break
+    return best
+
+
+def bench_solver(results, sizes, engine='bitmask'):
+    solve = get_engine(engine)
+    for n in sizes:
+        totals = {}
+
+        def run():
+            stats = SearchStats()
+            totals['solutions'] = sum(1 for _ in solve(n, (), stats))
+            totals['nodes'] = stats.nodes
+
+        elapsed = timed(run)
+        prefix = f'solver.{engine}.n{n}'
+        results.add(f'{prefix}.solutions_per_s', totals['solutions'] / elapsed, 'solutions/s', 'higher')
+        results.add(f'{prefix}.nodes_per_s', totals['nodes'] / elapsed, 'nodes/s', 'higher')
+
+
+def bench_conflicts(results, queen_counts, clicks=2000, seed=0):
+    # One click is a queen placed and then removed again, as toggling a
+    # square twice does on the board.
+    rng = random.Random(seed)
+    for count in queen_counts:
+        n = max(8, count)
+        index = ConflictIndex()
+        while len(index) < count:
+            square = (rng.randrange(n), rng.randrange(n))
+            if square not in index:
+                index.add(square)
+        squares = []
+        while len(squares) < clicks:
+            square = (rng.randrange(n), rng.randrange(n))
+            if square not in index:
+                squares.append(square)
+
+        def run():
+            for square in squares:
+                index.add(square)
+                index.remove(square)
+
+        elapsed = timed(run)
+        results.add(f'conflicts.queens{count}.click_us', elapsed / clicks * 1e6, 'us', 'lower')
+
+
+def bench_store_memory(results, sizes):
+    for n in sizes:
+        solutions = list(solve_bitmask(n))
+        tracemalloc.start()
+        store = SolutionStore.from_solutions(n, solutions)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        results.add(f'store.n{n}.peak_bytes', peak, 'bytes', 'lower')
+        results.add(f'store.n{n}.bytes_per_solution', store.nbytes / max(1, len(store)), 'bytes', 'lower')
+        tracemalloc.start()
+        copied = [list(solution) for solution in solutions]
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del copied
+        results.add(f'store.n{n}.list_peak_bytes', peak, 'bytes', 'lower')
+
+
+def load_kivy():
+    os.environ.setdefault('KIVY_NO_ARGS', '1')
+    os.environ.setdefault('KIVY_NO_CONSOLELOG', '1')
+    try:
+        from kivy.config import Config
+        Config.set('graphics', 'window_state', 'hidden')
+        from kivy.core.window import Window
+        import nqueens_gui
+    except Exception as error:  # Kivy missing or no usable window provider
+        return None, error
+    if Window is None:
+        return None, RuntimeError('no window provider')
+    return nqueens_gui, None
+
+
+def bench_boards(results, sizes):
+    gui, error = load_kivy()
+    if gui is None:
+        print(f"skipping board benchmarks: {error}", file=sys.stderr)
+        return
+    for board_class in (gui.NQueensBoard, gui.CanvasBoard):
+        name = board_class.__name__
+        for n in sizes:
+            if n > board_class.max_size:
+                continue
+            solution = next(iter(solve_bitmask(n)), None)
+            results.add(f'board.{name}.n{n}.build_s', timed(lambda: board_class(n), 0.1), 's', 'lower')
+            board = board_class(max(4, n // 2))
+
+            def resize():
+                board.change_board_size(n)
+                board.change_board_size(max(4, n // 2))
+
+            results.add(f'board.{name}.n{n}.resize_s', timed(resize, 0.1) / 2, 's', 'lower')
+            if solution is None:
+                continue
+            board.change_board_size(n)
+            board.all_solutions = [solution]
+            results.add(f'board.{name}.n{n}.show_solution_s',
+                        timed(lambda: board.show_solution(0, animate=False), 0.1), 's', 'lower')
+
+
+def compare(current, baseline, tolerance=DEFAULT_TOLERANCE):
+    """Returns ``(name, baseline, current, change)`` for every regressed metric.
+
+    ``change`` is the relative change in the worse direction, e.g. 0.2 for
+    20% slower.
+    """
+    regressions = []
+    for name, metric in current['metrics'].items():
+        old = baseline.get('metrics', {}).get(name)
+        if old is None or not old['value']:
+            continue
+        ratio = metric['value'] / old['value']
+        change = 1 - ratio if metric['better'] == 'higher' else ratio - 1
+        if change > tolerance:
+            regressions.append((name, old['value'], metric['value'], change))
+    return regressions
+
+
+def run(args):
+    results = Results()
+    parts = set(args.only or ['solver', 'conflicts', 'boards', 'memory'])
+    if 'solver' in parts:
+        bench_solver(results, range(args.min_n, args.max_n + 1), args.engine)
+    if 'conflicts' in parts:
+        bench_conflicts(results, [4, 8, 16, 64, 256])
+    if 'memory' in parts:
+        bench_store_memory(results, [n for n in (8, 10, 12) if n <= args.max_n])
+    if 'boards' in parts:
+        bench_boards(results, [4, 8, 12, 32, 64])
+    return results.to_json()
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='nqueens-bench', description='Benchmark the N-Queens solver and board.')
+    parser.add_argument('--output', '-o', default='-', help="where to write the JSON results, '-' for stdout")
+    parser.add_argument('--baseline', help='JSON results to compare against')
+    parser.add_argument('--save-baseline', action='store_true', help='also write the results to --baseline')
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help='relative slowdown reported as a regression (default 0.15)')
+    parser.add_argument('--min-n', type=int, default=4)
+    parser.add_argument('--max-n', type=int, default=14)
+    parser.add_argument('--engine', default='bitmask')
+    parser.add_argument('--only', action='append', choices=['solver', 'conflicts', 'boards', 'memory'],
+                        help='run only this part (repeatable)')
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    current = run(args)
+    text = json.dumps(current, indent=2, sort_keys=True)
+    if args.output == '-':
+        print(text)
+    else:
+        with open(args.output, 'w') as f:
+            f.write(text + '\n')
+    if not args.baseline:
+        return 0
+    if args.save_baseline or not os.path.exists(args.baseline):
+        with open(args.baseline, 'w') as f:
+            f.write(text + '\n')
+        print(f"baseline written to {args.baseline}", file=sys.stderr)
+        return 0
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    regressions = compare(current, baseline, args.tolerance)
+    for name, old, new, change in regressions:
+        print(f"REGRESSION {name}: {old:.4g} -> {new:.4g} ({change:+.0%} worse)", file=sys.stderr)
+    if not regressions:
+        print(f"no regressions against {args.baseline}", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,233 @@
+"""On-disk cache of solved boards.
+
+Each completed solution set is written to ``<kind>-<n>.nqs`` in the cache
+directory: a fixed header (magic, version, kind, N, solution count and CRC-32 of
+the payload) followed by the raw ``SolutionStore`` bytes. Cached files are
+memory-mapped on load so even very large sets open immediately and are paged
+in as solutions are visited. Files that fail the header, size or checksum
+checks are deleted and treated as a miss, and the least recently used files are
+evicted once the directory grows past its size budget.
+
+The per-prefix solution counts behind ``SolutionIndex`` are kept alongside as
+``counts-<n>.nqs``, under the same header with its own magic and the prefix
+depth in place of the kind.
+"""
+import mmap
+import os
+import struct
+import sys
+import tempfile
+import zlib
+from array import array
+
+from nqueens_store import SolutionStore, record_width
+
+HEADER = struct.Struct('<4sBBHQI')
+MAGIC = b'NQSS'
+COUNTS_MAGIC = b'NQPC'
+VERSION = 1
+KINDS = {'all': 0, 'unique': 1, 'import': 2}
+SUFFIX = '.nqs'
+DEFAULT_BUDGET = 512 * 1024 * 1024
+
+
+def default_cache_dir():
+    if os.environ.get('NQUEENS_CACHE_DIR'):
+        return os.environ['NQUEENS_CACHE_DIR']
+    if sys.platform == 'win32':
+        base = os.environ.get('LOCALAPPDATA') or os.path.expanduser('~')
+    elif sys.platform == 'darwin':
+        base = os.path.expanduser('~/Library/Caches')
+    else:
+        base = os.environ.get('XDG_CACHE_HOME') or os.path.expanduser('~/.cache')
+    return os.path.join(base, 'nqueens')
+
+
+class _OverBudget(Exception):
+    pass
+
+
+def _checksum(data):
+    return zlib.crc32(data) & 0xFFFFFFFF
+
+
+class SolutionCache:
+    def __init__(self, directory=None, budget_bytes=DEFAULT_BUDGET):
+        self.directory = directory or default_cache_dir()
+        self.budget_bytes = budget_bytes
+
+    def path(self, n, kind='all'):
+        if kind not in KINDS:
+            raise ValueError(f"unknown cache kind {kind!r}")
+        return os.path.join(self.directory, f"{kind}-{n}{SUFFIX}")
+
+    def load(self, n, kind='all', verify=True):
+        path = self.path(n, kind)
+        try:
+            with open(path, 'rb') as f:
+                size = os.fstat(f.fileno()).st_size
+                if size < HEADER.size:
+                    raise ValueError('truncated header')
+                magic, version, kind_id, file_n, count, checksum = HEADER.unpack(f.read(HEADER.size))
+                if (magic, version, kind_id, file_n) != (MAGIC, VERSION, KINDS[kind], n):
+                    raise ValueError('header does not match')
+                if size != HEADER.size + count * record_width(n):
+                    raise ValueError('payload size does not match solution count')
+                if count == 0:
+                    payload = b''
+                else:
+                    mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                    payload = memoryview(mapped)[HEADER.size:]
+                if verify and _checksum(payload) != checksum:
+                    raise ValueError('checksum mismatch')
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError):
+            self._discard(path)
+            return None
+        self._touch(path)
+        return SolutionStore(n, payload)
+
+    def save(self, n, store, kind='all'):
+        payload = store.tobytes()
+        header = HEADER.pack(MAGIC, VERSION, KINDS[kind], n, len(store), _checksum(payload))
+        return self._write(self.path(n, kind), header, payload)
+
+    def save_stream(self, n, chunks, kind='all'):
+        """Saves a set arriving as chunks of packed records without holding it in memory.
+
+        The header is rewritten with the final count and checksum once the
+        last chunk is in. Returns False, keeping nothing, when the set outgrows
+        the size budget.
+        """
+        width = record_width(n)
+        os.makedirs(self.directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(HEADER.pack(MAGIC, VERSION, KINDS[kind], n, 0, 0))
+                size = HEADER.size
+                checksum = 0
+                for chunk in chunks:
+                    size += len(chunk)
+                    if size > self.budget_bytes:
+                        raise _OverBudget
+                    f.write(chunk)
+                    checksum = zlib.crc32(chunk, checksum)
+                f.seek(0)
+                f.write(HEADER.pack(MAGIC, VERSION, KINDS[kind], n, (size - HEADER.size) // width,
+                                    checksum & 0xFFFFFFFF))
+            os.replace(tmp_path, self.path(n, kind))
+        except _OverBudget:
+            self._discard(tmp_path)
+            return False
+        except BaseException:
+            self._discard(tmp_path)
+            raise
+        self.evict(keep=self.path(n, kind))
+        return True
+
+    def remove(self, n, kind='all'):
+        return self._discard(self.path(n, kind))
+
+    def counts_path(self, n):
+        return os.path.join(self.directory, f"counts-{n}{SUFFIX}")
+
+    def load_counts(self, n):
+        """Returns ``(depth, prefixes, counts)`` saved for ``n``, or None."""
+        path = self.counts_path(n)
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+            if len(data) < HEADER.size:
+                raise ValueError('truncated header')
+            magic, version, depth, file_n, count, checksum = HEADER.unpack_from(data)
+            if (magic, version, file_n) != (COUNTS_MAGIC, VERSION, n) or not 0 < depth <= n:
+                raise ValueError('header does not match')
+            payload = memoryview(data)[HEADER.size:]
+            if len(payload) != count * (depth + 8):
+                raise ValueError('payload size does not match prefix count')
+            if _checksum(payload) != checksum:
+                raise ValueError('checksum mismatch')
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError):
+            self._discard(path)
+            return None
+        self._touch(path)
+        counts = array('Q')
+        counts.frombytes(payload[count * depth:])
+        if sys.byteorder != 'little':
+            counts.byteswap()
+        return depth, bytes(payload[:count * depth]), counts
+
+    def save_counts(self, n, depth, prefixes, counts):
+        counts = array('Q', counts)
+        if sys.byteorder != 'little':
+            counts.byteswap()
+        payload = bytes(prefixes) + counts.tobytes()
+        header = HEADER.pack(COUNTS_MAGIC, VERSION, depth, n, len(counts), _checksum(payload))
+        return self._write(self.counts_path(n), header, payload)
+
+    def _write(self, path, header, payload):
+        if len(header) + len(payload) > self.budget_bytes:
+            return False
+        os.makedirs(self.directory, exist_ok=True)
+        # Write to a temporary file and rename it into place so readers never
+        # see a partially written set.
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(header)
+                f.write(payload)
+            os.replace(tmp_path, path)
+        except OSError:
+            self._discard(tmp_path)
+            raise
+        self.evict(keep=path)
+        return True
+
+    def entries(self):
+        try:
+            names = os.listdir(self.directory)
+        except FileNotFoundError:
+            return []
+        entries = []
+        for name in names:
+            if not name.endswith(SUFFIX):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        return sorted(entries)
+
+    def evict(self, keep=None):
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.budget_bytes:
+                break
+            if path == keep:
+                continue
+            if self._discard(path):
+                total -= size
+
+    def clear(self):
+        for _, _, path in self.entries():
+            self._discard(path)
+
+    def _touch(self, path):
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+    def _discard(self, path):
+        try:
+            os.remove(path)
+        except OSError:
+            return False
+        return True
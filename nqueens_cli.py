@@ -0,0 +1,319 @@
+"""Command-line interface for the N-Queens solver.
+
+Only the Kivy-free solver modules are imported here, so batch commands start
+immediately. Kivy is imported only when the ``gui`` command (the default when
+no command is given) actually launches the visualizer.
+
+Solutions are written one per line as space-separated 1-based column numbers,
+matching the "Columns" display in the visualizer; ``--zero-based`` switches to
+0-based columns. ``export`` can also write the compact binary format of
+``nqueens_io``, optionally gzip-compressed. ``count`` and ``solve`` accept
+board variants (``--block ROW,COL`` and ``--toroidal``), which are solved by
+the Dancing Links engine. ``serve`` runs the local solver daemon of
+``nqueens_service``, and ``--service`` lets ``count`` and ``solve`` ask it
+first, solving in-process when it is not running.
+"""
+import argparse
+import io
+import os
+import sys
+from functools import partial
+
+from nqueens_solver import (
+    DEFAULT_ENGINE, ENGINES, FIRST_SOLUTION_METHODS, count_bitmask, count_parallel, first_solution,
+    get_engine, is_valid_solution, iter_unique, load_index, solve_parallel
+)
+from nqueens_cache import SolutionCache
+from nqueens_dlx import make_variant, solve_dlx
+from nqueens_io import (FORMATS, MAGIC, export_solutions, format_solution, open_input, parse_solution,
+                        read_records, validated)
+from nqueens_store import record_width
+
+
+def parse_square(text):
+    try:
+        row, col = (int(part) - 1 for part in text.split(','))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected ROW,COL, got {text!r}") from None
+    return row, col
+
+
+def board_variant(args):
+    if not args.block and not args.toroidal:
+        return None
+    for row, col in args.block:
+        if not (0 <= row < args.n and 0 <= col < args.n):
+            raise SystemExit(f"nqueens: error: square {row + 1},{col + 1} is off the {args.n}x{args.n} board")
+    if args.symmetric:
+        raise SystemExit('nqueens: error: --symmetric cannot be combined with --block or --toroidal')
+    return make_variant(args.n, args.block, toroidal=args.toroidal)
+
+
+def remote_solutions(args):
+    """Returns the daemon's ``RemoteSolutions`` for a plain ``--service`` request, else None."""
+    if not args.service or args.symmetric or args.engine == 'dlx':
+        return None
+    # The service client (and asyncio with it) is only loaded when asked for.
+    from nqueens_service import PAGE_SIZE, RemoteSolutions, ServiceUnavailable, SolverClient
+    client = SolverClient()
+    try:
+        count = client.count(args.n)
+    except ServiceUnavailable:
+        print("nqueens: solver service not running; solving locally", file=sys.stderr)
+        return None
+    except ValueError as error:
+        print(f"nqueens: solver service: {error}; solving locally", file=sys.stderr)
+        return None
+    # Should the daemon stop mid-stream, carry on from the cached set or else
+    # a local index.
+    return RemoteSolutions(client, args.n, count, PAGE_SIZE, fallback=partial(local_solutions, args.n))
+
+
+def local_solutions(n):
+    cache = SolutionCache()
+    solutions = cache.load(n)
+    return solutions if solutions is not None else load_index(n, cache)[0]
+
+
+def iter_solutions(args):
+    variant = board_variant(args)
+    if variant is not None:
+        return solve_dlx(args.n, variant=variant)
+    remote = remote_solutions(args)
+    if remote is not None:
+        return remote
+    if args.workers > 1:
+        solutions = solve_parallel(args.n, args.workers, engine=args.engine, symmetric=args.symmetric)
+        return solutions.unique if args.symmetric else solutions
+    if args.symmetric:
+        return iter_unique(args.n, args.engine)
+    return get_engine(args.engine)(args.n)
+
+
+def write_solutions(solutions, out, fmt='text', zero_based=False, limit=None):
+    written = 0
+    for solution in solutions:
+        if limit is not None and written >= limit:
+            break
+        out.write(format_solution(solution, fmt, zero_based))
+        out.write('\n')
+        written += 1
+    return written
+
+
+def cmd_count(args):
+    variant = board_variant(args)
+    remote = remote_solutions(args) if variant is None else None
+    if variant is not None:
+        total = sum(1 for _ in solve_dlx(args.n, variant=variant))
+    elif remote is not None:
+        total = len(remote)
+    elif args.symmetric:
+        total = sum(1 for _ in iter_unique(args.n, args.engine))
+    elif args.workers > 1:
+        total = count_parallel(args.n, workers=args.workers)
+    else:
+        total = count_bitmask(args.n)
+    print(total)
+    return 0
+
+
+def cmd_solve(args):
+    write_solutions(iter_solutions(args), sys.stdout, args.format, args.zero_based, args.limit)
+    return 0
+
+
+def cmd_first(args):
+    if args.method is not None:
+        try:
+            solution = first_solution(args.n, args.method)
+        except ValueError as error:
+            print(f"nqueens: {error}", file=sys.stderr)
+            return 1
+        if solution is not None:
+            print(format_solution(solution, args.format, args.zero_based))
+            return 0
+    for solution in get_engine(args.engine)(args.n):
+        print(format_solution(solution, args.format, args.zero_based))
+        return 0
+    print(f"No solutions for N={args.n}", file=sys.stderr)
+    return 1
+
+
+def cmd_validate(args):
+    try:
+        binary = open_input(args.file)
+        if binary.peek(len(MAGIC))[:len(MAGIC)] == MAGIC:
+            return validate_binary(binary, args)
+        return validate_text(binary, args)
+    except OSError as error:
+        print(f"nqueens: {error}", file=sys.stderr)
+        return 1
+
+
+def validate_text(binary, args):
+    source = io.TextIOWrapper(binary, encoding='utf-8')
+    checked = invalid = 0
+    with source:
+        for line_number, line in enumerate(source, 1):
+            if not line.strip() or line.lstrip().startswith('#'):
+                continue
+            checked += 1
+            try:
+                solution = parse_solution(line, args.zero_based)
+            except ValueError:
+                solution = None
+            if solution is None or not is_valid_solution(solution, args.n):
+                invalid += 1
+                print(f"line {line_number}: invalid solution: {line.strip()}", file=sys.stderr)
+    print(f"{checked - invalid}/{checked} valid")
+    return 1 if invalid else 0
+
+
+def validate_binary(f, args):
+    # Binary sets are checked in bulk and stop at the first bad record.
+    with f:
+        try:
+            n, chunks = read_records(f, args.n)
+            checked = 0
+            for chunk in validated(n, chunks):
+                checked += len(chunk) // record_width(n)
+        except ValueError as error:
+            print(f"invalid solution set: {error}", file=sys.stderr)
+            return 1
+    print(f"{checked}/{checked} valid")
+    return 0
+
+
+def cmd_export(args):
+    cache = None if args.no_cache else SolutionCache()
+    try:
+        written = export_solutions(args.output, args.n, args.format, args.compress, args.engine, args.symmetric,
+                                   cache, args.zero_based)
+    except (OSError, ValueError) as error:
+        print(f"nqueens: {error}", file=sys.stderr)
+        return 1
+    print(f"Exported {written} solutions for N={args.n}", file=sys.stderr)
+    return 0
+
+
+def cmd_bench(args):
+    from nqueens_bench import main as bench_main
+    return bench_main(args.bench_args)
+
+
+def cmd_serve(args):
+    try:
+        from nqueens_service import MAX_N, run_server
+        run_server(args.address, SolutionCache(), args.workers, args.max_n or MAX_N)
+    except (OSError, ValueError) as error:
+        print(f"nqueens: {error}", file=sys.stderr)
+        return 1
+    return 0
+
+
+def cmd_gui(args):
+    # Keep Kivy from parsing our command line as its own.
+    os.environ.setdefault('KIVY_NO_ARGS', '1')
+    from nqueens_gui import run
+    run()
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='nqueens', description='Solve and inspect N-Queens boards.')
+    commands = parser.add_subparsers(dest='command')
+
+    def board_options(command, positional=True):
+        if positional:
+            command.add_argument('n', type=int, help='board size')
+        else:
+            command.add_argument('--n', '-n', type=int, required=True, help='board size')
+        command.add_argument('--engine', choices=list(ENGINES), default=DEFAULT_ENGINE)
+
+    def output_options(command, formats=('text', 'csv', 'ndjson')):
+        command.add_argument('--format', choices=list(formats), default='text')
+        command.add_argument('--zero-based', action='store_true', help='write 0-based columns')
+
+    def variant_options(command):
+        command.add_argument('--block', type=parse_square, action='append', default=[], metavar='ROW,COL',
+                             help='square (1-based) that cannot hold a queen; repeatable')
+        command.add_argument('--toroidal', action='store_true', help='let diagonals wrap around the board edges')
+
+    def service_option(command):
+        command.add_argument('--service', action='store_true',
+                             help='ask the solver service (see serve) first; plain boards only')
+
+    count = commands.add_parser('count', help='print the number of solutions')
+    board_options(count)
+    count.add_argument('--symmetric', action='store_true', help='count unique solutions up to symmetry')
+    count.add_argument('--workers', type=int, default=1, help='processes to split the search across')
+    variant_options(count)
+    service_option(count)
+    count.set_defaults(func=cmd_count)
+
+    solve = commands.add_parser('solve', help='print solutions')
+    board_options(solve, positional=False)
+    output_options(solve)
+    solve.add_argument('--symmetric', action='store_true', help='only print one solution per symmetry class')
+    solve.add_argument('--limit', type=int, help='stop after this many solutions')
+    solve.add_argument('--workers', type=int, default=1,
+                       help='processes to split the search across (by first two rows above N=8)')
+    variant_options(solve)
+    service_option(solve)
+    solve.set_defaults(func=cmd_solve)
+
+    first = commands.add_parser('first', help='print the first solution')
+    board_options(first)
+    output_options(first)
+    first.add_argument('--method', choices=list(FIRST_SOLUTION_METHODS),
+                       help='construct or repair a solution instead of searching; constructive handles any N, '
+                            'min-conflicts up to 100,000, dlx up to 250 and backtracking up to 27')
+    first.set_defaults(func=cmd_first)
+
+    validate = commands.add_parser('validate', help='check solutions read from a file or stdin (text or binary)')
+    validate.add_argument('file', nargs='?', default='-')
+    validate.add_argument('--n', '-n', type=int, help='required board size')
+    validate.add_argument('--zero-based', action='store_true', help='read 0-based columns')
+    validate.set_defaults(func=cmd_validate)
+
+    export = commands.add_parser('export', help='write all solutions to a file')
+    board_options(export)
+    output_options(export, FORMATS)
+    export.add_argument('--output', '-o', default='-', help="output path, '-' for stdout")
+    export.add_argument('--compress', action='store_true', help='gzip the output')
+    export.add_argument('--no-cache', action='store_true', help='always search instead of reading cached sets')
+    export.add_argument('--symmetric', action='store_true', help='only export one solution per symmetry class')
+    export.set_defaults(func=cmd_export)
+
+    bench = commands.add_parser('bench', help='run the benchmark suite (see nqueens_bench.py --help)',
+                                add_help=False)
+    bench.add_argument('bench_args', nargs=argparse.REMAINDER)
+    bench.set_defaults(func=cmd_bench)
+
+    serve = commands.add_parser('serve', help='run the local solver service shared by visualizers and scripts')
+    serve.add_argument('--address', help='unix:PATH or HOST:PORT (default: NQUEENS_SERVICE, else a socket '
+                                         'in the cache directory)')
+    serve.add_argument('--workers', type=int, default=1, help='processes used to count a new board size')
+    serve.add_argument('--max-n', type=int, help='largest board size served (default 16)')
+    serve.set_defaults(func=cmd_serve)
+
+    gui = commands.add_parser('gui', help='launch the visualizer (default)')
+    gui.set_defaults(func=cmd_gui)
+    return parser
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if argv[:1] == ['bench']:
+        # The benchmark suite parses its own options, which argparse would
+        # otherwise try to match against ours.
+        return cmd_bench(argparse.Namespace(bench_args=argv[1:]))
+    args = build_parser().parse_args(argv)
+    if args.command is None:
+        return cmd_gui(args)
+    return args.func(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
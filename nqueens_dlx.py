@@ -0,0 +1,220 @@
+"""Dancing Links (Algorithm X) exact-cover engine for board variants.
+
+Placing N queens is an exact cover problem: every row and every column must
+hold exactly one queen (primary items) and every diagonal and anti-diagonal
+at most one (secondary items). Each open square is an option covering its
+four items. Knuth's Algorithm X picks the primary item with the fewest
+options left, tries each in turn and undoes its choice by relinking the
+removed nodes; the links live in flat lists rather than node objects.
+
+Variants only change which options exist, so they are given as a
+``Variant``: one bitmask of open columns per row (blocked squares cleared,
+pre-placed queens leaving a single bit) plus whether diagonals wrap around
+a toroidal board. Blocked squares cannot hold a queen but do not stop
+attacks.
+
+Solutions come out in search order, not lexicographic order.
+
+Finding one solution has a heavy tail: most searches finish almost at once,
+but a few wander for minutes. ``first_dlx_solution`` cuts each attempt off
+after a node budget and retries with a shuffled option order and a larger
+budget, the usual randomized-restart remedy.
+"""
+import random
+from collections import namedtuple
+from itertools import count
+
+Variant = namedtuple('Variant', 'masks toroidal')
+
+
+def make_variant(n, blocked=(), fixed=(), toroidal=False):
+    """Returns the ``Variant`` for an N board with blocked squares and pre-placed queens."""
+    full = (1 << n) - 1
+    masks = [full] * n
+    for row, col in blocked:
+        masks[row] &= ~(1 << col)
+    for row, col in fixed:
+        masks[row] &= 1 << col
+    return Variant(tuple(masks), toroidal)
+
+
+def is_plain(variant, n):
+    return variant is None or (not variant.toroidal and all(mask == (1 << n) - 1 for mask in variant.masks))
+
+
+def _items(n, row, col, toroidal):
+    # Rows are items 1..n and columns n+1..2n (primary); diagonals and
+    # anti-diagonals follow as secondary items.
+    if toroidal:
+        diagonal, anti_diagonal = (col - row) % n, (col + row) % n
+        lines = n
+    else:
+        diagonal, anti_diagonal = col - row + n - 1, col + row
+        lines = 2 * n - 1
+    first = 2 * n + 1
+    return 1 + row, 1 + n + col, first + diagonal, first + lines + anti_diagonal
+
+
+def solve_dlx(n, prefix=(), stats=None, variant=None, max_nodes=None, seed=None):
+    """Yields every solution, with the first ``len(prefix)`` rows fixed.
+
+    Takes the same arguments as the other engines plus an optional
+    ``Variant``; without one it solves the plain N×N problem. The search
+    stops early after ``max_nodes`` placements, and a ``seed`` shuffles the
+    order in which each row's squares are tried.
+    """
+    if n < 1:
+        return
+    toroidal = variant.toroidal if variant is not None else False
+    full = (1 << n) - 1
+    masks = list(variant.masks) if variant is not None else [full] * n
+    for row, col in enumerate(prefix):
+        masks[row] &= 1 << col
+    lines = n if toroidal else 2 * n - 1
+    item_count = 2 * n + 2 * lines
+    # Node 0 is the root, nodes 1..item_count the item headers; option nodes
+    # follow in groups of four.
+    left = list(range(-1, item_count))
+    right = list(range(1, item_count + 2))
+    left[0], right[2 * n] = 2 * n, 0
+    for item in range(2 * n + 1, item_count + 1):
+        left[item] = right[item] = item
+    up = list(range(item_count + 1))
+    down = list(range(item_count + 1))
+    top = list(range(item_count + 1))
+    length = [0] * (item_count + 1)
+    squares = []
+    columns = list(range(n))
+    shuffle = random.Random(seed).shuffle if seed is not None else None
+    for row in range(n):
+        mask = masks[row]
+        if shuffle is not None:
+            shuffle(columns)
+        for col in columns:
+            if not mask >> col & 1:
+                continue
+            squares.append((row, col))
+            for item in _items(n, row, col, toroidal):
+                node = len(top)
+                top.append(item)
+                up.append(up[item])
+                down.append(item)
+                down[up[item]] = node
+                up[item] = node
+                length[item] += 1
+                left.append(0)
+                right.append(0)
+    first_node = item_count + 1
+
+    def cover(item):
+        node = down[item]
+        while node != item:
+            base = node - (node - first_node) % 4
+            for other in range(base, base + 4):
+                if other != node:
+                    u, d = up[other], down[other]
+                    down[u] = d
+                    up[d] = u
+                    length[top[other]] -= 1
+            node = down[node]
+        l, r = left[item], right[item]
+        right[l] = r
+        left[r] = l
+
+    def uncover(item):
+        l, r = left[item], right[item]
+        right[l] = item
+        left[r] = item
+        node = up[item]
+        while node != item:
+            base = node - (node - first_node) % 4
+            for other in range(base + 3, base - 1, -1):
+                if other != node:
+                    u, d = up[other], down[other]
+                    down[u] = other
+                    up[d] = other
+                    length[top[other]] += 1
+            node = up[node]
+
+    def cover_others(node):
+        base = node - (node - first_node) % 4
+        for other in range(base, base + 4):
+            if other != node:
+                cover(top[other])
+
+    def uncover_others(node):
+        base = node - (node - first_node) % 4
+        for other in range(base + 3, base - 1, -1):
+            if other != node:
+                uncover(top[other])
+
+    board = [0] * n
+    chosen = []
+    nodes = reported = 0
+    while True:
+        # Choose the uncovered primary item with the fewest options left.
+        item = right[0]
+        if item == 0:
+            if stats is not None:
+                stats.nodes += nodes - reported
+                reported = nodes
+            for node in chosen:
+                row, col = squares[(node - first_node) // 4]
+                board[row] = col
+            yield board[:]
+            node = None
+        else:
+            best, fewest = item, length[item]
+            item = right[item]
+            while item and fewest > 1:
+                if length[item] < fewest:
+                    best, fewest = item, length[item]
+                item = right[item]
+            cover(best)
+            node = down[best]
+            if node == best:
+                uncover(best)
+                node = None
+        # Advance to the next option to try, backtracking through exhausted
+        # items.
+        while node is None:
+            if not chosen:
+                if stats is not None:
+                    stats.nodes += nodes - reported
+                return
+            node = chosen.pop()
+            uncover_others(node)
+            item = top[node]
+            node = down[node]
+            if node == item:
+                uncover(item)
+                node = None
+        cover_others(node)
+        chosen.append(node)
+        nodes += 1
+        if max_nodes is not None and nodes >= max_nodes:
+            if stats is not None:
+                stats.nodes += nodes - reported
+            return
+
+
+def first_dlx_solution(n, variant=None, cancelled=None, budget=1000):
+    """Returns one solution as a list of columns, or None when there is none.
+
+    Attempts restart with a fresh shuffle and double the node budget until
+    one finishes; a finished attempt that found nothing proves there is no
+    solution. Returns None as well once ``cancelled()`` turns true.
+    """
+    for attempt in count():
+        if cancelled is not None and cancelled():
+            return None
+        stats = _Nodes()
+        limit = budget << attempt
+        for solution in solve_dlx(n, (), stats, variant, max_nodes=limit, seed=attempt or None):
+            return solution
+        if stats.nodes < limit:
+            return None
+
+
+class _Nodes:
+    nodes = 0
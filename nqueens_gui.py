@@ -0,0 +1,2101 @@
+from kivy.app import App
+from kivy.uix.gridlayout import GridLayout
+from kivy.uix.boxlayout import BoxLayout
+from kivy.uix.button import Button
+from kivy.uix.label import Label
+from kivy.uix.slider import Slider
+from kivy.uix.spinner import Spinner
+from kivy.uix.togglebutton import ToggleButton
+from kivy.uix.textinput import TextInput
+from kivy.graphics import (Color, Rectangle, Line, RoundedRectangle, Mesh, InstructionGroup,
+                           PushMatrix, PopMatrix, Translate, Scale)
+from kivy.uix.widget import Widget
+from kivy.core.window import Window
+from kivy.utils import get_color_from_hex
+from kivy.uix.scrollview import ScrollView
+from kivy.clock import Clock
+from functools import partial
+from collections import deque
+from kivy.metrics import dp
+from kivy.properties import NumericProperty, ListProperty, BooleanProperty, StringProperty, ObjectProperty, DictProperty
+from kivy.animation import Animation
+from kivy.core.text import LabelBase, Label as CoreLabel
+from kivy.lang import Builder
+import os
+import threading
+from nqueens_solver import (ENGINES, DEFAULT_ENGINE, FIRST_SOLUTION_MAX_N, FIRST_SOLUTION_METHODS,
+                            SolverJob, FirstSolutionJob, ConflictIndex, SearchStats, TraceJob,
+                            PLACE, BACKTRACK, CONFLICT, SOLUTION, IndexJob, HintJob, SolutionIndex, completion_masks)
+from nqueens_dlx import make_variant
+from nqueens_store import SolutionStore
+from nqueens_cache import SolutionCache
+from nqueens_service import RemoteSolutions, ServiceJob, ServiceUnavailable, SolverClient
+from nqueens_io import TransferJob, export_solutions, format_for_path, import_solutions
+from nqueens_analysis import analyze
+import nqueens_profile
+from nqueens_profile import profile_section
+
+# Register custom fonts if available (you can replace with your preferred heading font)
+try:
+    LabelBase.register(name="Roboto",
+                       fn_regular="Roboto-Regular.ttf",
+                       fn_bold="Roboto-Bold.ttf")
+except Exception:
+    pass
+
+# Minimal custom style for flat buttons (if needed)
+Builder.load_string('''
+<FlatButton@Button>:
+    background_normal: ''
+    background_down: ''
+    background_color: 0.0, 0.5, 0.7, 1
+    color: 1, 1, 1, 1
+    font_size: '16sp'
+    size_hint: 1, None
+    height: dp(50)
+    border: 0, 0, 0, 0
+    canvas.before:
+        Color:
+            rgba: self.background_color
+        RoundedRectangle:
+            pos: self.pos
+            size: self.size
+            radius: [10,]
+''')
+
+class QueenButton(Button):
+    has_queen = BooleanProperty(False)
+    row = NumericProperty(0)
+    col = NumericProperty(0)
+    opacity_value = NumericProperty(1.0)
+    queen_number = NumericProperty(0)
+    is_conflict = BooleanProperty(False)
+
+    def __init__(self, row, col, **kwargs):
+        super().__init__(**kwargs)
+        self.row = row
+        self.col = col
+        self.background_normal = ''
+        self.background_down = ''
+        self.border = (0, 0, 0, 0)
+        # For dark theme: light blue for safe queens, red for conflicts.
+        self.queen_safe_color = get_color_from_hex('#64b5f6')
+        self.queen_conflict_color = get_color_from_hex('#ef5350')
+        self.queen_color = self.queen_safe_color
+
+    def toggle_queen(self, is_solution=False, is_solving=False, animate=True, queen_number=0):
+        if is_solving and self.has_queen:
+            return
+        new_state = not self.has_queen if not is_solution else True
+        if animate and new_state != self.has_queen:
+            if new_state:
+                self.text = ''
+                self.has_queen = True
+                self.queen_number = queen_number
+                anim = Animation(opacity_value=0, duration=0.1) + Animation(opacity_value=1, duration=0.3)
+                anim.bind(on_complete=lambda *args: self.update_appearance())
+                anim.start(self)
+            else:
+                anim = Animation(opacity_value=0, duration=0.2)
+                anim.bind(on_complete=lambda *args: self.complete_removal())
+                anim.start(self)
+        else:
+            self.has_queen = new_state
+            self.queen_number = queen_number
+            self.update_appearance()
+
+    def complete_removal(self):
+        self.has_queen = False
+        self.queen_number = 0
+        self.is_conflict = False
+        self.update_appearance()
+        Animation(opacity_value=1, duration=0.1).start(self)
+
+    def update_appearance(self, is_conflict=None):
+        if is_conflict is not None:
+            self.is_conflict = is_conflict
+        if self.has_queen:
+            self.text = f"Q{self.queen_number}"
+            self.font_size = '20sp'
+            self.color = self.queen_conflict_color if self.is_conflict else self.queen_safe_color
+            self.bold = True
+        else:
+            self.text = ''
+
+class BoardTimeline(object):
+    """Plays queen placements and removals from a single per-frame tick.
+
+    Steps are ``(time, callback)`` pairs with ``time`` measured in queen steps.
+    The board's ``animation_speed`` sets how many steps play per
+    ``step_duration`` seconds and is read on every tick, so it can change
+    mid-animation.
+    """
+    step_duration = 0.15
+
+    def __init__(self, board):
+        self.board = board
+        self.steps = deque()
+        self.position = 0
+        self.event = None
+        self.on_finish = None
+
+    @property
+    def running(self):
+        return self.event is not None
+
+    def play(self, steps, on_finish=None):
+        self.stop()
+        self.steps = deque(sorted(steps, key=lambda step: step[0]))
+        self.position = 0
+        self.on_finish = on_finish
+        if not self.steps:
+            self.finish()
+            return
+        self.event = Clock.schedule_interval(self.tick, 0)
+
+    def tick(self, dt):
+        self.position += dt * max(self.board.animation_speed, 0.01) / self.step_duration
+        steps = self.steps
+        while steps and steps[0][0] <= self.position:
+            steps.popleft()[1]()
+        if not steps:
+            self.finish()
+
+    def skip(self):
+        while self.steps:
+            self.steps.popleft()[1]()
+        if self.running:
+            self.finish()
+
+    def stop(self):
+        if self.event is not None:
+            self.event.cancel()
+            self.event = None
+        self.steps.clear()
+        self.on_finish = None
+
+    def finish(self):
+        on_finish = self.on_finish
+        self.stop()
+        if on_finish:
+            on_finish()
+
+class BoardBehavior(object):
+    # Maps (row, col) to the queen's number, in placement order.
+    queens_positions = DictProperty({})
+    solving = BooleanProperty(False)
+    animating = BooleanProperty(False)
+    solution_index = NumericProperty(0)
+    all_solutions = []
+    # Playback rate of solution and clear animations; 1.0 places a queen
+    # every 0.15 seconds.
+    animation_speed = NumericProperty(1.0)
+    solver_engine = StringProperty(DEFAULT_ENGINE)
+    symmetry_reduced = BooleanProperty(False)
+    solver_workers = NumericProperty(1)
+    solve_time = NumericProperty(0)
+    solved_from_cache = BooleanProperty(False)
+    solution_cache = SolutionCache()
+    searching = BooleanProperty(False)
+    search_progress = ObjectProperty(None, allownone=True)
+    first_solution_report = ObjectProperty(None, allownone=True)
+    transfer_status = StringProperty('')
+    # Per-square share of the solution set, 0..1, while the heatmap is shown.
+    heatmap = ObjectProperty(None, allownone=True)
+    # While ``blocking`` is on, clicks block and unblock squares instead of
+    # placing queens. Blocked squares or ``toroidal`` diagonals make the board
+    # a variant, which is solved by the Dancing Links engine.
+    blocking = BooleanProperty(False)
+    toroidal = BooleanProperty(False)
+    # With ``use_service`` on, plain solves are answered by the local solver
+    # daemon and its pages fetched as the solutions are browsed; when it is
+    # not running the board solves in-process as usual.
+    use_service = BooleanProperty(False)
+    solver_service = SolverClient()
+    service_status = StringProperty('')
+    # True while the page holding ``solution_index`` is on its way from the
+    # daemon; the solution is drawn when it arrives.
+    loading = BooleanProperty(False)
+    # Seconds a hint may search before giving up.
+    hint_timeout = 2.0
+    search_job = None
+
+    # Renderers implement initialize_board, update_board_size, draw_queen,
+    # erase_queen, renumber_queen, draw_conflict, reset_squares and
+    # draw_shading (heatmap and blocked squares); everything else about the
+    # board lives here.
+
+    def setup_board(self):
+        self.timeline = BoardTimeline(self)
+        # Dark chessboard palette
+        self.light_color = get_color_from_hex('#3d3d3d')
+        self.dark_color = get_color_from_hex('#2c2c2c')
+        self.threat_color = get_color_from_hex('#ef5350')
+        self.threat_dark_color = get_color_from_hex('#e57373')
+        self.heat_color = get_color_from_hex('#ff9800')
+        self.blocked_color = get_color_from_hex('#121212')
+        self.blocked = set()
+
+    def square_color(self, row, col, is_conflict=False):
+        is_light = (row + col) % 2 == 0
+        if is_conflict:
+            return self.threat_color if is_light else self.threat_dark_color
+        if (row, col) in self.blocked:
+            return self.blocked_color
+        color = self.light_color if is_light else self.dark_color
+        if self.heatmap is not None:
+            level = self.heatmap[row][col]
+            color = [base + (heat - base) * level for base, heat in zip(color, self.heat_color)]
+        return color
+
+    def reset_positions(self):
+        self.queens_positions = {}
+        self.conflicts = ConflictIndex()
+
+    def toggle_square(self, row, col):
+        if self.solving or self.animating:
+            return
+        position = (row, col)
+        if self.blocking:
+            self.toggle_block(row, col)
+        elif position in self.blocked:
+            return
+        elif position in self.queens_positions:
+            removed_number = self.queens_positions[position]
+            del self.queens_positions[position]
+            self.erase_queen(row, col, animate=True)
+            changed = self.conflicts.remove(position)
+            # Only queens placed after the removed one need renumbering.
+            for (other_row, other_col), number in self.queens_positions.items():
+                if number > removed_number:
+                    self.queens_positions[(other_row, other_col)] = number - 1
+                    self.renumber_queen(other_row, other_col, number - 1)
+        else:
+            queen_number = len(self.queens_positions) + 1
+            self.draw_queen(row, col, queen_number, animate=True)
+            self.queens_positions[position] = queen_number
+            changed = self.conflicts.add(position)
+        self.highlight_conflicts(changed)
+
+    def toggle_block(self, row, col):
+        position = (row, col)
+        if position in self.queens_positions:
+            return
+        if position in self.blocked:
+            self.blocked.discard(position)
+        else:
+            self.blocked.add(position)
+        self.draw_shading()
+
+    def clear_blocks(self):
+        self.blocked = set()
+        self.draw_shading()
+
+    def board_variant(self, fixed=()):
+        """Returns the ``Variant`` to solve with ``fixed`` queens, or None on a plain board."""
+        if not self.blocked and not self.toroidal:
+            return None
+        return make_variant(self.n, self.blocked, fixed, self.toroidal)
+
+    def finish_animation(self):
+        self.animating = False
+
+    def skip_animation(self):
+        self.timeline.skip()
+
+    def highlight_conflicts(self, changed):
+        for (row, col), has_conflict in changed.items():
+            self.draw_conflict(row, col, has_conflict)
+
+    def clear_board(self, animate=True):
+        self.timeline.stop()
+        positions = list(self.queens_positions)
+        self.queens_positions = {}
+        self.conflicts.clear()
+        if animate and positions:
+            # Sweep the queens off diagonally, five diagonals per queen step.
+            self.animating = True
+            steps = [((row + col) * 0.2, partial(self.clear_queen, row, col)) for row, col in positions]
+            self.timeline.play(steps, on_finish=self.finish_animation)
+        else:
+            self.reset_squares()
+            self.animating = False
+
+    def clear_queen(self, row, col):
+        self.erase_queen(row, col)
+        self.draw_conflict(row, col, False)
+
+    def solve_nqueens(self):
+        self.first_solution_report = None
+        self.solving = True
+        self.all_solutions = []
+        self.solution_index = 0
+        self.clear_board(animate=True)
+        Clock.schedule_once(self.perform_solving, 0.5)
+
+    def complete_from_here(self):
+        """Searches for the completions of the queens on the board.
+
+        Returns False without searching when the placement cannot be
+        completed.
+        """
+        if self.solving or self.animating:
+            return False
+        fixed = frozenset(self.queens_positions)
+        variant = self.board_variant(fixed)
+        if variant is None and completion_masks(self.n, fixed) is None:
+            return False
+        if variant is not None and not all(variant.masks):
+            return False
+        self.first_solution_report = None
+        self.solving = True
+        self.all_solutions = []
+        self.solution_index = 0
+        self.perform_solving(0, fixed)
+        return True
+
+    def goto_solution(self, index):
+        """Shows solution ``index`` of the board's solution set.
+
+        A set already on the board (solved, imported, completions, a
+        variant or an index) is indexed directly, in its own order. Only
+        when nothing has been enumerated yet is the plain board's
+        ``SolutionIndex`` loaded (or counted and saved) in the background, so
+        jumps into it need not enumerate the rest.
+        """
+        if self.all_solutions:
+            self.show_ranked(index)
+            return
+        self.load_solution_index(index)
+
+    def load_solution_index(self, index):
+        self.cancel_search()
+        self.first_solution_report = None
+        self.solving = True
+        self.search_progress = None
+        self.searching = True
+        job = IndexJob(self.n, cache=self.solution_cache, workers=self.solver_workers)
+        job.on_progress = partial(self.on_worker_event, job, self.on_search_progress)
+        job.on_done = partial(self.on_worker_event, job, self.on_index_done, index)
+        self.search_job = job
+        job.start()
+
+    def on_index_done(self, index, solutions, progress, cancelled):
+        self.solved_from_cache = self.search_job.cached
+        self.search_job = None
+        self.solve_time = progress.elapsed
+        self.all_solutions = solutions
+        self.show_ranked(index)
+        self.searching = False
+        self.search_progress = progress
+
+    def show_ranked(self, index):
+        count = len(self.all_solutions)
+        if count:
+            self.show_solution(min(max(0, index), count - 1), animate=False)
+
+    def export_to(self, path):
+        """Streams every solution of the current size to ``path`` in the background.
+
+        The format follows the file name (see ``nqueens_io.format_for_path``).
+        """
+        self.cancel_search()
+        fmt, compress = format_for_path(path)
+        job = TransferJob(export_solutions, path, self.n, fmt, compress, engine=self.solver_engine,
+                          symmetric=self.symmetry_reduced, cache=self.solution_cache)
+        self.start_transfer(job, "Exported", self.on_export_done)
+
+    def import_from(self, path):
+        self.cancel_search()
+        job = TransferJob(import_solutions, path, self.solution_cache)
+        self.start_transfer(job, "Imported", self.on_import_done)
+
+    def start_transfer(self, job, verb, handler):
+        job.on_progress = partial(self.on_worker_event, job, self.on_transfer_progress, verb)
+        job.on_done = partial(self.on_worker_event, job, handler)
+        self.transfer_status = f"{verb} 0"
+        self.search_job = job
+        self.searching = True
+        job.start()
+
+    def on_transfer_progress(self, verb, count):
+        self.transfer_status = f"{verb} {count:,}"
+
+    def on_export_done(self, count, error, cancelled):
+        self.search_job = None
+        self.transfer_status = f"Export failed: {error}" if error else f"Exported {count:,} solutions"
+        self.searching = False
+
+    def on_import_done(self, solutions, error, cancelled):
+        self.search_job = None
+        if error is None and solutions.n > self.max_size:
+            error = f"N={solutions.n} does not fit this board"
+        if error is not None:
+            self.transfer_status = f"Import failed: {error}"
+            self.searching = False
+            return
+        if solutions.n != self.n:
+            self.change_board_size(solutions.n)
+        self.first_solution_report = None
+        self.solve_time = 0
+        self.solving = True
+        self.all_solutions = solutions
+        self.transfer_status = f"Imported {len(solutions):,} solutions"
+        self.show_solution(0, animate=False)
+        self.searching = False
+
+    def show_heatmap(self, enabled=True):
+        """Shades each square by how many solutions use it.
+
+        Returns the ``SetStatistics`` of the current solution set, or None
+        when there is nothing to analyze (or ``enabled`` is false). Sets that
+        are only indexed or served by the daemon, never enumerated here, are
+        not analyzed, nor are single First Solution boards, which may be far
+        larger than any heatmap.
+        """
+        stats = None
+        if (enabled and self.all_solutions and self.first_solution_report is None and self.n <= self.max_size
+                and not isinstance(self.all_solutions, (SolutionIndex, RemoteSolutions))):
+            stats = analyze(self.all_solutions, self.n)
+        if stats is not None and stats.count > len(stats.invalid):
+            peak = max(map(max, stats.heatmap)) or 1
+            self.heatmap = [[count / peak for count in row] for row in stats.heatmap]
+        else:
+            self.heatmap = None
+        self.draw_shading()
+        return stats
+
+    def show_hint(self, on_done=None):
+        """Looks for the next queen of a completion in the background.
+
+        The queen is placed when one is found within ``hint_timeout`` seconds
+        and the board has not changed meanwhile; ``on_done(square,
+        timed_out)`` is called either way. Returns False when the board is
+        busy.
+        """
+        if self.solving or self.animating or self.searching:
+            return False
+        fixed = frozenset(self.queens_positions)
+        job = HintJob(self.n, fixed, self.board_variant(fixed), timeout=self.hint_timeout)
+        job.on_done = partial(self.on_worker_event, job, self.on_hint_found, on_done)
+        self.search_job = job
+        self.searching = True
+        job.start()
+        return True
+
+    def on_hint_found(self, on_done, square, timed_out):
+        job = self.search_job
+        self.search_job = None
+        self.searching = False
+        if square is not None and frozenset(self.queens_positions) == job.fixed:
+            self.toggle_square(*square)
+        if on_done is not None:
+            on_done(square, timed_out)
+
+    def perform_solving(self, dt, fixed=None, local=False):
+        if not self.solving:
+            return
+        self.cancel_search()
+        self.search_progress = None
+        self.searching = True
+        variant = self.board_variant(fixed or ())
+        if self.use_service and not local and fixed is None and variant is None and not self.symmetry_reduced:
+            job = ServiceJob(self.n, self.solver_service, fallback=self.local_index)
+            job.on_done = partial(self.on_worker_event, job, self.on_service_done)
+        else:
+            job = SolverJob(self.n, engine=self.solver_engine, symmetric=self.symmetry_reduced,
+                            workers=self.solver_workers, cache=self.solution_cache, fixed=fixed,
+                            variant=variant)
+            job.on_progress = partial(self.on_worker_event, job, self.on_search_progress)
+            job.on_done = partial(self.on_worker_event, job, self.on_search_done)
+        job.on_solution = partial(self.on_worker_event, job, self.on_first_solution)
+        self.search_job = job
+        job.start()
+
+    def local_index(self, n):
+        # Where ``RemoteSolutions`` reads from if the daemon goes away, called
+        # on the thread fetching the page: the cached set, else an index whose
+        # counts are already on disk. Failing both, ``on_service_lost`` counts
+        # in the background.
+        solutions = self.solution_cache.load(n)
+        if solutions is not None:
+            return solutions
+        saved = self.solution_cache.load_counts(n)
+        return SolutionIndex(n, *saved) if saved is not None else None
+
+    def on_service_lost(self, index):
+        self.service_status = "Solver service stopped; counting solutions locally"
+        self.all_solutions = []
+        self.load_solution_index(index)
+
+    def on_service_done(self, solutions, progress, cancelled):
+        if solutions is None:
+            self.service_status = "Solver service not running; solving locally"
+            self.perform_solving(0, local=True)
+            return
+        # The daemon's progress has no branch or nodes of its own; like any
+        # final progress it is published only after the search has ended.
+        self.search_job = None
+        self.solved_from_cache = False
+        self.solve_time = progress.elapsed
+        self.solution_index = 0
+        self.all_solutions = solutions
+        self.service_status = f"Solver service: {len(solutions):,} solutions for N={self.n}"
+        self.searching = False
+        self.search_progress = progress
+
+    def on_page_fetched(self, solutions, index, animate, error):
+        # Called on the fetching thread: hop back to the Kivy thread and drop
+        # pages the board has since moved away from.
+        def dispatch(dt):
+            if solutions is not self.all_solutions or index != self.solution_index:
+                return
+            if error is None:
+                self.show_solution(index, animate)
+            elif isinstance(error, ServiceUnavailable):
+                self.loading = False
+                self.on_service_lost(index)
+            else:
+                self.loading = False
+                self.service_status = f"Solver service: {error}"
+        Clock.schedule_once(dispatch)
+
+    def current_solution(self):
+        """Returns the solution at ``solution_index``, or None while its page is loading."""
+        if isinstance(self.all_solutions, RemoteSolutions):
+            return self.all_solutions.cached(self.solution_index)
+        return self.all_solutions[self.solution_index]
+
+    def on_worker_event(self, job, handler, *args):
+        # Called on the solver thread: hop back to the Kivy thread and drop
+        # events from jobs that have since been cancelled or replaced.
+        def dispatch(dt):
+            if job is self.search_job and not job.cancelled:
+                handler(*args)
+        Clock.schedule_once(dispatch)
+
+    def on_search_progress(self, progress):
+        self.search_progress = progress
+
+    def on_first_solution(self, solution):
+        self.all_solutions = [solution]
+        self.animating = True
+        self.show_solution(0, animate=True)
+
+    def on_search_done(self, solutions, progress, cancelled):
+        self.solved_from_cache = self.search_job.cached
+        self.search_job = None
+        self.solve_time = progress.elapsed
+        if self.solution_index >= len(solutions):
+            self.solution_index = 0
+        self.all_solutions = solutions
+        # Publish the final progress only once the search is over, so it is
+        # never shown as a live update.
+        self.searching = False
+        self.search_progress = progress
+
+    def cancel_search(self):
+        if self.search_job is not None:
+            self.search_job.cancel()
+            self.search_job = None
+        self.searching = False
+        self.loading = False
+
+    def find_first_solution(self, n, method='constructive'):
+        self.cancel_search()
+        if n != self.n:
+            self.change_board_size(n)
+        self.clear_board(animate=False)
+        self.solving = True
+        self.all_solutions = []
+        self.solution_index = 0
+        self.first_solution_report = None
+        self.searching = True
+        job = FirstSolutionJob(n, method)
+        job.on_done = partial(self.on_worker_event, job, self.on_first_solution_found)
+        self.search_job = job
+        job.start()
+
+    def on_first_solution_found(self, columns, report):
+        self.search_job = None
+        self.first_solution_report = report
+        self.solve_time = report.solve_time
+        self.solved_from_cache = False
+        if columns is not None:
+            self.all_solutions = [columns]
+            self.show_solution(0, animate=False)
+        self.searching = False
+
+    def watch_search(self):
+        self.cancel_search()
+        self.clear_board(animate=False)
+        self.solving = True
+        self.all_solutions = SolutionStore(self.n)
+        self.solution_index = 0
+        self.solve_time = 0
+        self.solved_from_cache = False
+        self.first_solution_report = None
+        self.search_progress = None
+        self.trace_board = {}
+        self.trace_probe = None
+        self.trace_budget = 0.0
+        self.trace_stats = SearchStats()
+        job = TraceJob(self.n)
+        self.search_job = job
+        self.searching = True
+        Clock.schedule_interval(partial(self.consume_trace, job), 0)
+        job.start()
+
+    def trace_rate(self):
+        # Search events shown per second. Each speed step is ten times
+        # faster than the last and the top of the range is unthrottled.
+        if self.animation_speed >= 4:
+            return None
+        return 25 * 10 ** (self.animation_speed - 1)
+
+    def consume_trace(self, job, dt):
+        if job is not self.search_job or job.cancelled:
+            return False
+        rate = self.trace_rate()
+        if rate is None:
+            events = job.next_events()
+        else:
+            self.trace_budget += rate * dt
+            limit = int(self.trace_budget)
+            self.trace_budget -= limit
+            events = job.next_events(limit)
+        # Fold every event drained this frame into the target state first,
+        # then touch only the rows whose queen actually moved.
+        board, stats = self.trace_board, self.trace_stats
+        dirty = set()
+        probe = self.trace_probe
+        for kind, row, col in events:
+            if kind == PLACE:
+                board[row] = col
+                dirty.add(row)
+                stats.nodes += 1
+                if row == 0:
+                    stats.branch = col
+            elif kind == BACKTRACK:
+                del board[row]
+                dirty.add(row)
+            elif kind == CONFLICT:
+                probe = (row, col)
+            elif kind == SOLUTION:
+                self.all_solutions.append([board[r] for r in range(self.n)])
+                stats.solutions += 1
+        self.show_trace_rows(dirty, probe)
+        if job.exhausted:
+            self.show_trace_rows(set(), None)
+            self.search_job = None
+            progress = stats.progress()
+            self.solve_time = progress.elapsed
+            self.searching = False
+            self.search_progress = progress
+            return False
+        # Early frames often drain nothing while the budget builds up; there
+        # is no progress to report until the trace has placed a queen.
+        if events and stats.branch is not None:
+            self.search_progress = stats.progress()
+
+    def show_trace_rows(self, rows, probe):
+        if probe != self.trace_probe:
+            if self.trace_probe is not None:
+                self.draw_conflict(*self.trace_probe, False)
+            if probe is not None:
+                self.draw_conflict(*probe, True)
+            self.trace_probe = probe
+        for row in rows:
+            col = self.trace_board.get(row)
+            shown = next(iter(self.conflicts.queens_in_row(row)), None)
+            if shown == (row, col):
+                continue
+            if shown is not None:
+                position = shown
+                del self.queens_positions[position]
+                self.conflicts.remove(position)
+                self.erase_queen(*position)
+            if col is not None:
+                self.queens_positions[(row, col)] = row + 1
+                self.conflicts.add((row, col))
+                self.draw_queen(row, col, row + 1)
+
+    def show_solution(self, index, animate=True):
+        if not self.all_solutions:
+            return
+        index = index % len(self.all_solutions)
+        self.solution_index = index
+        # Pages the daemon has not sent yet are fetched in the background
+        # rather than waited for here.
+        solution = self.current_solution()
+        if solution is None:
+            self.loading = True
+            self.all_solutions.fetch(index, partial(self.on_page_fetched, self.all_solutions, index, animate))
+            return
+        self.loading = False
+        self.clear_board(animate=False)
+        if animate:
+            self.animating = True
+            steps = [(row, partial(self.place_queen, row, col)) for row, col in enumerate(solution)]
+            self.timeline.play(steps, on_finish=self.finish_animation)
+        else:
+            for row, col in enumerate(solution):
+                self.draw_queen(row, col, row + 1, animate=False)
+                self.queens_positions[(row, col)] = row + 1
+                self.conflicts.add((row, col))
+            self.animating = False
+
+    def place_queen(self, row, col):
+        self.draw_queen(row, col, row + 1)
+        self.queens_positions[(row, col)] = row + 1
+        self.conflicts.add((row, col))
+
+    def next_solution(self):
+        if self.all_solutions and not self.searching:
+            self.skip_animation()
+            self.show_solution(self.solution_index + 1)
+
+    def prev_solution(self):
+        if self.all_solutions and not self.searching:
+            self.skip_animation()
+            self.show_solution(self.solution_index - 1)
+
+    def change_board_size(self, n):
+        self.cancel_search()
+        self.timeline.stop()
+        self.first_solution_report = None
+        self.heatmap = None
+        self.blocked = set()
+        self.n = n
+        self.solution_index = 0
+        self.all_solutions = []
+        self.solve_time = 0
+        self.solved_from_cache = False
+        self.solving = False
+        self.animating = False
+        with profile_section(f'rebuild-{type(self).__name__}-n{n}'):
+            self.initialize_board()
+            self.update_board_size()
+
+class NQueensBoard(BoardBehavior, GridLayout):
+    max_size = 12
+
+    def __init__(self, n, **kwargs):
+        super().__init__(**kwargs)
+        self.n = n
+        self.cell_count = 0
+        # Every QueenButton ever created, in grid order; the first n² are on
+        # the board and the rest wait to be reused by a larger size.
+        self.button_pool = []
+        # Set spacing as a numeric value
+        self.spacing = 2  
+        self.padding = 2
+        self.setup_board()
+        self.initialize_board()
+        self.bind(size=self.update_board_size)
+
+    def initialize_board(self):
+        self.cols = self.n
+        self.reset_positions()
+        needed = self.n * self.n
+        while len(self.button_pool) < needed:
+            btn = QueenButton(row=0, col=0)
+            btn.bind(on_release=self.on_square_click)
+            self.button_pool.append(btn)
+        # The grid lays children out in insertion order, so growing or
+        # shrinking only adds or removes buttons at the end.
+        for btn in self.button_pool[needed:self.cell_count]:
+            self.remove_widget(btn)
+        for btn in self.button_pool[self.cell_count:needed]:
+            self.add_widget(btn)
+        self.cell_count = needed
+        self.buttons = []
+        for row in range(self.n):
+            row_buttons = self.button_pool[row * self.n:(row + 1) * self.n]
+            for col, btn in enumerate(row_buttons):
+                btn.row = row
+                btn.col = col
+                self.reset_button(btn)
+            self.buttons.append(row_buttons)
+
+    def reset_button(self, button):
+        Animation.cancel_all(button)
+        button.opacity_value = 1
+        button.has_queen = False
+        button.queen_number = 0
+        button.background_color = self.square_color(button.row, button.col)
+        button.update_appearance(is_conflict=False)
+
+    def update_board_size(self, *args):
+        # Ensure spacing is a number
+        spacing = self.spacing[0] if isinstance(self.spacing, (list, tuple)) else self.spacing
+        min_dim = min(self.width, self.height)
+        cell_size = (min_dim - (spacing * (self.n + 1))) / self.n
+        for row in range(self.n):
+            for col in range(self.n):
+                btn = self.buttons[row][col]
+                btn.size_hint = (None, None)
+                btn.size = (cell_size, cell_size)
+
+    def on_square_click(self, instance):
+        self.toggle_square(instance.row, instance.col)
+
+    def draw_queen(self, row, col, number, animate=False):
+        button = self.buttons[row][col]
+        # Re-placing a queen that is still fading out must not let the
+        # pending removal finish afterwards.
+        Animation.cancel_all(button, 'opacity_value')
+        button.opacity_value = 1
+        button.toggle_queen(is_solution=True, animate=animate, queen_number=number)
+
+    def erase_queen(self, row, col, animate=False):
+        button = self.buttons[row][col]
+        if animate:
+            if button.has_queen:
+                button.toggle_queen(animate=True)
+        else:
+            button.has_queen = False
+            button.queen_number = 0
+            button.update_appearance(is_conflict=False)
+
+    def renumber_queen(self, row, col, number):
+        button = self.buttons[row][col]
+        button.queen_number = number
+        button.update_appearance()
+
+    def draw_conflict(self, row, col, is_conflict):
+        button = self.buttons[row][col]
+        button.update_appearance(is_conflict=is_conflict)
+        Animation.cancel_all(button, 'background_color')
+        if is_conflict:
+            Animation(background_color=self.square_color(row, col, True), duration=0.3).start(button)
+        else:
+            button.background_color = self.square_color(row, col)
+
+    def reset_squares(self):
+        for row_buttons in self.buttons:
+            for button in row_buttons:
+                self.reset_button(button)
+
+    def draw_shading(self):
+        for row_buttons in self.buttons:
+            for button in row_buttons:
+                Animation.cancel_all(button, 'background_color')
+                is_conflict = self.conflicts.is_conflicted((button.row, button.col))
+                button.background_color = self.square_color(button.row, button.col, is_conflict)
+
+class CanvasBoard(BoardBehavior, Widget):
+    # Cells shown across the viewport; larger boards are panned by dragging
+    # and zoomed with the mouse wheel.
+    max_visible = NumericProperty(64)
+    view_row = NumericProperty(0)
+    view_col = NumericProperty(0)
+    # Keeps each colour's mesh under Kivy's 65535-vertex limit.
+    visible_limit = 128
+    square_gap = 0.06
+    max_size = 64
+
+    def __init__(self, n, **kwargs):
+        super().__init__(**kwargs)
+        self.n = n
+        self.setup_board()
+        self.queen_safe_color = get_color_from_hex('#64b5f6')
+        self.queen_conflict_color = get_color_from_hex('#ef5350')
+        self.glyphs = {}
+        self.queen_instructions = {}
+        self.highlight_instructions = {}
+        # Everything is drawn in cell units and mapped to the widget by one
+        # translate/scale pair, so resizing never touches the cells.
+        with self.canvas:
+            PushMatrix()
+            self.origin = Translate()
+            self.zoom = Scale()
+        self.squares = InstructionGroup()
+        self.heat = InstructionGroup()
+        self.highlights = InstructionGroup()
+        self.queens = InstructionGroup()
+        self.canvas.add(self.squares)
+        self.canvas.add(self.heat)
+        self.canvas.add(self.highlights)
+        self.canvas.add(self.queens)
+        self.canvas.add(PopMatrix())
+        self.initialize_board()
+        self.bind(size=self.update_board_size, pos=self.update_board_size)
+
+    @property
+    def visible_cells(self):
+        return max(1, min(self.n, int(self.max_visible), self.visible_limit))
+
+    def initialize_board(self):
+        self.reset_positions()
+        self.large_columns = None
+        self.view_row = self.view_col = 0
+        self.redraw_viewport()
+
+    def clear_board(self, animate=True):
+        if self.large_columns is not None:
+            self.large_columns = None
+            self.redraw_viewport()
+        super().clear_board(animate)
+
+    def show_solution(self, index, animate=True):
+        # Past the slider range a solution is only ever a single column
+        # array, drawn straight from the array for the rows in view rather
+        # than tracked queen by queen.
+        if self.n <= self.max_size or not self.all_solutions:
+            self.large_columns = None
+            return super().show_solution(index, animate)
+        self.timeline.stop()
+        self.animating = False
+        self.solution_index = 0
+        self.reset_positions()
+        self.large_columns = self.all_solutions[0]
+        self.scroll_to(0)
+
+    def scroll_to(self, row, col=None):
+        visible = self.visible_cells
+        if col is None and self.large_columns is not None:
+            col = self.large_columns[row]
+        self.view_row = row - visible // 2
+        self.view_col = (col if col is not None else self.view_col + visible // 2) - visible // 2
+        self.redraw_viewport()
+
+    def update_board_size(self, *args):
+        side = min(self.width, self.height)
+        cell = side / self.visible_cells
+        self.origin.xy = (self.x + (self.width - side) / 2, self.y + (self.height - side) / 2)
+        self.zoom.x = self.zoom.y = cell
+
+    def redraw_viewport(self):
+        visible = self.visible_cells
+        self.view_row = min(max(0, int(self.view_row)), self.n - visible)
+        self.view_col = min(max(0, int(self.view_col)), self.n - visible)
+        self.squares.clear()
+        meshes = ([], []), ([], [])
+        gap = self.square_gap
+        for i in range(visible):
+            y = visible - 1 - i
+            for j in range(visible):
+                vertices, indices = meshes[(self.view_row + i + self.view_col + j) % 2]
+                k = len(vertices) // 4
+                vertices.extend((j, y, 0, 0, j + 1 - gap, y, 1, 0,
+                                 j + 1 - gap, y + 1 - gap, 1, 1, j, y + 1 - gap, 0, 1))
+                indices.extend((k, k + 1, k + 2, k + 2, k + 3, k))
+        for color, (vertices, indices) in zip((self.light_color, self.dark_color), meshes):
+            self.squares.add(Color(*color))
+            self.squares.add(Mesh(vertices=vertices, indices=indices, mode='triangles'))
+        self.draw_shading()
+        self.reset_squares()
+        for row in range(self.view_row, self.view_row + visible):
+            if self.large_columns is not None:
+                self.draw_queen(row, self.large_columns[row], row + 1)
+                continue
+            for position in self.conflicts.queens_in_row(row):
+                if position in self.queens_positions:
+                    self.draw_queen(row, position[1], self.queens_positions[position])
+                    if self.conflicts.is_conflicted(position):
+                        self.draw_conflict(row, position[1], True)
+        self.update_board_size()
+
+    def draw_shading(self):
+        self.heat.clear()
+        visible = self.visible_cells
+        size = 1 - self.square_gap
+        if self.heatmap is not None:
+            r, g, b = self.heat_color[:3]
+            for i in range(visible):
+                levels = self.heatmap[self.view_row + i]
+                for j in range(visible):
+                    level = levels[self.view_col + j]
+                    if level:
+                        self.heat.add(Color(r, g, b, level * 0.8))
+                        self.heat.add(Rectangle(pos=(j, visible - 1 - i), size=(size, size)))
+        if self.blocked:
+            self.heat.add(Color(*self.blocked_color))
+            for row, col in self.blocked:
+                rect = self.cell_rect(row, col)
+                if rect is not None:
+                    x, y, size = rect
+                    self.heat.add(Rectangle(pos=(x, y), size=(size, size)))
+
+    def cell_rect(self, row, col):
+        visible = self.visible_cells
+        i, j = row - self.view_row, col - self.view_col
+        if not (0 <= i < visible and 0 <= j < visible):
+            return None
+        return j, visible - 1 - i, 1 - self.square_gap
+
+    def cell_at(self, x, y):
+        cell = self.zoom.x
+        if not cell:
+            return None
+        visible = self.visible_cells
+        j = int((x - self.origin.x) // cell)
+        i = visible - 1 - int((y - self.origin.y) // cell)
+        if 0 <= i < visible and 0 <= j < visible:
+            return self.view_row + i, self.view_col + j
+        return None
+
+    def glyph(self, number):
+        text = f"Q{number}" if self.n <= 64 else "Q"
+        texture = self.glyphs.get(text)
+        if texture is None:
+            label = CoreLabel(text=text, font_size=64, bold=True)
+            label.refresh()
+            texture = self.glyphs[text] = label.texture
+        return texture
+
+    def draw_queen(self, row, col, number, animate=False):
+        self.erase_queen(row, col)
+        rect = self.cell_rect(row, col)
+        if rect is None:
+            return
+        x, y, size = rect
+        texture = self.glyph(number)
+        height = size * 0.45
+        width = min(size * 0.9, height * texture.width / max(texture.height, 1))
+        height = width * texture.height / max(texture.width, 1)
+        group = InstructionGroup()
+        is_conflict = self.conflicts.is_conflicted((row, col))
+        color = Color(*(self.queen_conflict_color if is_conflict else self.queen_safe_color))
+        group.add(color)
+        group.add(Rectangle(texture=texture, pos=(x + (size - width) / 2, y + (size - height) / 2),
+                            size=(width, height)))
+        self.queens.add(group)
+        self.queen_instructions[(row, col)] = (group, color)
+
+    def erase_queen(self, row, col, animate=False):
+        queen = self.queen_instructions.pop((row, col), None)
+        if queen is not None:
+            self.queens.remove(queen[0])
+
+    def renumber_queen(self, row, col, number):
+        if (row, col) in self.queen_instructions:
+            self.draw_queen(row, col, number)
+
+    def draw_conflict(self, row, col, is_conflict):
+        group = self.highlight_instructions.pop((row, col), None)
+        if group is not None:
+            self.highlights.remove(group)
+        queen = self.queen_instructions.get((row, col))
+        if queen is not None:
+            queen[1].rgba = self.queen_conflict_color if is_conflict else self.queen_safe_color
+        rect = self.cell_rect(row, col)
+        if not is_conflict or rect is None:
+            return
+        x, y, size = rect
+        group = InstructionGroup()
+        group.add(Color(*self.square_color(row, col, True)))
+        group.add(Rectangle(pos=(x, y), size=(size, size)))
+        self.highlights.add(group)
+        self.highlight_instructions[(row, col)] = group
+
+    def reset_squares(self):
+        self.queens.clear()
+        self.highlights.clear()
+        self.queen_instructions = {}
+        self.highlight_instructions = {}
+
+    def on_touch_down(self, touch):
+        if not self.collide_point(*touch.pos):
+            return super().on_touch_down(touch)
+        if touch.is_mouse_scrolling:
+            step = 1 if touch.button == 'scrollup' else -1
+            limit = min(self.n, self.visible_limit)
+            self.max_visible = min(max(4, self.visible_cells + step * max(1, self.visible_cells // 8)), limit)
+            self.redraw_viewport()
+            return True
+        touch.grab(self)
+        touch.ud['canvas_board'] = (touch.x, touch.y, self.view_row, self.view_col)
+        return True
+
+    def on_touch_move(self, touch):
+        if touch.grab_current is not self or self.visible_cells >= self.n:
+            return super().on_touch_move(touch)
+        x, y, row, col = touch.ud['canvas_board']
+        cell = self.zoom.x or 1
+        new_row = row + int((touch.y - y) // cell)
+        new_col = col - int((touch.x - x) // cell)
+        if (new_row, new_col) != (self.view_row, self.view_col):
+            self.view_row, self.view_col = new_row, new_col
+            self.redraw_viewport()
+        return True
+
+    def on_touch_up(self, touch):
+        if touch.grab_current is not self:
+            return super().on_touch_up(touch)
+        touch.ungrab(self)
+        x, y, row, col = touch.ud['canvas_board']
+        moved = abs(touch.x - x) + abs(touch.y - y)
+        if moved < (self.zoom.x or 1) / 2 and (row, col) == (self.view_row, self.view_col):
+            cell = self.cell_at(touch.x, touch.y)
+            if cell is not None and self.large_columns is None:
+                self.toggle_square(*cell)
+        return True
+
+class PerfOverlay(Label):
+    """Frame timing, solver, scheduler and widget counters drawn over the window.
+
+    The overlay only measures anything while it is shown: ``start`` adds it to
+    the window and schedules its callbacks, ``stop`` removes both.
+    """
+    refresh_interval = 0.25
+
+    def __init__(self, ui, **kwargs):
+        super().__init__(size_hint=(None, None), halign='left', valign='top', font_size='13sp',
+                         color=[1, 1, 1, 1], padding=(dp(8), dp(6)), **kwargs)
+        self.ui = ui
+        self.frame_times = deque(maxlen=120)
+        self.events = []
+        with self.canvas.before:
+            Color(0, 0, 0, 0.7)
+            self.bg_rect = Rectangle(pos=self.pos, size=self.size)
+        self.bind(pos=self.update_bg, size=self.update_bg, texture_size=self.setter('size'))
+
+    def update_bg(self, *args):
+        self.bg_rect.pos = self.pos
+        self.bg_rect.size = self.size
+
+    @property
+    def active(self):
+        return bool(self.events)
+
+    def start(self):
+        if self.active:
+            return
+        self.frame_times.clear()
+        Window.add_widget(self)
+        self.events = [Clock.schedule_interval(self.record_frame, 0),
+                       Clock.schedule_interval(self.refresh, self.refresh_interval)]
+        self.refresh(0)
+
+    def stop(self):
+        for event in self.events:
+            event.cancel()
+        self.events = []
+        if self.parent is not None:
+            self.parent.remove_widget(self)
+
+    def record_frame(self, dt):
+        self.frame_times.append(dt)
+
+    @staticmethod
+    def count_widgets(root):
+        count = 0
+        pending = list(root.children)
+        while pending:
+            widget = pending.pop()
+            count += 1
+            pending.extend(widget.children)
+        return count
+
+    def refresh(self, dt):
+        times = self.frame_times
+        average = sum(times) / len(times) if times else 0
+        board = self.ui.board
+        progress = board.search_progress
+        if progress is not None:
+            solver = f"solver {progress.nodes:,} nodes · {progress.solutions:,} found · {progress.elapsed:.2f} s"
+        else:
+            solver = "solver idle"
+        # Our own two callbacks are left out of the event count.
+        events = len(Clock.get_events()) - len(self.events)
+        animations = len(getattr(Animation, '_instances', ()))
+        self.text = "\n".join((
+            f"frame {average * 1000:.1f} ms (worst {max(times, default=0) * 1000:.1f}) · {Clock.get_fps():.0f} fps",
+            solver,
+            f"clock events {events} · animations {animations} · timeline steps {len(board.timeline.steps)}",
+            f"widgets {self.count_widgets(Window) - 1}",
+        ))
+        self.pos = (dp(10), Window.height - self.height - dp(10))
+
+class InfoPanel(BoxLayout):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.orientation = 'vertical'
+        self.size_hint = (1, None)
+        self.height = dp(160)
+        self.padding = [15, 10]
+        self.spacing = 10
+        # Standalone heading title with larger, bold text.
+        self.title = Label(
+            text="N Queens Puzzle Visualizer",
+            font_size='26sp',
+            color=get_color_from_hex('#64b5f6'),
+            size_hint_y=None,
+            height=dp(50),
+            bold=True,
+            halign='center'
+        )
+        self.title.bind(size=self.title.setter('text_size'))
+        self.scroll = ScrollView(size_hint=(1, 1), bar_width=5)
+        self.description = Label(
+            text=(
+                "Place N queens on an N×N board so that no queen attacks another.\n\n"
+                "Did you know?\n"
+                "• For N=8, there are 92 solutions\n"
+                "• For N=9, there are 352 solutions\n"
+                "• For N=10, there are 724 solutions\n"
+                "• No solutions exist for N=2 and N=3"
+            ),
+            font_size='15sp',
+            color=get_color_from_hex('#bdbdbd'),
+            size_hint_y=None,
+            halign='left',
+            valign='top',
+            padding=[5, 5]
+        )
+        self.description.bind(width=lambda *x: setattr(self.description, 'text_size', (self.width - dp(30), None)))
+        self.description.bind(texture_size=lambda *x: setattr(self.description, 'height', self.description.texture_size[1]))
+        self.scroll.add_widget(self.description)
+        self.add_widget(self.title)
+        self.add_widget(self.scroll)
+        with self.canvas.after:
+            Color(0.5, 0.5, 0.5, 1)
+            self.line = Line(points=[0, 0, 0, 0], width=1)
+        self.bind(pos=self.update_line, size=self.update_line)
+
+    def update_line(self, *args):
+        self.line.points = [self.x, self.y, self.x + self.width, self.y]
+
+class NQueensUI(BoxLayout):
+    board_size = NumericProperty(8)
+    theme_bg_color = ListProperty([0.12, 0.12, 0.15, 1])   # Dark background
+    theme_panel_color = ListProperty([0.18, 0.18, 0.22, 1])  # Slightly lighter panel
+    theme_accent_color = ListProperty([0.30, 0.65, 0.85, 1]) # Accent (blue)
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.orientation = 'vertical'
+        self.padding = 20
+        self.spacing = 15
+        with self.canvas.before:
+            Color(*self.theme_bg_color)
+            self.bg_rect = Rectangle(pos=self.pos, size=self.size)
+        self.bind(pos=self.update_bg, size=self.update_bg)
+        self.info_panel = InfoPanel()
+        self.add_widget(self.info_panel)
+        self.main_content = BoxLayout(orientation='horizontal', spacing=20)
+        self.board_container = BoxLayout(orientation='vertical', size_hint=(0.75, 1))
+        # Board container with curvy edges.
+        with self.board_container.canvas.before:
+            Color(*self.theme_panel_color)
+            self.board_panel = RoundedRectangle(pos=self.board_container.pos, size=self.board_container.size, radius=[20,])
+        self.board_container.bind(pos=self.update_board_panel, size=self.update_board_panel)
+        # Vertical box to hold the stats bar and solution array (below the solution text).
+        self.solution_info_box = BoxLayout(orientation='vertical', size_hint=(1, None), height=dp(60), spacing=5)
+        self.stats_bar = BoxLayout(size_hint=(1, None), height=dp(30), spacing=10, padding=[10, 5])
+        self.board_label = Label(
+            text=f"{self.board_size}×{self.board_size} Board",
+            size_hint=(0.6, 1),
+            color=get_color_from_hex('#bdbdbd'),
+            halign='left',
+            font_size='16sp'
+        )
+        self.solution_label = Label(
+            text="No solutions yet",
+            size_hint=(0.4, 1),
+            color=self.theme_accent_color,
+            halign='right',
+            font_size='16sp'
+        )
+        self.stats_bar.add_widget(self.board_label)
+        self.stats_bar.add_widget(self.solution_label)
+        # Label for the solution's column numbers with bigger, bold text.
+        self.solution_array_label = Label(
+            text="Columns: []",
+            size_hint=(1, None),
+            height=dp(30),
+            color=get_color_from_hex('#bdbdbd'),
+            font_size='18sp',
+            bold=True,
+            halign='center'
+        )
+        self.solution_info_box.add_widget(self.stats_bar)
+        self.solution_info_box.add_widget(self.solution_array_label)
+        self.board_container.add_widget(self.solution_info_box)
+        self.board = NQueensBoard(self.board_size)
+        self.board_container.add_widget(self.board)
+        self.main_content.add_widget(self.board_container)
+        # The controls scroll once they no longer fit beside the board.
+        self.controls_scroll = ScrollView(size_hint=(0.25, 1), do_scroll_x=False, bar_width=dp(4))
+        self.controls = BoxLayout(orientation='vertical', size_hint=(1, None), spacing=15, padding=[15, 15])
+        self.controls.bind(minimum_height=self.controls.setter('height'))
+        with self.controls_scroll.canvas.before:
+            Color(*self.theme_panel_color)
+            self.controls_panel = RoundedRectangle(pos=self.controls_scroll.pos, size=self.controls_scroll.size,
+                                                   radius=[20,])
+        self.controls_scroll.bind(pos=self.update_controls_panel, size=self.update_controls_panel)
+        self.controls_scroll.add_widget(self.controls)
+        self.size_box = BoxLayout(orientation='vertical', size_hint=(1, None), height=dp(70), spacing=5)
+        self.size_label = Label(
+            text=f"Board Size: {self.board_size}",
+            color=get_color_from_hex('#bdbdbd'),
+            font_size='16sp',
+            size_hint=(1, 0.5),
+            halign='left'
+        )
+        self.size_slider = Slider(
+            min=4,
+            max=self.board.max_size,
+            step=1,
+            value=self.board_size,
+            size_hint=(1, 0.5),
+            cursor_size=(dp(20), dp(20))
+        )
+        self.size_slider.bind(value=self.on_slider_change)
+        self.resize_trigger = Clock.create_trigger(self.apply_board_size, 0.15)
+        with self.size_slider.canvas.before:
+            Color(0.5, 0.5, 0.5, 1)
+            self.slider_bg = RoundedRectangle(pos=self.size_slider.pos, size=self.size_slider.size, radius=[10,])
+        self.size_slider.bind(pos=self.update_slider_bg, size=self.update_slider_bg)
+        self.size_box.add_widget(self.size_label)
+        self.size_box.add_widget(self.size_slider)
+        self.speed_box = BoxLayout(size_hint=(1, None), height=dp(40), spacing=5)
+        self.speed_label = Label(
+            text=f"Speed {self.board.animation_speed:g}×",
+            color=get_color_from_hex('#bdbdbd'),
+            font_size='15sp',
+            size_hint=(0.35, 1)
+        )
+        self.speed_slider = Slider(
+            min=0.25,
+            max=4,
+            step=0.25,
+            value=self.board.animation_speed,
+            size_hint=(0.65, 1),
+            cursor_size=(dp(16), dp(16))
+        )
+        self.speed_slider.bind(value=self.on_speed_change)
+        self.speed_box.add_widget(self.speed_label)
+        self.speed_box.add_widget(self.speed_slider)
+        # Solve button now uses a green color.
+        self.solve_btn = Button(
+            text="Solve with Animation",
+            background_color=get_color_from_hex('#4CAF50'),
+            background_normal='',
+            color=[1, 1, 1, 1],
+            size_hint=(1, None),
+            height=dp(50),
+            font_size='16sp',
+            bold=True
+        )
+        self.solve_btn.bind(on_release=self.on_solve)
+        self.watch_btn = Button(
+            text="Watch Search",
+            background_color=get_color_from_hex('#26a69a'),
+            background_normal='',
+            color=[1, 1, 1, 1],
+            size_hint=(1, None),
+            height=dp(40),
+            font_size='15sp',
+            bold=True
+        )
+        self.watch_btn.bind(on_release=self.on_watch)
+        self.clear_btn = Button(
+            text="Clear Board",
+            background_color=get_color_from_hex('#ef5350'),
+            background_normal='',
+            color=[1, 1, 1, 1],
+            size_hint=(1, None),
+            height=dp(50),
+            font_size='16sp',
+            bold=True
+        )
+        self.clear_btn.bind(on_release=self.on_clear)
+        self.cancel_btn = Button(
+            text="Cancel Search",
+            background_color=get_color_from_hex('#ff9800'),
+            background_normal='',
+            color=[1, 1, 1, 1],
+            size_hint=(1, None),
+            height=dp(40),
+            font_size='15sp',
+            disabled=True
+        )
+        self.cancel_btn.bind(on_release=self.on_cancel)
+        self.board.bind(search_progress=self.on_search_progress, searching=self.on_searching,
+                        transfer_status=self.on_board_status, service_status=self.on_board_status,
+                        loading=self.on_board_loading)
+        self.nav_box = BoxLayout(size_hint=(1, None), height=dp(50), spacing=10)
+        self.prev_btn = Button(
+            text="<",
+            background_color=get_color_from_hex('#64b5f6'),
+            background_normal='',
+            size_hint=(0.5, 1),
+            font_size='24sp',
+            bold=True
+        )
+        self.prev_btn.bind(on_release=self.on_prev_solution)
+        self.next_btn = Button(
+            text=">",
+            background_color=get_color_from_hex('#64b5f6'),
+            background_normal='',
+            size_hint=(0.5, 1),
+            font_size='24sp',
+            bold=True
+        )
+        self.next_btn.bind(on_release=self.on_next_solution)
+        self.nav_box.add_widget(self.prev_btn)
+        self.nav_box.add_widget(self.next_btn)
+        self.engine_spinner = Spinner(
+            text=self.board.solver_engine,
+            values=list(ENGINES),
+            background_color=get_color_from_hex('#455a64'),
+            background_normal='',
+            size_hint=(1, None),
+            height=dp(40),
+            font_size='15sp'
+        )
+        self.engine_spinner.bind(text=self.on_engine_change)
+        self.symmetry_toggle = ToggleButton(
+            text="Symmetry Reduction",
+            background_color=get_color_from_hex('#455a64'),
+            background_normal='',
+            background_down='',
+            size_hint=(1, None),
+            height=dp(40),
+            font_size='15sp'
+        )
+        self.symmetry_toggle.bind(state=self.on_symmetry_toggle)
+        worker_counts = sorted({1, 2, 4, 8, os.cpu_count() or 1})
+        self.workers_spinner = Spinner(
+            text=self.workers_text(self.board.solver_workers),
+            values=[self.workers_text(count) for count in worker_counts if count <= (os.cpu_count() or 1)],
+            background_color=get_color_from_hex('#455a64'),
+            background_normal='',
+            size_hint=(1, None),
+            height=dp(40),
+            font_size='15sp'
+        )
+        self.workers_spinner.bind(text=self.on_workers_change)
+        self.service_toggle = ToggleButton(
+            text="Solver Service",
+            background_color=get_color_from_hex('#455a64'),
+            background_normal='',
+            background_down='',
+            size_hint=(1, None),
+            height=dp(40),
+            font_size='15sp'
+        )
+        self.service_toggle.bind(state=self.on_service_toggle)
+        self.renderer_toggle = ToggleButton(
+            text="Canvas Renderer",
+            background_color=get_color_from_hex('#455a64'),
+            background_normal='',
+            background_down='',
+            size_hint=(1, None),
+            height=dp(40),
+            font_size='15sp'
+        )
+        self.renderer_toggle.bind(state=self.on_renderer_toggle)
+        # Boards past the slider range: one solution, constructed or repaired
+        # rather than searched for, shown on the canvas renderer.
+        self.large_box = BoxLayout(size_hint=(1, None), height=dp(40), spacing=5)
+        self.large_size_input = TextInput(
+            hint_text="N",
+            input_filter='int',
+            multiline=False,
+            size_hint=(0.35, 1),
+            font_size='15sp'
+        )
+        self.large_size_input.bind(on_text_validate=self.on_first_solution)
+        self.method_spinner = Spinner(
+            text='constructive',
+            values=list(FIRST_SOLUTION_METHODS),
+            background_color=get_color_from_hex('#455a64'),
+            background_normal='',
+            size_hint=(0.65, 1),
+            font_size='14sp'
+        )
+        self.large_box.add_widget(self.large_size_input)
+        self.large_box.add_widget(self.method_spinner)
+        self.first_btn = Button(
+            text="First Solution",
+            background_color=get_color_from_hex('#26a69a'),
+            background_normal='',
+            color=[1, 1, 1, 1],
+            size_hint=(1, None),
+            height=dp(40),
+            font_size='15sp',
+            bold=True
+        )
+        self.first_btn.bind(on_release=self.on_first_solution)
+        self.goto_input = TextInput(
+            hint_text="Go to row",
+            input_filter='int',
+            multiline=False,
+            size_hint=(1, None),
+            height=dp(40),
+            font_size='15sp'
+        )
+        self.goto_input.bind(on_text_validate=self.on_goto_row)
+        self.solution_input = TextInput(
+            hint_text="Go to solution #",
+            input_filter='int',
+            multiline=False,
+            size_hint=(1, None),
+            height=dp(40),
+            font_size='15sp'
+        )
+        self.solution_input.bind(on_text_validate=self.on_goto_solution)
+        # Scrubs across every solution; only the position it comes to rest
+        # on is drawn.
+        self.scrub_slider = Slider(
+            min=1,
+            max=1,
+            step=1,
+            value=1,
+            size_hint=(1, None),
+            height=dp(30),
+            cursor_size=(dp(16), dp(16)),
+            disabled=True
+        )
+        self.scrub_slider.bind(value=self.on_scrub)
+        self.scrub_trigger = Clock.create_trigger(self.apply_scrub, 0.05)
+        # Export/import of whole solution sets; the format follows the file
+        # name (.nqb binary, .csv, .ndjson, .txt, optionally .gz).
+        self.path_input = TextInput(
+            hint_text="File (.nqb, .csv, .ndjson[.gz])",
+            multiline=False,
+            size_hint=(1, None),
+            height=dp(40),
+            font_size='14sp'
+        )
+        self.transfer_box = BoxLayout(size_hint=(1, None), height=dp(40), spacing=10)
+        self.export_btn = Button(
+            text="Export",
+            background_color=get_color_from_hex('#455a64'),
+            background_normal='',
+            size_hint=(0.5, 1),
+            font_size='15sp'
+        )
+        self.export_btn.bind(on_release=self.on_export)
+        self.import_btn = Button(
+            text="Import",
+            background_color=get_color_from_hex('#455a64'),
+            background_normal='',
+            size_hint=(0.5, 1),
+            font_size='15sp'
+        )
+        self.import_btn.bind(on_release=self.on_import)
+        self.transfer_box.add_widget(self.export_btn)
+        self.transfer_box.add_widget(self.import_btn)
+        self.heatmap_toggle = ToggleButton(
+            text="Heatmap",
+            background_color=get_color_from_hex('#455a64'),
+            background_normal='',
+            background_down='',
+            size_hint=(1, None),
+            height=dp(40),
+            font_size='15sp'
+        )
+        self.heatmap_toggle.bind(state=self.on_heatmap_toggle)
+        self.perf_toggle = ToggleButton(
+            text="Perf Overlay (F12)",
+            background_color=get_color_from_hex('#455a64'),
+            background_normal='',
+            background_down='',
+            size_hint=(1, None),
+            height=dp(40),
+            font_size='15sp'
+        )
+        self.perf_toggle.bind(state=self.on_perf_toggle)
+        self.perf_overlay = None
+        Window.bind(on_key_down=self.on_key_down)
+        self.profile_toggle = ToggleButton(
+            text="Profile to Disk",
+            state='down' if nqueens_profile.enabled() else 'normal',
+            background_color=get_color_from_hex('#64b5f6' if nqueens_profile.enabled() else '#455a64'),
+            background_normal='',
+            background_down='',
+            size_hint=(1, None),
+            height=dp(40),
+            font_size='15sp'
+        )
+        self.profile_toggle.bind(state=self.on_profile_toggle)
+        self.status_label = Label(
+            text="",
+            color=get_color_from_hex('#bdbdbd'),
+            font_size='13sp',
+            size_hint=(1, None),
+            height=dp(60),
+            halign='left',
+            valign='top'
+        )
+        self.status_label.bind(width=lambda label, width: setattr(label, 'text_size', (width, None)))
+        self.assist_box = BoxLayout(size_hint=(1, None), height=dp(40), spacing=10)
+        self.complete_btn = Button(
+            text="Complete",
+            background_color=get_color_from_hex('#7e57c2'),
+            background_normal='',
+            color=[1, 1, 1, 1],
+            size_hint=(0.6, 1),
+            font_size='15sp',
+            bold=True
+        )
+        self.complete_btn.bind(on_release=self.on_complete)
+        self.hint_btn = Button(
+            text="Hint",
+            background_color=get_color_from_hex('#7e57c2'),
+            background_normal='',
+            color=[1, 1, 1, 1],
+            size_hint=(0.4, 1),
+            font_size='15sp',
+            bold=True
+        )
+        self.hint_btn.bind(on_release=self.on_hint)
+        self.assist_box.add_widget(self.complete_btn)
+        self.assist_box.add_widget(self.hint_btn)
+        self.variant_box = BoxLayout(size_hint=(1, None), height=dp(40), spacing=10)
+        self.block_toggle = ToggleButton(
+            text="Block Squares",
+            background_color=get_color_from_hex('#455a64'),
+            background_normal='',
+            background_down='',
+            size_hint=(0.6, 1),
+            font_size='15sp'
+        )
+        self.block_toggle.bind(state=self.on_block_toggle)
+        self.toroidal_toggle = ToggleButton(
+            text="Toroidal",
+            background_color=get_color_from_hex('#455a64'),
+            background_normal='',
+            background_down='',
+            size_hint=(0.4, 1),
+            font_size='15sp'
+        )
+        self.toroidal_toggle.bind(state=self.on_toroidal_toggle)
+        self.variant_box.add_widget(self.block_toggle)
+        self.variant_box.add_widget(self.toroidal_toggle)
+        self.controls.add_widget(self.size_box)
+        self.controls.add_widget(self.speed_box)
+        self.controls.add_widget(self.engine_spinner)
+        self.controls.add_widget(self.symmetry_toggle)
+        self.controls.add_widget(self.workers_spinner)
+        self.controls.add_widget(self.service_toggle)
+        self.controls.add_widget(self.renderer_toggle)
+        self.controls.add_widget(self.solve_btn)
+        self.controls.add_widget(self.watch_btn)
+        self.controls.add_widget(self.assist_box)
+        self.controls.add_widget(self.variant_box)
+        self.controls.add_widget(self.clear_btn)
+        self.controls.add_widget(self.cancel_btn)
+        self.controls.add_widget(self.nav_box)
+        self.controls.add_widget(self.scrub_slider)
+        self.controls.add_widget(self.solution_input)
+        self.controls.add_widget(self.large_box)
+        self.controls.add_widget(self.first_btn)
+        self.controls.add_widget(self.goto_input)
+        self.controls.add_widget(self.path_input)
+        self.controls.add_widget(self.transfer_box)
+        self.controls.add_widget(self.heatmap_toggle)
+        self.controls.add_widget(self.perf_toggle)
+        self.controls.add_widget(self.profile_toggle)
+        self.controls.add_widget(self.status_label)
+        self.main_content.add_widget(self.controls_scroll)
+        self.add_widget(self.main_content)
+
+    def update_bg(self, *args):
+        self.bg_rect.pos = self.pos
+        self.bg_rect.size = self.size
+
+    def update_board_panel(self, *args):
+        self.board_panel.pos = self.board_container.pos
+        self.board_panel.size = self.board_container.size
+
+    def update_controls_panel(self, *args):
+        self.controls_panel.pos = self.controls_scroll.pos
+        self.controls_panel.size = self.controls_scroll.size
+
+    def update_slider_bg(self, *args):
+        self.slider_bg.pos = self.size_slider.pos
+        self.slider_bg.size = self.size_slider.size
+
+    def on_slider_change(self, instance, value):
+        new_size = int(value)
+        if new_size != self.board_size:
+            self.board_size = new_size
+            self.size_label.text = f"Board Size: {self.board_size}"
+            self.board_label.text = f"{self.board_size}×{self.board_size} Board"
+            self.board.cancel_search()
+            self.solution_label.text = "No solutions yet"
+            self.solution_array_label.text = "Columns: []"
+            self.reset_scrub()
+            self.heatmap_toggle.state = 'normal'
+            # Restart the countdown on every step so a fast drag rebuilds once.
+            self.resize_trigger.cancel()
+            self.resize_trigger()
+
+    def apply_board_size(self, *args):
+        self.resize_trigger.cancel()
+        if self.board.n != self.board_size:
+            self.board.change_board_size(self.board_size)
+
+    def on_speed_change(self, instance, value):
+        self.board.animation_speed = value
+        self.speed_label.text = f"Speed {value:g}×"
+
+    def on_engine_change(self, instance, value):
+        self.board.solver_engine = value
+
+    @staticmethod
+    def workers_text(count):
+        return "Serial" if count == 1 else f"{count} Processes"
+
+    def on_workers_change(self, instance, value):
+        self.board.solver_workers = 1 if value == "Serial" else int(value.split()[0])
+
+    def on_renderer_toggle(self, instance, state):
+        instance.background_color = get_color_from_hex('#64b5f6' if state == 'down' else '#455a64')
+        board_class = CanvasBoard if state == 'down' else NQueensBoard
+        old_board = self.board
+        old_board.cancel_search()
+        old_board.unbind(search_progress=self.on_search_progress, searching=self.on_searching,
+                         transfer_status=self.on_board_status, service_status=self.on_board_status,
+                         loading=self.on_board_loading)
+        n = min(self.board_size, board_class.max_size)
+        self.board = board_class(n)
+        self.board.solver_engine = old_board.solver_engine
+        self.board.symmetry_reduced = old_board.symmetry_reduced
+        self.board.solver_workers = old_board.solver_workers
+        self.board.animation_speed = old_board.animation_speed
+        self.board.blocking = old_board.blocking
+        self.board.toroidal = old_board.toroidal
+        self.board.use_service = old_board.use_service
+        if n == old_board.n:
+            self.board.blocked = set(old_board.blocked)
+            self.board.draw_shading()
+        self.board.bind(search_progress=self.on_search_progress, searching=self.on_searching,
+                        transfer_status=self.on_board_status, service_status=self.on_board_status,
+                        loading=self.on_board_loading)
+        self.board_container.remove_widget(old_board)
+        self.board_container.add_widget(self.board)
+        self.size_slider.max = board_class.max_size
+        self.size_slider.value = n
+        self.solution_label.text = "No solutions yet"
+        self.solution_array_label.text = "Columns: []"
+        self.reset_scrub()
+        self.heatmap_toggle.state = 'normal'
+
+    def on_block_toggle(self, instance, state):
+        self.board.blocking = state == 'down'
+        instance.background_color = get_color_from_hex('#64b5f6' if state == 'down' else '#455a64')
+
+    def on_toroidal_toggle(self, instance, state):
+        self.board.toroidal = state == 'down'
+        instance.background_color = get_color_from_hex('#64b5f6' if state == 'down' else '#455a64')
+
+    def on_service_toggle(self, instance, state):
+        instance.background_color = get_color_from_hex('#64b5f6' if state == 'down' else '#455a64')
+        self.board.use_service = state == 'down'
+        if state != 'down':
+            return
+        # A daemon that does not answer takes up to the read timeout to say
+        # so; ask from a background thread.
+        self.status_label.text = "Looking for the solver service..."
+        threading.Thread(target=self.check_service, args=(self.board.solver_service,),
+                         name='nqueens-ping', daemon=True).start()
+
+    def check_service(self, client):
+        # Called on the ping thread.
+        Clock.schedule_once(partial(self.on_service_checked, client.available()))
+
+    def on_service_checked(self, available, dt):
+        if not self.board.use_service:
+            return
+        if available:
+            self.status_label.text = f"Using the solver service at {self.board.solver_service.address}"
+        else:
+            self.status_label.text = "Solver service not running; solving locally"
+
+    def on_symmetry_toggle(self, instance, state):
+        self.board.symmetry_reduced = state == 'down'
+        instance.background_color = get_color_from_hex('#64b5f6' if state == 'down' else '#455a64')
+
+    def on_solve(self, instance):
+        self.apply_board_size()
+        if self.board.n > self.board.max_size:
+            self.solution_label.text = "Too large to enumerate"
+            return
+        self.board.solve_nqueens()
+        self.solution_label.text = "Searching..."
+
+    def on_watch(self, instance):
+        self.apply_board_size()
+        if self.board.n > self.board.max_size:
+            self.solution_label.text = "Too large to enumerate"
+            return
+        if self.board.board_variant() is not None:
+            self.solution_label.text = "Watch Search runs on the plain board only"
+            return
+        self.board.watch_search()
+        self.solution_label.text = "Searching..."
+
+    def on_complete(self, instance):
+        self.apply_board_size()
+        if self.board.n > self.board.max_size:
+            self.solution_label.text = "Too large to enumerate"
+            return
+        if self.board.complete_from_here():
+            self.solution_label.text = "Searching..."
+        elif not self.board.solving:
+            self.solution_label.text = "No completion from here"
+
+    def on_hint(self, instance):
+        self.apply_board_size()
+        if self.board.solving or self.board.animating:
+            return
+        if len(self.board.queens_positions) >= self.board.n:
+            self.solution_label.text = "Board is full"
+        elif self.board.show_hint(self.on_hint_done):
+            self.solution_label.text = "Looking for a hint..."
+
+    def on_hint_done(self, square, timed_out):
+        if square is not None:
+            self.solution_label.text = f"{len(self.board.queens_positions)}/{self.board.n} queens placed"
+        elif timed_out:
+            self.solution_label.text = "No hint found in time"
+        else:
+            self.solution_label.text = "No completion from here"
+
+    def on_first_solution(self, instance):
+        try:
+            n = int(self.large_size_input.text or self.board_size)
+        except ValueError:
+            return
+        if n < 1:
+            return
+        method = self.method_spinner.text
+        limit = FIRST_SOLUTION_MAX_N.get(method)
+        if limit is not None and n > limit:
+            self.solution_label.text = f"{method} supports N up to {limit:,}"
+            return
+        if n > NQueensBoard.max_size and self.renderer_toggle.state != 'down':
+            self.renderer_toggle.state = 'down'
+        self.resize_trigger.cancel()
+        self.board_size = n
+        self.size_label.text = f"Board Size: {n}"
+        self.board_label.text = f"{n:,}×{n:,} Board"
+        self.board.find_first_solution(n, method)
+        self.solution_label.text = "Searching..."
+
+    def on_goto_solution(self, instance):
+        try:
+            index = int(instance.text) - 1
+        except ValueError:
+            return
+        self.apply_board_size()
+        if self.board.n > self.board.max_size:
+            self.solution_label.text = "Too large to enumerate"
+            return
+        if self.board.searching or index < 0:
+            return
+        self.board.goto_solution(index)
+        if self.board.searching:
+            self.solution_label.text = "Counting solutions..."
+        else:
+            self.update_solution_label()
+
+    def reset_scrub(self):
+        self.scrub_trigger.cancel()
+        self.scrub_slider.disabled = True
+        self.scrub_slider.max = 1
+        self.scrub_slider.value = 1
+
+    def on_scrub(self, instance, value):
+        if self.board.all_solutions and int(value) - 1 != self.board.solution_index:
+            self.scrub_trigger()
+
+    def apply_scrub(self, *args):
+        if self.board.searching or not self.board.all_solutions:
+            return
+        self.board.show_ranked(int(self.scrub_slider.value) - 1)
+        if not self.board.searching:
+            self.update_solution_label()
+
+    def on_goto_row(self, instance):
+        try:
+            row = int(instance.text) - 1
+        except ValueError:
+            return
+        if 0 <= row < self.board.n and isinstance(self.board, CanvasBoard):
+            self.board.scroll_to(row)
+
+    def on_cancel(self, instance):
+        self.board.cancel_search()
+        self.board.solving = False
+        self.solution_label.text = "Search cancelled"
+
+    def on_searching(self, instance, searching):
+        self.cancel_btn.disabled = not searching
+        if searching:
+            self.heatmap_toggle.state = 'normal'
+            return
+        self.sync_board_size()
+        report = self.board.first_solution_report
+        if self.board.all_solutions:
+            self.update_solution_label()
+        elif report is not None and report.error:
+            self.solution_label.text = report.error
+        elif self.board.solving:
+            self.solution_label.text = "No solutions found"
+            self.solution_array_label.text = "Columns: []"
+
+    def sync_board_size(self):
+        # The board can change size on its own, e.g. when an import holds a
+        # different N.
+        if self.board.n == self.board_size:
+            return
+        self.resize_trigger.cancel()
+        self.board_size = self.board.n
+        self.size_label.text = f"Board Size: {self.board_size}"
+        self.board_label.text = f"{self.board_size}×{self.board_size} Board"
+        if self.board_size <= self.size_slider.max:
+            self.size_slider.value = self.board_size
+
+    def on_export(self, instance):
+        path = self.path_input.text.strip() or f"nqueens-{self.board_size}.nqb"
+        self.apply_board_size()
+        if self.board.n > self.board.max_size:
+            self.status_label.text = "Too large to enumerate"
+            return
+        self.board.export_to(path)
+
+    def on_import(self, instance):
+        path = self.path_input.text.strip()
+        if path:
+            self.board.import_from(path)
+
+    def on_heatmap_toggle(self, instance, state):
+        instance.background_color = get_color_from_hex('#64b5f6' if state == 'down' else '#455a64')
+        stats = self.board.show_heatmap(state == 'down')
+        if state != 'down':
+            return
+        if stats is None:
+            self.status_label.text = f"Solve the board first (up to N={self.board.max_size})"
+            instance.state = 'normal'
+            return
+        valid = stats.count - len(stats.invalid)
+        sizes = ", ".join(f"{count}×{size}" for size, count in sorted(stats.class_sizes.items(), reverse=True))
+        self.status_label.text = (f"{valid:,}/{stats.count:,} valid · {stats.classes:,} classes ({sizes})\n"
+                                  f"First row: {' '.join(map(str, stats.first_row))}")
+
+    def on_perf_toggle(self, instance, state):
+        instance.background_color = get_color_from_hex('#64b5f6' if state == 'down' else '#455a64')
+        if state == 'down':
+            if self.perf_overlay is None:
+                self.perf_overlay = PerfOverlay(self)
+            self.perf_overlay.start()
+        elif self.perf_overlay is not None:
+            self.perf_overlay.stop()
+
+    def on_key_down(self, window, key, scancode, codepoint, modifiers):
+        if key == 293:  # F12
+            self.perf_toggle.state = 'normal' if self.perf_toggle.state == 'down' else 'down'
+            return True
+        return False
+
+    def on_profile_toggle(self, instance, state):
+        instance.background_color = get_color_from_hex('#64b5f6' if state == 'down' else '#455a64')
+        if state != 'down':
+            nqueens_profile.disable()
+            return
+        directory = os.environ.get('NQUEENS_PROFILE') or nqueens_profile.DEFAULT_DIRECTORY
+        try:
+            nqueens_profile.enable(directory, os.environ.get('NQUEENS_PROFILE_MODE', 'cprofile'))
+        except (OSError, ValueError) as error:
+            self.status_label.text = f"Profiling unavailable: {error}"
+            instance.state = 'normal'
+            return
+        self.status_label.text = f"Profiling solves and rebuilds into {os.path.abspath(directory)}"
+
+    def on_board_status(self, instance, status):
+        self.status_label.text = status
+
+    def on_board_loading(self, instance, loading):
+        if self.board.all_solutions and not self.board.searching:
+            self.update_solution_label()
+
+    def on_search_progress(self, instance, progress):
+        if progress is None or not self.board.searching:
+            return
+        self.solution_label.text = f"Searching... {progress.solutions} found"
+        text = f"{self.board_size}×{self.board_size} Board · {progress.nodes:,} nodes"
+        # Cached sets and traces that have not placed a queen yet have no branch.
+        if progress.branch is not None:
+            text += f" · first queen in column {progress.branch + 1}"
+        self.board_label.text = text
+
+    def on_clear(self, instance):
+        self.board.cancel_search()
+        self.board.clear_board(animate=True)
+        if self.board.blocking:
+            self.board.clear_blocks()
+        self.board.solving = False
+        self.solution_label.text = "No solutions yet"
+        self.solution_array_label.text = "Columns: []"
+        self.reset_scrub()
+        self.heatmap_toggle.state = 'normal'
+
+    def on_prev_solution(self, instance):
+        if self.board.solving and self.board.all_solutions:
+            self.board.prev_solution()
+            if not self.board.searching:
+                self.update_solution_label()
+
+    def on_next_solution(self, instance):
+        if self.board.solving and self.board.all_solutions:
+            self.board.next_solution()
+            if not self.board.searching:
+                self.update_solution_label()
+
+    def update_solution_label(self, *args):
+        count = len(self.board.all_solutions)
+        current = self.board.solution_index + 1
+        self.solution_label.text = f"Solution {current:,}/{count:,}"
+        self.scrub_slider.max = max(1, count)
+        self.scrub_slider.value = min(current, max(1, count))
+        self.scrub_slider.disabled = count < 2
+        unique_count = getattr(self.board.all_solutions, 'unique_count', None)
+        if unique_count is not None:
+            self.solution_label.text += f" ({unique_count} unique)"
+        report = self.board.first_solution_report
+        if report is not None:
+            self.solution_label.text = "Valid solution" if report.valid else "Invalid solution"
+            self.board_label.text = (f"{self.board_size:,}×{self.board_size:,} Board · "
+                                     f"{report.method} {report.solve_time * 1000:.1f} ms · "
+                                     f"checked {report.validate_time * 1000:.1f} ms")
+        elif self.board.solve_time:
+            if isinstance(self.board.all_solutions, RemoteSolutions):
+                source = "service"
+            else:
+                source = "cache" if self.board.solved_from_cache else self.board.solver_engine
+            self.board_label.text = (f"{self.board_size}×{self.board_size} Board · "
+                                     f"{source} {self.board.solve_time * 1000:.1f} ms")
+        # Display the current solution's column array (using 1-indexing)
+        sol = self.board.current_solution() if self.board.all_solutions else None
+        if self.board.loading:
+            self.solution_array_label.text = "Columns: loading..."
+        elif sol is not None:
+            sol_str = ", ".join(str(col + 1) for col in sol[:32])
+            if len(sol) > 32:
+                sol_str += f", … {len(sol) - 32:,} more"
+            self.solution_array_label.text = f"Columns: [{sol_str}]"
+        else:
+            self.solution_array_label.text = "Columns: []"
+
+class NQueensApp(App):
+    def build(self):
+        Window.minimum_width, Window.minimum_height = 600, 500
+        root = NQueensUI()
+        Window.size = (900, 700)
+        Window.clearcolor = root.theme_bg_color
+        self.title = "N Queens Puzzle Visualizer"
+        return root
+
+def run():
+    NQueensApp().run()
+
+if __name__ == "__main__":
+    run()
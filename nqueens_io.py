@@ -0,0 +1,317 @@
+"""Streaming export and import of solution sets.
+
+Solutions can be written as text (space-separated columns), CSV, NDJSON or the
+compact binary format: a header (magic, version, N), the fixed-width
+``SolutionStore`` records back to back, and a trailer with the solution count
+and CRC-32 of the records. Any of them can be gzip-compressed, which is
+detected on import. Both directions move a few thousand solutions at a time,
+so a set never has to be held in memory as a whole: exports stream from the
+cache or straight from the search, and imports are validated as they are read
+and spooled into the solution cache, from which they are memory-mapped.
+"""
+import gzip
+import io
+import json
+import os
+import struct
+import sys
+import zlib
+from time import perf_counter
+
+from nqueens_solver import DEFAULT_ENGINE, BackgroundJob, get_engine, iter_unique
+from nqueens_store import SolutionStore, record_width
+
+HEADER = struct.Struct('<4sBxH')
+TRAILER = struct.Struct('<QI')
+MAGIC = b'NQSB'
+VERSION = 1
+FORMATS = ('binary', 'text', 'csv', 'ndjson')
+CHUNK_RECORDS = 4096
+GZIP_MAGIC = b'\x1f\x8b'
+
+
+def format_solution(solution, fmt='text', zero_based=False):
+    offset = 0 if zero_based else 1
+    columns = [col + offset for col in solution]
+    if fmt == 'csv':
+        return ','.join(map(str, columns))
+    if fmt == 'ndjson':
+        return json.dumps(columns)
+    return ' '.join(map(str, columns))
+
+
+def parse_solution(line, zero_based=False):
+    line = line.strip()
+    if line.startswith('['):
+        columns = json.loads(line)
+        if not isinstance(columns, list) or any(type(col) is not int for col in columns):
+            raise ValueError(f"expected a list of column numbers, got {line!r}")
+    else:
+        columns = [int(token) for token in line.replace(',', ' ').split()]
+    offset = 0 if zero_based else 1
+    return [col - offset for col in columns]
+
+
+def format_for_path(path):
+    """Guesses ``(fmt, compress)`` from a file name such as ``n16.csv.gz``."""
+    root, ext = os.path.splitext(path.lower())
+    compress = ext == '.gz'
+    if compress:
+        ext = os.path.splitext(root)[1]
+    fmt = {'.csv': 'csv', '.ndjson': 'ndjson', '.jsonl': 'ndjson', '.txt': 'text'}.get(ext, 'binary')
+    return fmt, compress
+
+
+def open_output(path, compress=False):
+    if path == '-':
+        raw = sys.stdout.buffer
+        return gzip.GzipFile(fileobj=raw, mode='wb') if compress else raw
+    return gzip.open(path, 'wb') if compress else open(path, 'wb')
+
+
+def open_input(path):
+    """Opens ``path`` for binary reading, undoing gzip compression if present."""
+    raw = sys.stdin.buffer if path == '-' else open(path, 'rb')
+    if not hasattr(raw, 'peek'):
+        raw = io.BufferedReader(raw)
+    if raw.peek(2)[:2] == GZIP_MAGIC:
+        return gzip.GzipFile(fileobj=raw, mode='rb')
+    return raw
+
+
+def iter_records(n, engine=DEFAULT_ENGINE, symmetric=False, cache=None, cancelled=None):
+    """Yields the solutions of an N board as chunks of packed records.
+
+    Chunks come straight from the cached set when there is one, otherwise the
+    search output is packed as it is produced.
+    """
+    kind = 'unique' if symmetric else 'all'
+    store = cache.load(n, kind) if cache is not None else None
+    if store is not None:
+        for chunk in store.chunks(CHUNK_RECORDS):
+            if cancelled is not None and cancelled():
+                return
+            yield chunk
+        return
+    solutions = iter_unique(n, engine) if symmetric else get_engine(engine)(n)
+    chunk = SolutionStore(n)
+    for solution in solutions:
+        chunk.append(solution)
+        if len(chunk) == CHUNK_RECORDS:
+            if cancelled is not None and cancelled():
+                return
+            yield chunk.tobytes()
+            chunk = SolutionStore(n)
+    if len(chunk) and not (cancelled is not None and cancelled()):
+        yield chunk.tobytes()
+
+
+def write_records(out, n, chunks, fmt='binary', zero_based=False, progress=None, cancelled=None):
+    """Writes packed record chunks to ``out`` in ``fmt``; returns the solution count.
+
+    When ``cancelled()`` is true once the chunks run out, the binary trailer
+    is left off so the partial stream never reads back as a complete set.
+    """
+    width = record_width(n)
+    count = 0
+    checksum = 0
+    if fmt == 'binary':
+        out.write(HEADER.pack(MAGIC, VERSION, n))
+    for chunk in chunks:
+        if fmt == 'binary':
+            out.write(chunk)
+            checksum = zlib.crc32(chunk, checksum)
+        else:
+            lines = [format_solution(solution, fmt, zero_based) for solution in SolutionStore(n, chunk)]
+            lines.append('')
+            out.write('\n'.join(lines).encode())
+        count += len(chunk) // width
+        if progress is not None:
+            progress(count)
+    if fmt == 'binary' and not (cancelled is not None and cancelled()):
+        out.write(TRAILER.pack(count, checksum & 0xFFFFFFFF))
+    return count
+
+
+def export_solutions(path, n, fmt='binary', compress=False, engine=DEFAULT_ENGINE, symmetric=False,
+                     cache=None, zero_based=False, progress=None, cancelled=None):
+    """Writes every solution of an N board to ``path``; returns the count written.
+
+    A cancelled or failed export removes the partial file.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"unknown export format {fmt!r}; choose from {', '.join(FORMATS)}")
+    out = open_output(path, compress)
+    complete = False
+    try:
+        records = iter_records(n, engine, symmetric, cache, cancelled)
+        count = write_records(out, n, records, fmt, zero_based, progress, cancelled)
+        complete = not (cancelled is not None and cancelled())
+        return count
+    finally:
+        # Closing a gzip stream over stdout finishes it without closing stdout.
+        if out is sys.stdout.buffer:
+            out.flush()
+        else:
+            out.close()
+            # '-' is stdout, also when it is wrapped in gzip.
+            if not complete and path != '-':
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+
+def read_records(f, n=None, zero_based=False):
+    """Returns ``(n, chunks)`` for a binary or text solution stream.
+
+    ``chunks`` yields packed records; it raises ValueError for malformed input
+    and, for binary streams, when the trailer's count or checksum do not
+    match. Text input takes N from the first solution unless given.
+    """
+    if f.peek(len(MAGIC))[:len(MAGIC)] == MAGIC:
+        header = f.read(HEADER.size)
+        if len(header) < HEADER.size:
+            raise ValueError('truncated header')
+        _, version, file_n = HEADER.unpack(header)
+        if version != VERSION:
+            raise ValueError(f"unsupported format version {version}")
+        if n is not None and n != file_n:
+            raise ValueError(f"file holds N={file_n} solutions, expected N={n}")
+        return file_n, _binary_chunks(f, file_n)
+    lines = io.TextIOWrapper(f, encoding='utf-8')
+    first = None
+    for line in lines:
+        if line.strip() and not line.lstrip().startswith('#'):
+            first = parse_solution(line, zero_based)
+            break
+    if first is None:
+        if n is None:
+            raise ValueError('no solutions in input')
+        return n, iter(())
+    n = len(first) if n is None else n
+    return n, _text_chunks(lines, n, first, zero_based)
+
+
+def _binary_chunks(f, n):
+    width = record_width(n)
+    step = CHUNK_RECORDS * width
+    pending = b''
+    count = 0
+    checksum = 0
+    while True:
+        block = f.read(step)
+        if not block:
+            break
+        # Hold back enough bytes for the trailer until the stream ends.
+        data = pending + block
+        body = len(data) - TRAILER.size
+        body -= body % width
+        if body <= 0:
+            pending = data
+            continue
+        chunk, pending = data[:body], data[body:]
+        checksum = zlib.crc32(chunk, checksum)
+        count += body // width
+        yield chunk
+    if len(pending) != TRAILER.size:
+        raise ValueError('truncated solution data')
+    expected_count, expected_checksum = TRAILER.unpack(pending)
+    if expected_count != count:
+        raise ValueError(f"trailer counts {expected_count} solutions, read {count}")
+    if expected_checksum != checksum & 0xFFFFFFFF:
+        raise ValueError('checksum mismatch')
+
+
+def _text_chunks(lines, n, first, zero_based):
+    chunk = SolutionStore(n)
+    for solution in _text_solutions(lines, first, zero_based):
+        if len(solution) != n or min(solution, default=0) < 0 or max(solution, default=0) >= n:
+            raise ValueError(f"not a solution of an {n}-column board: {solution}")
+        chunk.append(solution)
+        if len(chunk) == CHUNK_RECORDS:
+            yield chunk.tobytes()
+            chunk = SolutionStore(n)
+    if len(chunk):
+        yield chunk.tobytes()
+
+
+def _text_solutions(lines, first, zero_based):
+    yield first
+    for line in lines:
+        if line.strip() and not line.lstrip().startswith('#'):
+            yield parse_solution(line, zero_based)
+
+
+def validated(n, chunks, progress=None, cancelled=None):
+    """Passes chunks through, raising ValueError at the first invalid solution.
+
+    Each chunk is checked in one vectorized pass when NumPy is available.
+    """
+    # Imported here so loading the CLI never pays for NumPy.
+    from nqueens_analysis import first_invalid
+    count = 0
+    for chunk in chunks:
+        if cancelled is not None and cancelled():
+            return
+        bad = first_invalid(n, chunk)
+        if bad is not None:
+            raise ValueError(f"solution {count + bad + 1} is not valid: {SolutionStore(n, chunk)[bad]}")
+        count += len(chunk) // record_width(n)
+        if progress is not None:
+            progress(count)
+        yield chunk
+
+
+def import_solutions(path, cache, n=None, zero_based=False, progress=None, cancelled=None):
+    """Validates the solutions in ``path`` and spools them into ``cache``.
+
+    Returns the imported set memory-mapped from the cache, or None when the
+    import was cancelled. Raises ValueError for invalid input.
+    """
+    with open_input(path) as f:
+        n, chunks = read_records(f, n, zero_based)
+        if not 0 < n <= 255:
+            raise ValueError(f"board size {n} cannot be stored")
+        saved = cache.save_stream(n, validated(n, chunks, progress, cancelled), kind='import')
+    if cancelled is not None and cancelled():
+        cache.remove(n, 'import')
+        return None
+    if not saved:
+        raise ValueError('solution set is larger than the cache budget')
+    return cache.load(n, 'import')
+
+
+class TransferJob(BackgroundJob):
+    """Runs ``export_solutions`` or ``import_solutions`` on a background thread.
+
+    The action is called with the given arguments plus ``progress`` and
+    ``cancelled`` hooks. ``on_progress`` receives the number of solutions
+    moved so far; ``on_done`` the action's result, the error it raised (or
+    None) and whether the job was cancelled.
+    """
+
+    def __init__(self, action, *args, on_progress=None, on_done=None, progress_interval=0.1, **kwargs):
+        super().__init__('nqueens-transfer')
+        self.action = action
+        self.args = args
+        self.kwargs = kwargs
+        self.on_progress = on_progress
+        self.on_done = on_done
+        self.progress_interval = progress_interval
+        self._last_report = perf_counter()
+
+    def run(self):
+        result = error = None
+        try:
+            result = self.action(*self.args, progress=self._progress, cancelled=self._cancel.is_set, **self.kwargs)
+        except (OSError, ValueError) as exc:
+            error = exc
+        if self.on_done:
+            self.on_done(result, error, self._cancel.is_set())
+
+    def _progress(self, count):
+        now = perf_counter()
+        if self.on_progress and now - self._last_report >= self.progress_interval:
+            self._last_report = now
+            self.on_progress(count)
@@ -0,0 +1,96 @@
+"""Opt-in profiling of solver runs and board rebuilds.
+
+Code marks the work worth profiling with ``with profile_section(name):``.
+While profiling is off (the default) that returns a shared no-op context, so a
+section costs one function call. Turning it on, with ``enable()`` or by setting
+``NQUEENS_PROFILE`` to a directory before start-up, makes each section either
+run under ``cProfile`` and dump a ``.prof`` file plus a text summary sorted by
+cumulative time (mode ``cprofile``), or just time the section and append a line
+to ``timings.jsonl`` (mode ``timer``, set with ``NQUEENS_PROFILE_MODE``).
+Sections may run on any thread; each profiles only the thread it runs on. A
+section that starts while another thread's is being profiled is timed instead,
+since Python 3.12 allows only one active profiler at a time.
+"""
+import io
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from time import perf_counter
+
+MODES = ('cprofile', 'timer')
+DEFAULT_DIRECTORY = 'nqueens-profiles'
+SUMMARY_LINES = 30
+
+_NULL = nullcontext()
+_settings = None
+_lock = threading.Lock()
+
+
+def enable(directory=None, mode='cprofile'):
+    global _settings
+    if mode not in MODES:
+        raise ValueError(f"unknown profiling mode {mode!r}; choose from {', '.join(MODES)}")
+    directory = directory or DEFAULT_DIRECTORY
+    os.makedirs(directory, exist_ok=True)
+    _settings = (directory, mode)
+
+
+def disable():
+    global _settings
+    _settings = None
+
+
+def enabled():
+    return _settings is not None
+
+
+def profile_section(name):
+    if _settings is None:
+        return _NULL
+    return _profiled(name, *_settings)
+
+
+@contextmanager
+def _profiled(name, directory, mode):
+    profile = None
+    if mode == 'cprofile':
+        import cProfile
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            # Python 3.12+ allows one active profiler per interpreter, so a
+            # section overlapping one on another thread is only timed.
+            profile = None
+    stamp = time.strftime('%Y%m%d-%H%M%S')
+    start = perf_counter()
+    try:
+        yield
+    finally:
+        if profile is None:
+            _write_timing(directory, name, perf_counter() - start, stamp)
+        else:
+            profile.disable()
+            _write_profile(directory, name, profile, stamp)
+
+
+def _write_timing(directory, name, seconds, stamp):
+    record = {'section': name, 'seconds': seconds, 'time': stamp,
+              'thread': threading.current_thread().name}
+    with _lock, open(os.path.join(directory, 'timings.jsonl'), 'a') as f:
+        f.write(json.dumps(record) + '\n')
+
+
+def _write_profile(directory, name, profile, stamp):
+    import pstats
+    base = os.path.join(directory, f"{name}-{stamp}-{threading.get_ident()}")
+    profile.dump_stats(base + '.prof')
+    summary = io.StringIO()
+    pstats.Stats(profile, stream=summary).sort_stats('cumulative').print_stats(SUMMARY_LINES)
+    with open(base + '.txt', 'w') as f:
+        f.write(summary.getvalue())
+
+if os.environ.get('NQUEENS_PROFILE'):
+    enable(os.environ['NQUEENS_PROFILE'], os.environ.get('NQUEENS_PROFILE_MODE', 'cprofile'))
@@ -0,0 +1,499 @@
+"""Local solver daemon shared by every visualizer and script on a machine.
+
+``python N_Queens_Puzzle_Visualizer.py serve`` starts an asyncio server on a
+Unix socket in the cache directory (or a localhost port, see
+``parse_address``). Clients send one JSON request per line and get one JSON
+reply per line, tagged with the request's ``id`` so requests can be pipelined:
+
+    {"id": 1, "op": "count", "n": 12}             -> {"id": 1, "result": 14200}
+    {"id": 2, "op": "page", "n": 12, "start": 0, "size": 100}
+    {"id": 3, "op": "solution", "n": 12, "index": 9000}
+    {"id": 4, "op": "ping"}
+
+Solutions are in lexicographic order and come from the full set in the
+solution cache when one is there, otherwise from a ``SolutionIndex`` loaded
+from (or counted into) the same cache, so results are shared with every
+in-process solve. Identical requests that arrive while one is being worked on
+wait for that one instead of repeating it, and recent pages are kept in
+memory.
+
+``SolverClient`` is the blocking client; ``RemoteSolutions`` presents a
+board's solutions as a sequence that fetches pages as they are read.
+"""
+import asyncio
+import json
+import os
+import socket
+import stat
+import threading
+from collections import OrderedDict
+from collections.abc import Sequence
+from functools import partial
+
+from nqueens_cache import SolutionCache, default_cache_dir
+from nqueens_solver import BackgroundJob, SearchStats, load_index
+
+PROTOCOL_VERSION = 1
+DEFAULT_PORT = 8742
+PAGE_SIZE = 256
+MAX_PAGE_SIZE = 10000
+MAX_N = 16
+PAGE_CACHE_SIZE = 256
+# Fetch the neighbouring page once a reader is this close to its edge.
+PREFETCH_MARGIN = 32
+# Seconds to wait for a reply. Pages are read from the UI thread and must
+# come quickly; the first count of a size may have to build its index.
+READ_TIMEOUT = 2.0
+COUNT_TIMEOUT = 600.0
+
+
+class ServiceUnavailable(ConnectionError):
+    """The daemon is not running or the connection to it broke."""
+
+
+def default_address():
+    if os.environ.get('NQUEENS_SERVICE'):
+        return os.environ['NQUEENS_SERVICE']
+    if hasattr(socket, 'AF_UNIX'):
+        return 'unix:' + os.path.join(default_cache_dir(), 'solver.sock')
+    return f'127.0.0.1:{DEFAULT_PORT}'
+
+
+def parse_address(address):
+    """Returns ``('unix', path)`` or ``('tcp', (host, port))``.
+
+    Accepts ``unix:PATH``, a path, ``HOST:PORT`` or a bare port on localhost.
+    """
+    if address.startswith('unix:'):
+        return 'unix', address[5:]
+    if os.sep in address or address.startswith('.'):
+        return 'unix', address
+    host, _, port = address.rpartition(':')
+    try:
+        return 'tcp', (host or '127.0.0.1', int(port))
+    except ValueError:
+        raise ValueError(f"bad service address {address!r}; expected unix:PATH or HOST:PORT") from None
+
+
+class SolverService:
+    """Answers daemon requests; one instance serves every connection."""
+
+    def __init__(self, cache=None, workers=1, max_n=MAX_N):
+        self.cache = cache if cache is not None else SolutionCache()
+        self.workers = workers
+        self.max_n = max_n
+        self.stats = {'requests': 0, 'coalesced': 0, 'computed': 0}
+        self._inflight = {}
+        self._sources = {}
+        self._pages = OrderedDict()
+
+    async def coalesced(self, key, func, *args):
+        """Runs ``func(*args)`` in a worker thread, once per ``key`` at a time.
+
+        A request for a key that is already being worked on waits for that
+        result. The shared work is shielded, so a client disconnecting does
+        not cancel it for the others.
+        """
+        future = self._inflight.get(key)
+        if future is None:
+            self.stats['computed'] += 1
+            future = asyncio.get_running_loop().run_in_executor(None, func, *args)
+            self._inflight[key] = future
+            future.add_done_callback(lambda _: self._inflight.pop(key, None))
+        else:
+            self.stats['coalesced'] += 1
+        return await asyncio.shield(future)
+
+    async def source(self, n):
+        # The lexicographic sequence every answer for size n is read from.
+        source = self._sources.get(n)
+        if source is None:
+            source = await self.coalesced(('source', n), self._load_source, n)
+            self._sources[n] = source
+        return source
+
+    def _load_source(self, n):
+        store = self.cache.load(n, 'all')
+        if store is not None:
+            return store
+        return load_index(n, self.cache, self.workers)[0]
+
+    async def count(self, n):
+        return len(await self.source(n))
+
+    async def page(self, n, start, size):
+        key = (n, start, size)
+        page = self._pages.get(key)
+        if page is not None:
+            self._pages.move_to_end(key)
+            return page
+        source = await self.source(n)
+        page = await self.coalesced(('page',) + key, _read_page, source, start, size)
+        self._pages[key] = page
+        while len(self._pages) > PAGE_CACHE_SIZE:
+            self._pages.popitem(last=False)
+        return page
+
+    async def solution(self, n, index):
+        source = await self.source(n)
+        if not 0 <= index < len(source):
+            raise ValueError(f"solution index {index} out of range for N={n}")
+        return (await self.page(n, index, 1))[0]
+
+    async def dispatch(self, request):
+        self.stats['requests'] += 1
+        op = request.get('op')
+        if op == 'ping':
+            return {'version': PROTOCOL_VERSION, 'max_n': self.max_n, **self.stats}
+        n = _integer(request, 'n')
+        if not 1 <= n <= self.max_n:
+            raise ValueError(f"N must be between 1 and {self.max_n}")
+        if op == 'count':
+            return await self.count(n)
+        if op == 'page':
+            size = _integer(request, 'size', PAGE_SIZE)
+            if not 1 <= size <= MAX_PAGE_SIZE:
+                raise ValueError(f"page size must be between 1 and {MAX_PAGE_SIZE}")
+            return await self.page(n, max(0, _integer(request, 'start', 0)), size)
+        if op == 'solution':
+            return await self.solution(n, _integer(request, 'index'))
+        raise ValueError(f"unknown op {op!r}")
+
+    async def handle_connection(self, reader, writer):
+        lock = asyncio.Lock()
+        pending = set()
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                task = asyncio.ensure_future(self._answer(line, writer, lock))
+                pending.add(task)
+                task.add_done_callback(pending.discard)
+        except (ConnectionError, asyncio.CancelledError):
+            # Cancelled on shutdown; ending quietly keeps asyncio from
+            # logging every open connection.
+            pass
+        finally:
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+            writer.close()
+
+    async def _answer(self, line, writer, lock):
+        request_id = None
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise ValueError('request must be a JSON object')
+            request_id = request.get('id')
+            reply = {'id': request_id, 'result': await self.dispatch(request)}
+        except (ValueError, OSError) as error:
+            reply = {'id': request_id, 'error': str(error)}
+        async with lock:
+            try:
+                writer.write(json.dumps(reply).encode() + b'\n')
+                await writer.drain()
+            except ConnectionError:
+                pass
+
+
+def _integer(request, name, default=None):
+    value = request.get(name, default)
+    if type(value) is not int:
+        raise ValueError(f"{name!r} must be an integer")
+    return value
+
+
+def _read_page(source, start, size):
+    stop = min(start + size, len(source))
+    return [list(source[k]) for k in range(start, stop)]
+
+
+async def serve(address=None, service=None, on_ready=None):
+    """Serves requests on ``address`` until cancelled."""
+    service = service if service is not None else SolverService()
+    kind, target = parse_address(address or default_address())
+    if kind == 'unix':
+        _claim_socket_path(target)
+        server = await asyncio.start_unix_server(service.handle_connection, path=target)
+    else:
+        server = await asyncio.start_server(service.handle_connection, *target)
+    if on_ready is not None:
+        on_ready(server)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        if kind == 'unix':
+            try:
+                os.unlink(target)
+            except OSError:
+                pass
+
+
+def _claim_socket_path(path):
+    # A socket file left behind by a daemon that died is removed; one that
+    # still answers belongs to a running daemon.
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    try:
+        mode = os.stat(path).st_mode
+    except FileNotFoundError:
+        return
+    if not stat.S_ISSOCK(mode):
+        raise OSError(f"{path} exists and is not a socket")
+    probe = socket.socket(socket.AF_UNIX)
+    try:
+        probe.connect(path)
+    except OSError:
+        os.unlink(path)
+    else:
+        raise OSError(f"a solver service is already listening on {path}")
+    finally:
+        probe.close()
+
+
+def run_server(address=None, cache=None, workers=1, max_n=MAX_N):
+    try:
+        asyncio.run(serve(address, SolverService(cache, workers, max_n)))
+    except KeyboardInterrupt:
+        pass
+
+
+class SolverClient:
+    """Blocking client for the daemon; safe to share between threads.
+
+    Connects lazily and reconnects after a failure. Calls raise
+    ``ServiceUnavailable`` when the daemon cannot be reached or does not
+    reply within ``read_timeout`` seconds, and ``ValueError`` for requests
+    it rejects.
+    """
+
+    def __init__(self, address=None, timeout=2.0, read_timeout=READ_TIMEOUT):
+        self.address = address or default_address()
+        self.timeout = timeout
+        self.read_timeout = read_timeout
+        self._lock = threading.Lock()
+        self._socket = None
+        self._file = None
+        self._next_id = 0
+
+    def _connect(self):
+        kind, target = parse_address(self.address)
+        if kind == 'unix':
+            sock = socket.socket(socket.AF_UNIX)
+            sock.settimeout(self.timeout)
+            try:
+                sock.connect(target)
+            except OSError:
+                sock.close()
+                raise
+        else:
+            sock = socket.create_connection(target, self.timeout)
+        self._socket = sock
+        self._file = sock.makefile('rwb')
+
+    def close(self):
+        if self._socket is not None:
+            try:
+                self._file.close()
+                self._socket.close()
+            except OSError:
+                pass
+            self._socket = self._file = None
+
+    def call(self, op, reply_timeout=None, **params):
+        with self._lock:
+            try:
+                if self._socket is None:
+                    self._connect()
+                # A reply that times out leaves the stream mid-message, so the
+                # connection is dropped below like any other failure.
+                self._socket.settimeout(reply_timeout or self.read_timeout)
+                self._next_id += 1
+                self._file.write(json.dumps({'id': self._next_id, 'op': op, **params}).encode() + b'\n')
+                self._file.flush()
+                line = self._file.readline()
+            except OSError as error:
+                self.close()
+                raise ServiceUnavailable(f"solver service at {self.address}: {error}") from error
+            if not line:
+                self.close()
+                raise ServiceUnavailable(f"solver service at {self.address} closed the connection")
+        reply = json.loads(line)
+        if 'error' in reply:
+            raise ValueError(reply['error'])
+        return reply['result']
+
+    def available(self):
+        try:
+            self.call('ping')
+        except ServiceUnavailable:
+            return False
+        return True
+
+    def ping(self):
+        return self.call('ping')
+
+    def count(self, n):
+        return self.call('count', COUNT_TIMEOUT, n=n)
+
+    def page(self, n, start, size=PAGE_SIZE):
+        return self.call('page', n=n, start=start, size=size)
+
+    def solution(self, n, index):
+        return self.call('solution', n=n, index=index)
+
+
+class RemoteSolutions(Sequence):
+    """The solutions of one board size, fetched from the daemon a page at a time.
+
+    Recently read pages are kept, and reading near the edge of a page fetches
+    its neighbour in the background. If the daemon goes away, ``fallback()``
+    is asked for a local sequence in the same order (e.g. the cached set, or
+    a ``SolutionIndex`` whose counts are already on disk) and reads continue
+    from that. When it returns None, or there is none, the read raises
+    ``ServiceUnavailable`` and building a local index is left to the caller.
+
+    Indexing blocks on the daemon when the page is not held. Callers that
+    must not wait, such as a UI thread, use ``cached`` and ``fetch`` instead.
+    """
+
+    def __init__(self, client, n, count, page_size=PAGE_SIZE, first_page=None, fallback=None, max_pages=16):
+        self.client = client
+        self.n = n
+        self.page_size = page_size
+        self.fallback = fallback
+        self.max_pages = max_pages
+        self._count = count
+        self._pages = OrderedDict()
+        self._prefetching = set()
+        self._local = None
+        self._lock = threading.Lock()
+        if first_page is not None:
+            self._pages[0] = first_page
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._count))]
+        number, offset = self._locate(index)
+        return self.page(number)[offset]
+
+    def _locate(self, index):
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError('solution index out of range')
+        number, offset = divmod(index, self.page_size)
+        if offset >= self.page_size - PREFETCH_MARGIN:
+            self.prefetch(number + 1)
+        elif offset < PREFETCH_MARGIN:
+            self.prefetch(number - 1)
+        return number, offset
+
+    def cached(self, index):
+        """Returns solution ``index`` if it can be read without the daemon, else None."""
+        number, offset = self._locate(index)
+        with self._lock:
+            page = self._pages.get(number)
+            if page is not None:
+                self._pages.move_to_end(number)
+                return page[offset]
+        if self._local is not None:
+            return self.page(number)[offset]
+        return None
+
+    def fetch(self, index, callback):
+        """Loads the page holding solution ``index`` on a background thread.
+
+        ``callback(error)`` is then called on that thread, with None once the
+        page is held (so ``cached(index)`` returns the solution) or with the
+        ``ServiceUnavailable`` or ``ValueError`` the read raised.
+        """
+        number, _ = self._locate(index)
+        threading.Thread(target=self._fetch, args=(number, callback), name='nqueens-fetch', daemon=True).start()
+
+    def _fetch(self, number, callback):
+        try:
+            self.page(number)
+        except (ServiceUnavailable, ValueError) as error:
+            callback(error)
+        else:
+            callback(None)
+
+    def page(self, number):
+        with self._lock:
+            page = self._pages.get(number)
+            if page is not None:
+                self._pages.move_to_end(number)
+                return page
+        start = number * self.page_size
+        if self._local is None:
+            try:
+                page = self.client.page(self.n, start, self.page_size)
+            except ServiceUnavailable:
+                local = self.fallback() if self.fallback is not None else None
+                if local is None:
+                    raise
+                self._local = local
+        if self._local is not None:
+            page = self._local[start:start + self.page_size]
+        with self._lock:
+            self._pages[number] = page
+            while len(self._pages) > self.max_pages:
+                self._pages.popitem(last=False)
+        return page
+
+    def prefetch(self, number):
+        if not 0 <= number * self.page_size < self._count or self._local is not None:
+            return
+        with self._lock:
+            if number in self._pages or number in self._prefetching:
+                return
+            self._prefetching.add(number)
+        threading.Thread(target=self._prefetch, args=(number,), name='nqueens-prefetch', daemon=True).start()
+
+    def _prefetch(self, number):
+        try:
+            self.page(number)
+        except (ServiceUnavailable, ValueError):
+            pass
+        finally:
+            with self._lock:
+                self._prefetching.discard(number)
+
+
+class ServiceJob(BackgroundJob):
+    """Asks the daemon for a board's solutions on a background thread.
+
+    ``on_done`` receives a ``RemoteSolutions`` holding the count and first
+    page, or None when the daemon cannot be reached so the caller can solve
+    in-process instead.
+    """
+
+    def __init__(self, n, client, on_solution=None, on_done=None, page_size=PAGE_SIZE, fallback=None):
+        super().__init__(f'nqueens-service-{n}')
+        self.n = n
+        self.client = client
+        self.on_solution = on_solution
+        self.on_done = on_done
+        self.page_size = page_size
+        self.fallback = fallback
+        self.stats = SearchStats()
+
+    def run(self):
+        try:
+            count = self.client.count(self.n)
+            first_page = self.client.page(self.n, 0, self.page_size) if count else []
+        except (ServiceUnavailable, ValueError):
+            solutions = None
+        else:
+            self.stats.solutions = count
+            if first_page and self.on_solution:
+                self.on_solution(first_page[0])
+            solutions = RemoteSolutions(self.client, self.n, count, self.page_size, first_page,
+                                        partial(self.fallback, self.n) if self.fallback else None)
+        if self.on_done:
+            self.on_done(solutions, self.stats.progress(), self._cancel.is_set())
@@ -0,0 +1,1215 @@
+"""Solver engines for the N-Queens visualizer.
+
+Every engine is a generator ``engine(n, prefix=())`` that yields each solution
+as a list of column indices (one per row). ``prefix`` fixes the columns of the
+first rows and must itself be conflict free. When ``stats`` is given, the number
+of queens placed is added to ``stats.nodes`` as the search goes.
+
+The engines in ``ORDERED_ENGINES`` yield solutions in lexicographic order, so
+they can be swapped without changing how solutions are indexed, and only their
+results are cached. ``dlx`` yields the same set in search order; it is offered
+for counting and is what solves variant boards.
+"""
+import queue
+import random
+import threading
+from array import array
+from bisect import bisect_right
+from collections import Counter, deque, namedtuple
+from collections.abc import Sequence
+from functools import lru_cache
+from operator import add, sub
+from time import perf_counter
+
+from nqueens_dlx import first_dlx_solution, make_variant, solve_dlx
+from nqueens_profile import profile_section
+from nqueens_store import SolutionStore
+
+
+def solve_recursive(n, prefix=(), stats=None):
+    board = list(prefix) + [-1] * (n - len(prefix))
+
+    def solve(row):
+        if row == n:
+            yield board[:]
+            return
+        for col in range(n):
+            if all(board[r] != col and abs(board[r] - col) != row - r for r in range(row)):
+                board[row] = col
+                if stats is not None:
+                    stats.nodes += 1
+                yield from solve(row + 1)
+
+    yield from solve(len(prefix))
+
+
+def solve_bitmask(n, prefix=(), stats=None):
+    if n < 1:
+        return
+    full = (1 << n) - 1
+    start = len(prefix)
+    board = list(prefix) + [0] * (n - start)
+    # Per-row state: columns, left diagonals, right diagonals and the
+    # candidate squares still to try in that row.
+    cols = [0] * (n + 1)
+    left = [0] * (n + 1)
+    right = [0] * (n + 1)
+    avail = [0] * (n + 1)
+    c = l = r = 0
+    for col in prefix:
+        bit = 1 << col
+        c |= bit
+        l = ((l | bit) << 1) & full
+        r = (r | bit) >> 1
+    if start == n:
+        yield board[:]
+        return
+    row = start
+    cols[row] = c
+    left[row] = l
+    right[row] = r
+    avail[row] = full & ~(c | l | r)
+    nodes = 0
+    while row >= start:
+        bits = avail[row]
+        if not bits:
+            row -= 1
+            continue
+        bit = bits & -bits
+        avail[row] = bits ^ bit
+        board[row] = bit.bit_length() - 1
+        nodes += 1
+        if row == n - 1:
+            if stats is not None:
+                stats.nodes += nodes
+                nodes = 0
+            yield board[:]
+            continue
+        c = cols[row] | bit
+        l = ((left[row] | bit) << 1) & full
+        r = (right[row] | bit) >> 1
+        row += 1
+        cols[row] = c
+        left[row] = l
+        right[row] = r
+        avail[row] = full & ~(c | l | r)
+    if stats is not None:
+        stats.nodes += nodes
+
+
+def count_bitmask(n, prefix=()):
+    if n < 1:
+        return 0
+    full = (1 << n) - 1
+    cols = left = right = 0
+    for col in prefix:
+        bit = 1 << col
+        cols |= bit
+        left = ((left | bit) << 1) & full
+        right = (right | bit) >> 1
+
+    def count(cols, left, right):
+        if cols == full:
+            return 1
+        total = 0
+        avail = full & ~(cols | left | right)
+        while avail:
+            bit = avail & -avail
+            avail ^= bit
+            total += count(cols | bit, ((left | bit) << 1) & full, (right | bit) >> 1)
+        return total
+
+    return count(cols, left, right)
+
+
+ENGINES = {
+    'bitmask': solve_bitmask,
+    'recursive': solve_recursive,
+    'dlx': solve_dlx,
+}
+DEFAULT_ENGINE = 'bitmask'
+# Engines that yield solutions in lexicographic order; only their results
+# are written to the cache, which other readers index by rank.
+ORDERED_ENGINES = frozenset({'bitmask', 'recursive'})
+
+
+def get_engine(name):
+    try:
+        return ENGINES[name]
+    except KeyError:
+        raise ValueError(f"Unknown solver engine {name!r}; choose from {', '.join(ENGINES)}") from None
+
+
+def is_valid_solution(solution, n=None):
+    # Linear time: a permutation of the columns is valid when no two rows
+    # share a diagonal or an anti-diagonal.
+    n = len(solution) if n is None else n
+    if len(solution) != n:
+        return False
+    if n == 0:
+        return True
+    if min(solution) < 0 or max(solution) >= n:
+        return False
+    rows = range(n)
+    return (len(set(solution)) == n
+            and len(set(map(sub, rows, solution))) == n
+            and len(set(map(add, rows, solution))) == n)
+
+
+def conflicting_queens(positions):
+    rows, cols, diagonals, anti_diagonals = Counter(), Counter(), Counter(), Counter()
+    for row, col in positions:
+        rows[row] += 1
+        cols[col] += 1
+        diagonals[row - col] += 1
+        anti_diagonals[row + col] += 1
+    return {(row, col) for row, col in positions
+            if rows[row] > 1 or cols[col] > 1 or diagonals[row - col] > 1 or anti_diagonals[row + col] > 1}
+
+
+class ConflictIndex:
+    """Incrementally tracks which queens are attacked.
+
+    Queens are indexed by row, column, diagonal and anti-diagonal, so placing
+    or removing one only inspects the lines through that square. Both
+    operations return ``{position: is_conflict}`` for every queen whose
+    conflict state changed, including the queen itself.
+    """
+
+    def __init__(self, positions=()):
+        self.clear()
+        for position in positions:
+            self.add(position)
+
+    def clear(self):
+        self.lines = ({}, {}, {}, {})
+        self.conflicted = set()
+
+    def _keys(self, position):
+        row, col = position
+        return row, col, row - col, row + col
+
+    def _attacked(self, position):
+        return any(len(table[key]) > 1 for table, key in zip(self.lines, self._keys(position)))
+
+    def __contains__(self, position):
+        return position in self.lines[0].get(position[0], ())
+
+    def __len__(self):
+        return sum(len(members) for members in self.lines[0].values())
+
+    def is_conflicted(self, position):
+        return position in self.conflicted
+
+    def queens_in_row(self, row):
+        return self.lines[0].get(row, ())
+
+    def add(self, position):
+        changed = {}
+        for table, key in zip(self.lines, self._keys(position)):
+            members = table.setdefault(key, set())
+            members.add(position)
+            if len(members) == 2:
+                # The line just went from one queen to two, so the queen
+                # already on it may have become attacked.
+                for other in members:
+                    if other != position and other not in self.conflicted:
+                        self.conflicted.add(other)
+                        changed[other] = True
+        is_conflict = self._attacked(position)
+        if is_conflict:
+            self.conflicted.add(position)
+        changed[position] = is_conflict
+        return changed
+
+    def remove(self, position):
+        changed = {position: False}
+        self.conflicted.discard(position)
+        for table, key in zip(self.lines, self._keys(position)):
+            members = table[key]
+            members.discard(position)
+            if len(members) == 1:
+                for other in members:
+                    if other in self.conflicted and not self._attacked(other):
+                        self.conflicted.discard(other)
+                        changed[other] = False
+            elif not members:
+                del table[key]
+        return changed
+
+
+def completion_masks(n, fixed):
+    """Returns the columns each row may still take around the ``fixed`` queens.
+
+    ``fixed`` is an iterable of (row, col) squares. The result holds one column
+    bitmask per row, with every column, diagonal and anti-diagonal covered by a
+    fixed queen already removed from the other rows. Returns None when the
+    placement can be seen to have no completion without searching: queens that
+    attack each other, a row with no square left, or a free column that no
+    free row can reach.
+    """
+    fixed = list(fixed)
+    if any(not (0 <= row < n and 0 <= col < n) for row, col in fixed) or conflicting_queens(fixed):
+        return None
+    full = (1 << n) - 1
+    masks = [full] * n
+    for fixed_row, fixed_col in fixed:
+        for row in range(n):
+            if row == fixed_row:
+                masks[row] &= 1 << fixed_col
+                continue
+            distance = abs(row - fixed_row)
+            attacked = 1 << fixed_col
+            if fixed_col + distance < n:
+                attacked |= 1 << (fixed_col + distance)
+            if fixed_col - distance >= 0:
+                attacked |= 1 << (fixed_col - distance)
+            masks[row] &= ~attacked
+    reachable = 0
+    for mask in masks:
+        if not mask:
+            return None
+        reachable |= mask
+    if reachable != full:
+        return None
+    return masks
+
+
+def solve_completions(n, fixed, stats=None):
+    """Yields every solution that keeps the ``fixed`` queens in place.
+
+    The same iterative bitmask search as ``solve_bitmask``, with each row
+    limited to the squares ``completion_masks`` leaves open.
+    """
+    masks = completion_masks(n, fixed)
+    if masks is None or n < 1:
+        return
+    full = (1 << n) - 1
+    board = [0] * n
+    cols = [0] * (n + 1)
+    left = [0] * (n + 1)
+    right = [0] * (n + 1)
+    avail = [0] * (n + 1)
+    avail[0] = masks[0]
+    row = 0
+    nodes = 0
+    while row >= 0:
+        bits = avail[row]
+        if not bits:
+            row -= 1
+            continue
+        bit = bits & -bits
+        avail[row] = bits ^ bit
+        board[row] = bit.bit_length() - 1
+        nodes += 1
+        if row == n - 1:
+            if stats is not None:
+                stats.nodes += nodes
+                nodes = 0
+            yield board[:]
+            continue
+        c = cols[row] | bit
+        l = ((left[row] | bit) << 1) & full
+        r = (right[row] | bit) >> 1
+        row += 1
+        cols[row] = c
+        left[row] = l
+        right[row] = r
+        avail[row] = masks[row] & ~(c | l | r)
+    if stats is not None:
+        stats.nodes += nodes
+
+
+@lru_cache(maxsize=1024)
+def _count_completions(n, fixed):
+    masks = completion_masks(n, fixed)
+    if masks is None:
+        return 0
+    full = (1 << n) - 1
+
+    def count(row, cols, left, right):
+        if row == n:
+            return 1
+        total = 0
+        avail = masks[row] & ~(cols | left | right)
+        while avail:
+            bit = avail & -avail
+            avail ^= bit
+            total += count(row + 1, cols | bit, ((left | bit) << 1) & full, (right | bit) >> 1)
+        return total
+
+    return count(0, 0, 0, 0)
+
+
+def count_completions(n, fixed):
+    return _count_completions(n, frozenset(fixed))
+
+
+@lru_cache(maxsize=1024)
+def _first_completion(n, fixed):
+    for solution in solve_completions(n, fixed):
+        return tuple(solution)
+    return None
+
+
+def first_completion(n, fixed):
+    """Returns the first completion of ``fixed`` as a tuple, or None.
+
+    Results are cached per placement, so asking again after undoing a move
+    or for the next hint along the same line answers immediately.
+    """
+    return _first_completion(n, frozenset(fixed))
+
+
+# Up to this size hints come from the cached lexicographic first completion;
+# larger boards and variants use Dancing Links with restarts.
+CACHED_HINT_N = 12
+
+
+def hint(n, fixed, variant=None, cancelled=None):
+    """Returns a (row, col) square for the next queen, or None.
+
+    The suggestion comes from a completion, in the free row with the fewest
+    open squares. None means the board is full, cannot be completed, or
+    ``cancelled()`` turned true first. On a ``variant`` board, whose masks
+    must already hold ``fixed``, the completion comes from the Dancing Links
+    engine, as it does for plain boards above ``CACHED_HINT_N``.
+    """
+    fixed = frozenset(fixed)
+    if variant is None and n <= CACHED_HINT_N:
+        solution = _first_completion(n, fixed)
+    elif variant is None and completion_masks(n, fixed) is None:
+        solution = None
+    else:
+        solution = first_dlx_solution(n, variant or make_variant(n, fixed=fixed), cancelled)
+    if solution is None:
+        return None
+    masks = completion_masks(n, fixed) if variant is None else variant.masks
+    taken = {row for row, _ in fixed}
+    free_rows = [row for row in range(n) if row not in taken]
+    if not free_rows:
+        return None
+    row = min(free_rows, key=lambda row: bin(masks[row]).count('1'))
+    return row, solution[row]
+
+
+def symmetries(solution):
+    n = len(solution)
+    rotated = [tuple(solution)]
+    for _ in range(3):
+        previous = rotated[-1]
+        turned = [0] * n
+        for row, col in enumerate(previous):
+            turned[col] = n - 1 - row
+        rotated.append(tuple(turned))
+    return rotated + [tuple(n - 1 - col for col in sol) for sol in rotated]
+
+
+def iter_unique(n, engine=DEFAULT_ENGINE):
+    # The lexicographically smallest member of a symmetry class always has its
+    # first queen in the left half, so the right half never needs searching.
+    solve = get_engine(engine)
+    for first in range((n + 1) // 2):
+        for solution in solve(n, (first,)):
+            if tuple(solution) == min(symmetries(solution)):
+                yield solution
+
+
+class SymmetricSolutionSet(Sequence):
+    """All solutions of a board, stored as one canonical solution per symmetry class.
+
+    Members of a class are expanded only when indexed, so the set is ordered by
+    canonical solution and then by the sorted members of its class.
+    """
+
+    def __init__(self, n, unique):
+        self.n = n
+        self.unique = unique if isinstance(unique, SolutionStore) else SolutionStore.from_solutions(n, unique)
+        self._offsets = array('Q')
+        total = 0
+        for solution in self.unique:
+            self._offsets.append(total)
+            total += len(set(symmetries(solution)))
+        self._total = total
+        self._expanded = (None, None)
+
+    def __len__(self):
+        return self._total
+
+    @property
+    def unique_count(self):
+        return len(self.unique)
+
+    def class_members(self, k):
+        if self._expanded[0] != k:
+            members = sorted(set(symmetries(self.unique[k])))
+            self._expanded = (k, [list(member) for member in members])
+        return self._expanded[1]
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._total))]
+        if index < 0:
+            index += self._total
+        if not 0 <= index < self._total:
+            raise IndexError('solution index out of range')
+        k = bisect_right(self._offsets, index) - 1
+        return self.class_members(k)[index - self._offsets[k]]
+
+
+def solve_symmetric(n, engine=DEFAULT_ENGINE):
+    return SymmetricSolutionSet(n, iter_unique(n, engine))
+
+
+def iter_prefixes(n, depth, first_cols=None):
+    first_cols = range(n) if first_cols is None else first_cols
+    depth = min(depth, n)
+    prefix = []
+
+    def extend(row):
+        if row == depth:
+            yield tuple(prefix)
+            return
+        for col in (first_cols if row == 0 else range(n)):
+            if all(prefix[r] != col and abs(prefix[r] - col) != row - r for r in range(row)):
+                prefix.append(col)
+                yield from extend(row + 1)
+                prefix.pop()
+
+    yield from extend(0)
+
+
+def default_split_depth(n):
+    return 2 if n > 8 else 1
+
+
+# The subtree functions run inside worker processes, so they take plain
+# picklable arguments and return whole results rather than streaming them.
+
+def solve_subtree(n, prefix, engine=DEFAULT_ENGINE, symmetric=False):
+    stats = SearchStats()
+    solutions = SolutionStore(n)
+    for solution in get_engine(engine)(n, prefix, stats):
+        if symmetric and tuple(solution) != min(symmetries(solution)):
+            continue
+        solutions.append(solution)
+    return solutions.tobytes(), stats.nodes
+
+
+def count_subtree(n, prefix):
+    return count_bitmask(n, prefix)
+
+
+def _split(n, depth, symmetric):
+    depth = default_split_depth(n) if depth is None else depth
+    first_cols = range((n + 1) // 2) if symmetric else None
+    return list(iter_prefixes(n, depth, first_cols))
+
+
+def iter_subtrees(n, workers=None, depth=None, engine=DEFAULT_ENGINE, symmetric=False, cancelled=None, poll=0.1):
+    """Solves the prefix subtrees in a process pool, yielding ``(prefix, chunk, nodes)``.
+
+    Subtrees are submitted and collected in prefix order, which keeps the
+    merged chunks in the same lexicographic order as the serial engines.
+    ``cancelled()`` is checked every ``poll`` seconds while waiting.
+    """
+    from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeout
+    prefixes = _split(n, depth, symmetric)
+    pool = ProcessPoolExecutor(max_workers=workers)
+    try:
+        futures = [pool.submit(solve_subtree, n, prefix, engine, symmetric) for prefix in prefixes]
+        for prefix, future in zip(prefixes, futures):
+            while True:
+                if cancelled is not None and cancelled():
+                    return
+                try:
+                    chunk, nodes = future.result(timeout=poll)
+                    break
+                except FutureTimeout:
+                    continue
+            yield prefix, chunk, nodes
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def solve_parallel(n, workers=None, depth=None, engine=DEFAULT_ENGINE, symmetric=False):
+    solutions = SolutionStore(n)
+    for _, chunk, _ in iter_subtrees(n, workers, depth, engine, symmetric):
+        solutions.frombytes(chunk)
+    return SymmetricSolutionSet(n, solutions) if symmetric else solutions
+
+
+def count_parallel(n, workers=None, depth=None):
+    from concurrent.futures import ProcessPoolExecutor
+    prefixes = _split(n, depth, False)
+    if not prefixes:
+        return 0
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return sum(pool.map(count_subtree, [n] * len(prefixes), prefixes))
+
+
+def default_index_depth(n):
+    if n <= 6:
+        return 1
+    if n <= 9:
+        return 2
+    return 3 if n <= 13 else 4
+
+
+class SolutionIndex(Sequence):
+    """Random access to the solutions of a board in lexicographic order.
+
+    Holds the number of solutions under every placement of the first
+    ``depth`` rows that has any. The k-th solution is found by locating its
+    prefix among the running totals and then searching only that prefix's
+    subtree, so no more than one subtree is ever enumerated; the last subtree
+    visited is kept for stepping through its neighbours.
+    """
+
+    def __init__(self, n, depth, prefixes, counts):
+        self.n = n
+        self.depth = depth
+        self.prefixes = bytes(prefixes)
+        self.counts = counts
+        self._offsets = array('Q')
+        total = 0
+        for count in counts:
+            self._offsets.append(total)
+            total += count
+        self._total = total
+        self._expanded = (None, None)
+
+    @classmethod
+    def build(cls, n, depth=None, workers=1, on_prefix=None, cancelled=None):
+        """Counts every prefix subtree, optionally across a process pool.
+
+        ``on_prefix(prefix, count)`` is called as each count arrives; when
+        ``cancelled()`` turns true the build stops and returns None.
+        """
+        depth = min(default_index_depth(n) if depth is None else depth, n)
+        prefixes = list(iter_prefixes(n, depth))
+        if workers > 1:
+            from concurrent.futures import ProcessPoolExecutor
+            pool = ProcessPoolExecutor(max_workers=workers)
+            counts = pool.map(count_subtree, [n] * len(prefixes), prefixes, chunksize=16)
+        else:
+            pool = None
+            counts = (count_bitmask(n, prefix) for prefix in prefixes)
+        kept, kept_counts = bytearray(), array('Q')
+        try:
+            for prefix, count in zip(prefixes, counts):
+                if cancelled is not None and cancelled():
+                    return None
+                if count:
+                    kept.extend(prefix)
+                    kept_counts.append(count)
+                if on_prefix is not None:
+                    on_prefix(prefix, count)
+        finally:
+            if pool is not None:
+                pool.shutdown(wait=False, cancel_futures=True)
+        return cls(n, depth, kept, kept_counts)
+
+    def __len__(self):
+        return self._total
+
+    def prefix(self, k):
+        start = k * self.depth
+        return tuple(self.prefixes[start:start + self.depth])
+
+    def subtree(self, k):
+        # Read once so concurrent lookups never pair one subtree's key with
+        # another's solutions.
+        expanded = self._expanded
+        if expanded[0] != k:
+            expanded = self._expanded = (k, SolutionStore.from_solutions(self.n, solve_bitmask(self.n, self.prefix(k))))
+        return expanded[1]
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._total))]
+        if index < 0:
+            index += self._total
+        if not 0 <= index < self._total:
+            raise IndexError('solution index out of range')
+        k = bisect_right(self._offsets, index) - 1
+        return self.subtree(k)[index - self._offsets[k]]
+
+    def rank(self, solution):
+        """Returns the position of ``solution`` in lexicographic order."""
+        solution = list(solution)
+        if len(solution) != self.n or not is_valid_solution(solution):
+            raise ValueError('not a solution of this board')
+        prefix = bytes(solution[:self.depth])
+        depth = self.depth
+        # Prefixes are fixed-width and sorted, so they can be bisected in place.
+        lo, hi = 0, len(self.counts)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.prefixes[mid * depth:(mid + 1) * depth] < prefix:
+                lo = mid + 1
+            else:
+                hi = mid
+        for position, candidate in enumerate(solve_bitmask(self.n, tuple(prefix))):
+            if candidate == solution:
+                return self._offsets[lo] + position
+        raise ValueError('not a solution of this board')
+
+
+def load_index(n, cache=None, workers=1, on_prefix=None, cancelled=None):
+    """Returns ``(index, cached)``, reading the counts from ``cache`` or building and saving them.
+
+    ``index`` is None when the build was cancelled.
+    """
+    saved = cache.load_counts(n) if cache is not None else None
+    if saved is not None:
+        return SolutionIndex(n, *saved), True
+    index = SolutionIndex.build(n, workers=workers, on_prefix=on_prefix, cancelled=cancelled)
+    if index is not None and cache is not None:
+        try:
+            cache.save_counts(n, index.depth, index.prefixes, index.counts)
+        except OSError:
+            pass
+    return index, False
+
+
+SearchProgress = namedtuple('SearchProgress', 'solutions nodes branch elapsed')
+
+
+class SearchStats:
+    def __init__(self):
+        self.nodes = 0
+        self.solutions = 0
+        self.branch = None
+        self.started = perf_counter()
+
+    def progress(self):
+        return SearchProgress(self.solutions, self.nodes, self.branch, perf_counter() - self.started)
+
+
+class BackgroundJob:
+    """Base for work run on a daemon thread.
+
+    Subclasses name the thread and implement ``run``. Their callbacks are
+    invoked from the worker thread; GUI callers are expected to hop back to
+    their own thread. ``cancel`` only sets a flag, which ``run`` checks as it
+    goes.
+    """
+
+    def __init__(self, name):
+        self._cancel = threading.Event()
+        self._thread = threading.Thread(target=self.run, name=name, daemon=True)
+
+    @property
+    def cancelled(self):
+        return self._cancel.is_set()
+
+    def start(self):
+        self._thread.start()
+
+    def cancel(self):
+        self._cancel.set()
+
+    def join(self, timeout=None):
+        self._thread.join(timeout)
+
+    def run(self):
+        raise NotImplementedError
+
+
+class SolverJob(BackgroundJob):
+    """Runs a full search on a background thread.
+
+    The search is split by first-row column so
+    progress can report which branch is being explored, and ``cancel`` is
+    honoured between solutions and between branches. With ``workers`` above
+    one, the branches are solved in a process pool instead and merged back in
+    order as they complete. When a ``SolutionCache`` is given, a cached set is
+    used instead of searching and completed searches are written back to it.
+
+    With ``fixed`` queens the job enumerates only the completions of that
+    partial placement, serially and without the cache or symmetry reduction.
+    A ``variant`` (see ``nqueens_dlx.make_variant``) is solved the same way
+    with the Dancing Links engine.
+    """
+
+    def __init__(self, n, engine=DEFAULT_ENGINE, symmetric=False, on_progress=None,
+                 on_solution=None, on_done=None, progress_interval=0.1, workers=1, cache=None,
+                 fixed=None, variant=None):
+        super().__init__(f'nqueens-solver-{n}')
+        self.n = n
+        self.variant = variant
+        self.engine_name = engine if variant is None else 'dlx'
+        self.engine = get_engine(self.engine_name)
+        self.fixed = None if fixed is None else frozenset(fixed)
+        plain = self.fixed is None and variant is None
+        self.symmetric = symmetric and plain
+        self.workers = workers if plain else 1
+        self.cache = cache if plain else None
+        self.cached = False
+        self.on_progress = on_progress
+        self.on_solution = on_solution
+        self.on_done = on_done
+        self.progress_interval = progress_interval
+        self.stats = SearchStats()
+
+    def run(self):
+        with profile_section(f'solve-n{self.n}'):
+            self._run()
+
+    def _run(self):
+        n = self.n
+        kind = 'unique' if self.symmetric else 'all'
+        solutions = self._run_cached(kind)
+        if solutions is None:
+            if self.workers > 1:
+                solutions = self._run_parallel()
+            else:
+                solutions = self._run_serial(range((n + 1) // 2) if self.symmetric else range(n))
+            if (self.cache is not None and self.engine_name in ORDERED_ENGINES
+                    and not self._cancel.is_set()):
+                try:
+                    self.cache.save(n, solutions, kind)
+                except OSError:
+                    pass
+        if self.on_done:
+            result = SymmetricSolutionSet(n, solutions) if self.symmetric else solutions
+            self.on_done(result, self.stats.progress(), self._cancel.is_set())
+
+    def _run_cached(self, kind):
+        if self.cache is None:
+            return None
+        solutions = self.cache.load(self.n, kind)
+        if solutions is None:
+            return None
+        self.cached = True
+        self.stats.solutions = len(solutions)
+        if solutions and self.on_solution:
+            self.on_solution(solutions[0])
+        return solutions
+
+    def _found(self, solution):
+        self.stats.solutions += 1
+        if self.stats.solutions == 1 and self.on_solution:
+            self.on_solution(solution)
+
+    def _run_serial(self, branches):
+        n, stats = self.n, self.stats
+        solutions = SolutionStore(n)
+        last_report = perf_counter()
+        for first in branches:
+            if self._cancel.is_set():
+                break
+            stats.branch = first
+            stats.nodes += 1
+            for solution in self._branch(first):
+                if self._cancel.is_set():
+                    break
+                if self.symmetric and tuple(solution) != min(symmetries(solution)):
+                    continue
+                solutions.append(solution)
+                self._found(solution)
+                now = perf_counter()
+                if self.on_progress and now - last_report >= self.progress_interval:
+                    last_report = now
+                    self.on_progress(stats.progress())
+            if self.on_progress:
+                self.on_progress(stats.progress())
+        return solutions
+
+    def _branch(self, first):
+        if self.variant is not None:
+            return solve_dlx(self.n, (first,), self.stats, self.variant)
+        if self.fixed is None:
+            return self.engine(self.n, (first,), self.stats)
+        return solve_completions(self.n, self.fixed | {(0, first)}, self.stats)
+
+    def _run_parallel(self):
+        # One subtree per first-row column, so progress still names the branch.
+        n, stats = self.n, self.stats
+        solutions = SolutionStore(n)
+        subtrees = iter_subtrees(n, self.workers, 1, self.engine_name, self.symmetric,
+                                 self._cancel.is_set, self.progress_interval)
+        for (first,), chunk, nodes in subtrees:
+            stats.branch = first
+            stats.nodes += nodes + 1
+            found = len(solutions)
+            solutions.frombytes(chunk)
+            if found == 0 and solutions:
+                self._found(solutions[0])
+            stats.solutions = len(solutions)
+            if self.on_progress:
+                self.on_progress(stats.progress())
+        return solutions
+
+
+SearchEvent = namedtuple('SearchEvent', 'kind row col')
+TRY, PLACE, CONFLICT, BACKTRACK, SOLUTION = 'try', 'place', 'conflict', 'backtrack', 'solution'
+
+
+def trace_search(n):
+    """Yields every step of a plain row-by-row backtracking search.
+
+    Each square of a row is tried in turn (TRY) and either rejected (CONFLICT)
+    or taken (PLACE) and later given up again (BACKTRACK). SOLUTION is emitted
+    with the last row's square when all rows are filled.
+    """
+    full = (1 << n) - 1
+    board = [-1] * n
+
+    def search(row, cols, left, right):
+        if row == n:
+            yield SearchEvent(SOLUTION, row - 1, board[row - 1])
+            return
+        attacked = cols | left | right
+        for col in range(n):
+            yield SearchEvent(TRY, row, col)
+            bit = 1 << col
+            if attacked & bit:
+                yield SearchEvent(CONFLICT, row, col)
+                continue
+            board[row] = col
+            yield SearchEvent(PLACE, row, col)
+            yield from search(row + 1, cols | bit, ((left | bit) << 1) & full, (right | bit) >> 1)
+            yield SearchEvent(BACKTRACK, row, col)
+
+    if n > 0:
+        yield from search(0, 0, 0, 0)
+
+
+class TraceJob(BackgroundJob):
+    """Runs ``trace_search`` on a background thread into a bounded buffer.
+
+    Events are handed over in chunks so the consumer can drain thousands per
+    call; when the buffer is full the search waits for the consumer instead of
+    running arbitrarily far ahead.
+    """
+
+    def __init__(self, n, buffer_chunks=64, chunk_size=256):
+        super().__init__(f'nqueens-trace-{n}')
+        self.n = n
+        self.chunk_size = chunk_size
+        self.buffer = queue.Queue(maxsize=buffer_chunks)
+        self.pending = deque()
+        self.finished = False
+
+    def run(self):
+        chunk = []
+        for event in trace_search(self.n):
+            chunk.append(event)
+            if len(chunk) >= self.chunk_size:
+                if not self._put(chunk):
+                    return
+                chunk = []
+        if chunk and not self._put(chunk):
+            return
+        self._put(None)
+
+    def _put(self, item):
+        while not self._cancel.is_set():
+            try:
+                self.buffer.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def next_events(self, limit=None):
+        # Returns up to ``limit`` buffered events (all of them when None)
+        # without waiting for the search thread.
+        events = []
+        while limit is None or len(events) < limit:
+            if not self.pending:
+                if self.finished:
+                    break
+                try:
+                    chunk = self.buffer.get_nowait()
+                except queue.Empty:
+                    break
+                if chunk is None:
+                    self.finished = True
+                    break
+                self.pending.extend(chunk)
+            if limit is None:
+                events.extend(self.pending)
+                self.pending.clear()
+            else:
+                while self.pending and len(events) < limit:
+                    events.append(self.pending.popleft())
+        return events
+
+    @property
+    def exhausted(self):
+        return self.finished and not self.pending
+
+
+def construct_solution(n):
+    """Returns one solution in O(N) from the explicit construction for N >= 4.
+
+    Rows take the even columns then the odd ones (1-based), with the two
+    adjustments needed when N mod 6 is 2 or 3. Returns None for N = 2 and 3.
+    """
+    if n == 1:
+        return array('I', [0])
+    if n < 4:
+        return None
+    evens = list(range(2, n + 1, 2))
+    odds = list(range(1, n + 1, 2))
+    remainder = n % 6
+    if remainder == 2:
+        odds[0], odds[1] = odds[1], odds[0]
+        odds.remove(5)
+        odds.append(5)
+    elif remainder == 3:
+        evens.remove(2)
+        evens.append(2)
+        odds = odds[2:] + [1, 3]
+    columns = array('I', evens)
+    columns.extend(odds)
+    return array('I', (c - 1 for c in columns))
+
+
+def min_conflicts(n, seed=None, max_restarts=50):
+    """Returns one solution found by randomized local search.
+
+    Queens start as a random permutation built greedily so that most rows are
+    free of diagonal attacks (after Sosic and Gu); the few rows left attacked
+    are then repaired by swapping columns with random rows whenever the swap
+    does not raise the number of diagonal conflicts, which are tracked
+    incrementally per diagonal. Returns None for N = 2 and 3.
+    """
+    if n == 1:
+        return array('I', [0])
+    if n < 4:
+        return None
+    rng = random.Random(seed)
+    for _ in range(max_restarts):
+        columns = _min_conflicts_attempt(n, rng)
+        if columns is not None and is_valid_solution(columns):
+            return array('I', columns)
+    raise RuntimeError(f"min-conflicts search did not converge for N={n}")
+
+
+def _min_conflicts_attempt(n, rng):
+    rand = rng.random
+    queen = list(range(n))
+    # Diagonal r - c is stored at r - c + n, anti-diagonal r + c at r + c.
+    diagonal = [0] * (2 * n)
+    anti = [0] * (2 * n)
+    # Greedy phase: fill rows in order with a random remaining column that is
+    # not attacked yet, leaving the last few rows to the repair phase.
+    free_tail = min(n, 40 if n > 200 else n)
+    row = 0
+    attempts = 0
+    limit = n - free_tail
+    max_attempts = 4 * n
+    while row < limit and attempts < max_attempts:
+        attempts += 1
+        pick = row + int(rand() * (n - row))
+        col = queen[pick]
+        if diagonal[row - col + n] or anti[row + col]:
+            continue
+        queen[pick] = queen[row]
+        queen[row] = col
+        diagonal[row - col + n] += 1
+        anti[row + col] += 1
+        row += 1
+    for r in range(row, n):
+        col = queen[r]
+        diagonal[r - col + n] += 1
+        anti[r + col] += 1
+
+    def attacked(r):
+        col = queen[r]
+        return diagonal[r - col + n] > 1 or anti[r + col] > 1
+
+    # Queens placed by the greedy phase never attack each other, so every
+    # conflict involves one of the remaining rows.
+    pending = [r for r in range(row, n) if attacked(r)]
+    steps = 0
+    max_steps = 100 * n + 10000
+    # Rows with no improving swap left get a random swap after this many
+    # failed tries, which is enough to climb out of small-board local minima.
+    patience = 2 * n
+    while pending:
+        a = pending.pop()
+        failures = 0
+        while attacked(a):
+            steps += 1
+            if steps > max_steps:
+                return None
+            b = int(rand() * n)
+            if b == a:
+                continue
+            ca, cb = queen[a], queen[b]
+            diagonal[a - ca + n] -= 1
+            anti[a + ca] -= 1
+            diagonal[b - cb + n] -= 1
+            anti[b + cb] -= 1
+            before = (diagonal[a - ca + n] + anti[a + ca] + diagonal[b - cb + n] + anti[b + cb]
+                      + (a - ca == b - cb) + (a + ca == b + cb))
+            after = (diagonal[a - cb + n] + anti[a + cb] + diagonal[b - ca + n] + anti[b + ca]
+                     + (a - cb == b - ca) + (a + cb == b + ca))
+            # Sideways moves are taken now and then to walk off plateaus.
+            swap = after < before or (after == before and rand() < 0.2)
+            failures = 0 if swap else failures + 1
+            if failures > patience:
+                swap = True
+                failures = 0
+            if swap:
+                ca, cb = cb, ca
+                queen[a], queen[b] = ca, cb
+            diagonal[a - ca + n] += 1
+            anti[a + ca] += 1
+            diagonal[b - cb + n] += 1
+            anti[b + cb] += 1
+            if swap and attacked(b):
+                pending.append(b)
+    return queen
+
+
+def first_backtracking(n):
+    for solution in solve_bitmask(n):
+        return array('I', solution)
+    return None
+
+
+def first_dlx(n):
+    # Choosing the most constrained row or column first reaches a solution
+    # without the deep backtracking the lexicographic search hits for N > 30.
+    solution = first_dlx_solution(n)
+    return None if solution is None else array('I', solution)
+
+
+FIRST_SOLUTION_METHODS = {
+    'constructive': construct_solution,
+    'min-conflicts': min_conflicts,
+    'backtracking': first_backtracking,
+    'dlx': first_dlx,
+}
+
+# Largest N each method reliably handles in about a second. min-conflicts
+# walks every row in Python and takes several seconds at N=1e6; the
+# lexicographic search needs 39 s at N=30; Dancing Links builds O(N^2) links.
+FIRST_SOLUTION_MAX_N = {
+    'min-conflicts': 100_000,
+    'backtracking': 27,
+    'dlx': 250,
+}
+
+
+def first_solution(n, method='constructive'):
+    try:
+        solve = FIRST_SOLUTION_METHODS[method]
+    except KeyError:
+        raise ValueError(f"Unknown first-solution method {method!r}; "
+                         f"choose from {', '.join(FIRST_SOLUTION_METHODS)}") from None
+    limit = FIRST_SOLUTION_MAX_N.get(method)
+    if limit is not None and n > limit:
+        raise ValueError(f"{method} supports N up to {limit:,}; use constructive for larger boards")
+    return solve(n)
+
+
+FirstSolutionReport = namedtuple('FirstSolutionReport', 'method solve_time valid validate_time error')
+
+
+class FirstSolutionJob(BackgroundJob):
+    """Finds and validates a single solution on a background thread.
+
+    ``on_done`` receives the column array (or None) and a
+    ``FirstSolutionReport``, whose ``error`` says why a method gave up. The
+    methods cannot be interrupted, so cancelling only suppresses the result.
+    """
+
+    def __init__(self, n, method='constructive', on_done=None):
+        super().__init__(f'nqueens-first-{n}')
+        self.n = n
+        self.method = method
+        self.on_done = on_done
+
+    def run(self):
+        with profile_section(f'first-{self.method}-n{self.n}'):
+            self._run()
+
+    def _run(self):
+        start = perf_counter()
+        try:
+            columns = first_solution(self.n, self.method)
+            error = None
+        except (ValueError, RuntimeError) as exc:
+            columns, error = None, str(exc)
+        solve_time = perf_counter() - start
+        start = perf_counter()
+        valid = columns is not None and is_valid_solution(columns, self.n)
+        report = FirstSolutionReport(self.method, solve_time, valid, perf_counter() - start, error)
+        if self.on_done and not self._cancel.is_set():
+            self.on_done(columns, report)
+
+
+class HintJob(BackgroundJob):
+    """Looks for a ``hint`` on a background thread.
+
+    The search gives up after ``timeout`` seconds; ``on_done`` receives the
+    square (or None) and whether the time ran out.
+    """
+
+    def __init__(self, n, fixed, variant=None, timeout=2.0, on_done=None):
+        super().__init__(f'nqueens-hint-{n}')
+        self.n = n
+        self.fixed = frozenset(fixed)
+        self.variant = variant
+        self.timeout = timeout
+        self.on_done = on_done
+        self._deadline = None
+
+    def run(self):
+        self._deadline = perf_counter() + self.timeout
+        square = hint(self.n, self.fixed, self.variant, self._expired)
+        if self.on_done:
+            self.on_done(square, square is None and perf_counter() >= self._deadline)
+
+    def _expired(self):
+        return self._cancel.is_set() or perf_counter() >= self._deadline
+
+
+class IndexJob(BackgroundJob):
+    """Loads or builds the ``SolutionIndex`` of a board on a background thread.
+
+    Counts come from the cache when present and are saved back once built.
+    Progress reports the solutions counted so far, with ``nodes`` counting
+    the prefix subtrees finished. ``on_done`` receives the index (None when
+    cancelled), the final progress and the cancelled flag.
+    """
+
+    def __init__(self, n, cache=None, workers=1, on_progress=None, on_done=None, progress_interval=0.1):
+        super().__init__(f'nqueens-index-{n}')
+        self.n = n
+        self.cache = cache
+        self.workers = workers
+        self.cached = False
+        self.on_progress = on_progress
+        self.on_done = on_done
+        self.progress_interval = progress_interval
+        self.stats = SearchStats()
+        self._last_report = perf_counter()
+
+    def run(self):
+        with profile_section(f'index-n{self.n}'):
+            self._run()
+
+    def _run(self):
+        index, self.cached = load_index(self.n, self.cache, self.workers, self._counted, self._cancel.is_set)
+        if self.cached:
+            self.stats.solutions = len(index)
+        if self.on_done:
+            self.on_done(index, self.stats.progress(), self._cancel.is_set())
+
+    def _counted(self, prefix, count):
+        stats = self.stats
+        stats.solutions += count
+        stats.nodes += 1
+        stats.branch = prefix[0]
+        now = perf_counter()
+        if self.on_progress and now - self._last_report >= self.progress_interval:
+            self._last_report = now
+            self.on_progress(stats.progress())
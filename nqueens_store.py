@@ -0,0 +1,104 @@
+"""Compact storage for N-Queens solution sets.
+
+A solution is a list of column indices, one per row. ``SolutionStore`` keeps
+them back to back in a single byte buffer instead of as Python lists: boards up
+to 16 columns pack two columns per byte, larger boards use one byte per column.
+"""
+from array import array
+from collections.abc import Sequence
+
+_NIBBLES = [(byte >> 4, byte & 0x0F) for byte in range(256)]
+
+
+def record_width(n):
+    return max(1, (n + 1) // 2 if n <= 16 else n)
+
+
+class SolutionStore(Sequence):
+    def __init__(self, n, data=None):
+        if not 0 <= n <= 255:
+            raise ValueError(f"board size {n} cannot be stored; columns must fit in a byte")
+        self.n = n
+        self.packed = n <= 16
+        self.width = record_width(n)
+        # ``data`` may be any buffer (bytes, mmap, memoryview); only an
+        # ``array`` can be appended to.
+        self._data = array('B') if data is None else data
+        if len(self._data) % self.width:
+            raise ValueError(f"buffer of {len(self._data)} bytes is not a whole number of {n}-column solutions")
+
+    @classmethod
+    def from_solutions(cls, n, solutions):
+        store = cls(n)
+        store.extend(solutions)
+        return store
+
+    def __len__(self):
+        return len(self._data) // self.width
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        count = len(self)
+        if index < 0:
+            index += count
+        if not 0 <= index < count:
+            raise IndexError('solution index out of range')
+        start = index * self.width
+        return self.decode(self._data[start:start + self.width])
+
+    def __iter__(self):
+        width, data, decode = self.width, self._data, self.decode
+        for start in range(0, len(data), width):
+            yield decode(data[start:start + width])
+
+    def encode(self, solution):
+        if not self.packed:
+            return bytes(solution)
+        packed = bytes((high << 4) | low for high, low in zip(solution[::2], solution[1::2]))
+        if self.n % 2:
+            packed += bytes((solution[-1] << 4,))
+        return packed
+
+    def decode(self, record):
+        if not self.packed:
+            return list(record)
+        columns = [col for byte in record for col in _NIBBLES[byte]]
+        if self.n % 2:
+            columns.pop()
+        return columns
+
+    def append(self, solution):
+        self._data.frombytes(self.encode(solution))
+
+    def extend(self, solutions):
+        if isinstance(solutions, SolutionStore) and solutions.n == self.n:
+            self._data.frombytes(solutions.tobytes())
+            return
+        for solution in solutions:
+            self.append(solution)
+
+    def frombytes(self, data):
+        if len(data) % self.width:
+            raise ValueError('data is not a whole number of solutions')
+        self._data.frombytes(data)
+
+    def chunks(self, records=4096):
+        """Yields the packed data in pieces of at most ``records`` solutions."""
+        step = records * self.width
+        data = memoryview(self._data)
+        for start in range(0, len(data), step):
+            yield data[start:start + step]
+
+    def view(self):
+        return memoryview(self._data)
+
+    def tobytes(self):
+        return bytes(self._data)
+
+    @property
+    def nbytes(self):
+        return len(self._data)
+
+    def __repr__(self):
+        return f"SolutionStore(n={self.n}, solutions={len(self)}, bytes={self.nbytes})"
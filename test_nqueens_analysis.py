@@ -0,0 +1,67 @@
+from collections import Counter
+
+import pytest
+
+import nqueens_analysis
+from nqueens_analysis import MAX_ARRAY_N, _analyze_python, analyze, first_invalid
+from nqueens_solver import construct_solution, solve_bitmask, solve_symmetric
+from nqueens_store import SolutionStore
+
+needs_numpy = pytest.mark.skipif(nqueens_analysis.np is None, reason='needs NumPy')
+
+
+@pytest.mark.parametrize('n', [1, 4, 6, 8, 9])
+def test_analyze(n):
+    store = SolutionStore.from_solutions(n, solve_bitmask(n))
+    stats = analyze(store, n)
+    assert stats.count == len(store) and stats.invalid == []
+    assert [sum(row) for row in stats.heatmap] == [len(store)] * n
+    assert stats.first_row == stats.heatmap[0]
+    assert stats.classes == sum(stats.class_sizes.values())
+    assert sum(size * count for size, count in stats.class_sizes.items()) == len(store)
+
+
+@pytest.mark.parametrize('n', [5, 8])
+def test_array_and_python_paths_agree(n):
+    solutions = list(solve_bitmask(n)) + [[0] * n]
+    stats = analyze(solutions, n)
+    expected = _analyze_python(solutions, n)
+    assert stats.invalid == expected.invalid == [len(solutions) - 1]
+    assert stats.heatmap == expected.heatmap
+    assert (stats.classes, Counter(stats.class_sizes)) == (expected.classes, expected.class_sizes)
+
+
+def test_known_class_sizes():
+    stats = analyze(list(solve_bitmask(8)), 8)
+    assert stats.classes == 12 and stats.class_sizes == {8: 11, 4: 1}
+
+
+def test_first_invalid():
+    solutions = list(solve_bitmask(6))
+    assert first_invalid(6, SolutionStore.from_solutions(6, solutions).tobytes()) is None
+    solutions.insert(2, [1, 3, 5, 0, 2, 5])
+    assert first_invalid(6, SolutionStore.from_solutions(6, solutions).tobytes()) == 2
+
+
+@needs_numpy
+def test_arrays():
+    np = nqueens_analysis.np
+    for n in (7, 17):
+        store = SolutionStore.from_solutions(n, [[(2 * row) % n for row in range(n)]] * 3)
+        array = nqueens_analysis.as_array(store, n)
+        assert array.shape == (3, n) and array.tolist() == list(store)
+    symmetric = solve_symmetric(8)
+    expanded = nqueens_analysis.as_array(symmetric, 8)
+    assert expanded.tolist() == sorted(solve_bitmask(8))
+    boards = np.array([[1, 3, 0, 2], [0, 1, 2, 3]], dtype=np.uint8)
+    assert nqueens_analysis.valid_mask(boards).tolist() == [True, False]
+    with pytest.raises(ValueError):
+        nqueens_analysis.as_array([], MAX_ARRAY_N + 1)
+
+
+def test_large_boards_fall_back_to_python():
+    n = MAX_ARRAY_N + 5
+    solution = list(construct_solution(n))
+    stats = analyze([solution, [0] * n], n)
+    assert stats.count == 2 and stats.invalid == [1]
+    assert stats.heatmap[0][solution[0]] == 1 and stats.classes == 1
@@ -0,0 +1,50 @@
+import json
+
+import pytest
+
+from nqueens_bench import Results, compare, main
+
+
+def results(**metrics):
+    data = Results()
+    for name, (value, better) in metrics.items():
+        data.add(name, value, 's' if better == 'lower' else '1/s', better)
+    return data.to_json()
+
+
+def test_compare_reports_only_regressions():
+    baseline = results(build=(1.0, 'lower'), rate=(100.0, 'higher'), steady=(2.0, 'lower'), gone=(1.0, 'lower'))
+    current = results(build=(1.3, 'lower'), rate=(80.0, 'higher'), steady=(2.2, 'lower'), new=(5.0, 'lower'))
+    regressions = compare(current, baseline, tolerance=0.15)
+    assert [(name, old, new) for name, old, new, _ in regressions] == [('build', 1.0, 1.3), ('rate', 100.0, 80.0)]
+    assert [round(change, 6) for *_, change in regressions] == [0.3, 0.2]
+
+
+def test_compare_tolerance_and_improvements():
+    baseline = results(build=(1.0, 'lower'), rate=(100.0, 'higher'), zero=(0.0, 'lower'))
+    assert compare(results(build=(1.1, 'lower'), rate=(95.0, 'higher'), zero=(1.0, 'lower')), baseline) == []
+    assert compare(results(build=(0.5, 'lower'), rate=(300.0, 'higher')), baseline) == []
+    assert len(compare(results(build=(1.1, 'lower')), baseline, tolerance=0.05)) == 1
+
+
+def test_main_writes_and_checks_a_baseline(tmp_path, capsys):
+    baseline = tmp_path / 'baseline.json'
+    output = tmp_path / 'bench.json'
+    argv = ['--only', 'solver', '--min-n', '4', '--max-n', '6', '--baseline', str(baseline), '-o', str(output)]
+    assert main(argv) == 0
+    assert 'baseline written' in capsys.readouterr().err
+    metrics = json.loads(output.read_text())['metrics']
+    assert metrics and all(metric['better'] in ('lower', 'higher') for metric in metrics.values())
+    # A baseline ten times better than anything measurable always regresses.
+    data = json.loads(baseline.read_text())
+    for metric in data['metrics'].values():
+        metric['value'] *= 10 if metric['better'] == 'higher' else 0.1
+    baseline.write_text(json.dumps(data))
+    assert main(argv) == 1
+    assert 'REGRESSION' in capsys.readouterr().err
+
+
+@pytest.mark.parametrize('part', ['conflicts', 'memory'])
+def test_other_parts_run(part, capsys):
+    assert main(['--only', part, '--max-n', '8']) == 0
+    assert json.loads(capsys.readouterr().out)['metrics']
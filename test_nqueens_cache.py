@@ -0,0 +1,79 @@
+import os
+
+import pytest
+
+from nqueens_cache import HEADER, SolutionCache
+from nqueens_solver import SolutionIndex, solve_bitmask
+from nqueens_store import SolutionStore
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return SolutionCache(str(tmp_path))
+
+
+def test_save_and_load(cache):
+    store = SolutionStore.from_solutions(8, solve_bitmask(8))
+    assert cache.save(8, store)
+    loaded = cache.load(8)
+    assert list(loaded) == list(store)
+    assert cache.load(8, 'unique') is None
+    assert cache.load(9) is None
+
+
+def test_save_stream(cache):
+    store = SolutionStore.from_solutions(9, solve_bitmask(9))
+    assert cache.save_stream(9, store.chunks(50))
+    assert list(cache.load(9)) == list(store)
+
+
+def test_empty_set(cache):
+    assert cache.save(3, SolutionStore(3))
+    assert len(cache.load(3)) == 0
+
+
+def corrupt(path, offset, data):
+    with open(path, 'r+b') as f:
+        f.seek(offset)
+        f.write(data)
+
+
+@pytest.mark.parametrize('offset, data', [
+    (HEADER.size + 3, b'\xff'),  # payload no longer matches its checksum
+    (0, b'XXXX'),                # wrong magic
+])
+def test_corrupt_file_is_discarded(cache, offset, data):
+    cache.save(8, SolutionStore.from_solutions(8, solve_bitmask(8)))
+    path = cache.path(8)
+    corrupt(path, offset, data)
+    assert cache.load(8) is None
+    assert not os.path.exists(path)
+
+
+def test_truncated_file_is_discarded(cache):
+    cache.save(8, SolutionStore.from_solutions(8, solve_bitmask(8)))
+    path = cache.path(8)
+    with open(path, 'r+b') as f:
+        f.truncate(HEADER.size + 10)
+    assert cache.load(8) is None
+    assert not os.path.exists(path)
+
+
+def test_over_budget(tmp_path):
+    cache = SolutionCache(str(tmp_path), budget_bytes=100)
+    store = SolutionStore.from_solutions(8, solve_bitmask(8))
+    assert not cache.save(8, store)
+    assert not cache.save_stream(8, store.chunks(10))
+    assert cache.load(8) is None
+    assert not [name for name in os.listdir(tmp_path) if name.endswith('.tmp')]
+
+
+
+def test_counts_round_trip(cache):
+    index = SolutionIndex.build(9)
+    assert cache.save_counts(9, index.depth, index.prefixes, index.counts)
+    depth, prefixes, counts = cache.load_counts(9)
+    assert (depth, prefixes, list(counts)) == (index.depth, index.prefixes, list(index.counts))
+    corrupt(cache.counts_path(9), HEADER.size, b'\xff')
+    assert cache.load_counts(9) is None
+    assert not os.path.exists(cache.counts_path(9))
@@ -0,0 +1,60 @@
+import pytest
+
+from nqueens_cli import main
+from nqueens_io import format_solution
+from nqueens_solver import solve_bitmask
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv('NQUEENS_CACHE_DIR', str(tmp_path / 'cache'))
+
+
+def run(capsys, *argv):
+    code = main([str(arg) for arg in argv])
+    out, err = capsys.readouterr()
+    return code, out, err
+
+
+def test_count(capsys):
+    assert run(capsys, 'count', 8) == (0, '92\n', '')
+    assert run(capsys, 'count', 8, '--symmetric')[1] == '12\n'
+    assert run(capsys, 'count', 10, '--workers', 2)[1] == '724\n'
+    assert run(capsys, 'count', 5, '--toroidal')[1] == '10\n'
+
+
+def test_solve(capsys):
+    expected = ''.join(format_solution(solution) + '\n' for solution in solve_bitmask(6))
+    assert run(capsys, 'solve', '-n', 6)[1] == expected
+    assert run(capsys, 'solve', '-n', 6, '--workers', 2)[1] == expected
+    code, out, _ = run(capsys, 'solve', '-n', 8, '--format', 'csv', '--zero-based', '--limit', 3)
+    assert out.splitlines() == [format_solution(solution, 'csv', True) for solution in list(solve_bitmask(8))[:3]]
+
+
+def test_first(capsys):
+    assert run(capsys, 'first', 8)[1] == '1 5 8 6 3 7 2 4\n'
+    assert run(capsys, 'first', 12, '--method', 'constructive')[1] == '2 4 6 8 10 12 1 3 5 7 9 11\n'
+    code, out, err = run(capsys, 'first', 3)
+    assert code == 1 and 'No solutions' in err
+    code, out, err = run(capsys, 'first', 10 ** 6, '--method', 'min-conflicts')
+    assert code == 1 and err.startswith('nqueens: min-conflicts supports N up to')
+
+
+def test_export_and_validate(capsys, tmp_path):
+    for name in ('n8.nqb', 'n8.txt'):
+        path = tmp_path / name
+        fmt = 'binary' if name.endswith('.nqb') else 'text'
+        code, _, err = run(capsys, 'export', 8, '-o', path, '--format', fmt)
+        assert code == 0 and 'Exported 92 solutions' in err
+        assert run(capsys, 'validate', path, '--n', 8)[:2] == (0, '92/92 valid\n')
+    bad = tmp_path / 'bad.txt'
+    bad.write_text('1 5 8 6 3 7 2 4\n1 2 3 4 5 6 7 8\n')
+    code, out, err = run(capsys, 'validate', bad)
+    assert code == 1 and out == '1/2 valid\n' and 'line 2' in err
+
+
+def test_file_errors_are_reported(capsys, tmp_path):
+    code, _, err = run(capsys, 'validate', tmp_path / 'missing.txt')
+    assert code == 1 and err.startswith('nqueens: ') and 'missing.txt' in err
+    code, _, err = run(capsys, 'export', 8, '-o', tmp_path / 'no' / 'such' / 'dir.nqb')
+    assert code == 1 and err.startswith('nqueens: ')
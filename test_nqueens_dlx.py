@@ -0,0 +1,60 @@
+from nqueens_dlx import first_dlx_solution, is_plain, make_variant, solve_dlx
+from nqueens_solver import SearchStats, is_valid_solution, solve_bitmask
+
+
+def solution_set(solutions):
+    return sorted(map(tuple, solutions))
+
+
+def test_plain_board_matches_bitmask():
+    for n in range(1, 10):
+        assert solution_set(solve_dlx(n)) == solution_set(solve_bitmask(n))
+
+
+def test_prefix_and_stats():
+    stats = SearchStats()
+    solutions = solution_set(solve_dlx(8, (2,), stats))
+    assert solutions == solution_set(solve_bitmask(8, (2,)))
+    assert stats.nodes > 0
+
+
+def test_blocked_squares_and_fixed_queens():
+    blocked = {(0, 0), (3, 5), (7, 2)}
+    fixed = {(1, 4)}
+    variant = make_variant(8, blocked=blocked, fixed=fixed)
+    expected = [solution for solution in solve_bitmask(8)
+                if solution[1] == 4 and not any(solution[row] == col for row, col in blocked)]
+    assert solution_set(solve_dlx(8, variant=variant)) == solution_set(expected)
+
+
+def test_toroidal_counts():
+    # Toroidal solutions exist only when N is coprime to 6.
+    counts = [sum(1 for _ in solve_dlx(n, variant=make_variant(n, toroidal=True))) for n in range(4, 8)]
+    assert counts == [0, 10, 0, 28]
+
+
+def test_is_plain():
+    assert is_plain(None, 8)
+    assert is_plain(make_variant(8), 8)
+    assert not is_plain(make_variant(8, blocked={(0, 0)}), 8)
+    assert not is_plain(make_variant(8, toroidal=True), 8)
+
+
+def test_max_nodes_stops_the_search():
+    stats = SearchStats()
+    assert sum(1 for _ in solve_dlx(10, stats=stats, max_nodes=50)) < 724
+    assert stats.nodes <= 50
+
+
+def test_seeded_search_finds_the_same_set():
+    assert solution_set(solve_dlx(8, seed=3)) == solution_set(solve_bitmask(8))
+
+
+def test_first_solution_with_restarts():
+    for n in (1, 4, 8, 32, 64):
+        assert is_valid_solution(first_dlx_solution(n), n)
+    assert first_dlx_solution(3) is None
+    fixed = make_variant(64, fixed={(10, 20)})
+    solution = first_dlx_solution(64, fixed)
+    assert is_valid_solution(solution) and solution[10] == 20
+    assert first_dlx_solution(64, cancelled=lambda: True) is None
@@ -0,0 +1,118 @@
+import io
+import os
+
+import pytest
+
+from nqueens_cache import SolutionCache
+from nqueens_io import (FORMATS, TransferJob, export_solutions, format_for_path, format_solution,
+                        import_solutions, parse_solution, read_records)
+from nqueens_solver import solve_bitmask
+from nqueens_store import SolutionStore
+
+
+@pytest.mark.parametrize('fmt', ['text', 'csv', 'ndjson'])
+@pytest.mark.parametrize('zero_based', [False, True])
+def test_format_and_parse(fmt, zero_based):
+    solution = [1, 3, 5, 7, 2, 0, 6, 4]
+    line = format_solution(solution, fmt, zero_based)
+    assert parse_solution(line, zero_based) == solution
+
+
+@pytest.mark.parametrize('line', ['[1, true, 3]', '{"a": 1}', '[1.5, 2]', 'a b c'])
+def test_parse_rejects_non_integers(line):
+    with pytest.raises(ValueError):
+        parse_solution(line)
+
+
+def test_format_for_path():
+    assert format_for_path('n8.csv.gz') == ('csv', True)
+    assert format_for_path('n8.jsonl') == ('ndjson', False)
+    assert format_for_path('n8.nqb') == ('binary', False)
+
+
+def read_back(path, n=None):
+    with open(path, 'rb') as f:
+        n, chunks = read_records(io.BufferedReader(f), n)
+        return [solution for chunk in chunks for solution in SolutionStore(n, chunk)]
+
+
+@pytest.mark.parametrize('fmt', FORMATS)
+@pytest.mark.parametrize('compress', [False, True])
+def test_export_round_trip(tmp_path, fmt, compress):
+    path = str(tmp_path / 'n8')
+    assert export_solutions(path, 8, fmt, compress) == 92
+    if compress:
+        import gzip
+        with gzip.open(path, 'rb') as f:
+            data = f.read()
+        path = str(tmp_path / 'plain')
+        with open(path, 'wb') as f:
+            f.write(data)
+    assert read_back(path) == list(solve_bitmask(8))
+
+
+def test_export_reads_from_the_cache(tmp_path):
+    cache = SolutionCache(str(tmp_path / 'cache'))
+    cache.save(6, SolutionStore.from_solutions(6, solve_bitmask(6)))
+    path = str(tmp_path / 'n6.txt')
+    assert export_solutions(path, 6, 'text', cache=cache) == 4
+    assert read_back(path) == list(solve_bitmask(6))
+
+
+def test_cancelled_export_leaves_no_file(tmp_path):
+    path = str(tmp_path / 'n12.nqb')
+    written = export_solutions(path, 12, progress=lambda count: None, cancelled=lambda: True)
+    assert written == 0
+    assert not os.path.exists(path)
+
+
+def test_binary_trailer_is_checked(tmp_path):
+    path = str(tmp_path / 'n8.nqb')
+    export_solutions(path, 8)
+    with open(path, 'r+b') as f:
+        f.seek(-1, os.SEEK_END)
+        f.write(b'\x00')
+    with pytest.raises(ValueError):
+        read_back(path)
+    with open(path, 'r+b') as f:
+        f.truncate(os.path.getsize(path) - 3)
+    with pytest.raises(ValueError):
+        read_back(path)
+
+
+def test_import_into_cache(tmp_path):
+    cache = SolutionCache(str(tmp_path / 'cache'))
+    path = str(tmp_path / 'n8.csv')
+    export_solutions(path, 8, 'csv')
+    imported = import_solutions(path, cache)
+    assert list(imported) == list(solve_bitmask(8))
+    assert list(cache.load(8, 'import')) == list(imported)
+
+
+def test_import_rejects_invalid_solutions(tmp_path):
+    cache = SolutionCache(str(tmp_path / 'cache'))
+    path = tmp_path / 'bad.txt'
+    path.write_text('1 5 8 6 3 7 2 4\n1 2 3 4 5 6 7 8\n')
+    with pytest.raises(ValueError):
+        import_solutions(str(path), cache)
+    assert cache.load(8, 'import') is None
+
+
+def test_transfer_job(tmp_path):
+    result = {}
+    path = str(tmp_path / 'n8.ndjson')
+    job = TransferJob(export_solutions, path, 8, 'ndjson',
+                      on_done=lambda value, error, cancelled: result.update(
+                          value=value, error=error, cancelled=cancelled))
+    job.start()
+    job.join(30)
+    assert result == {'value': 92, 'error': None, 'cancelled': False}
+    assert read_back(path) == list(solve_bitmask(8))
+
+
+def test_cancelled_export_to_stdout_keeps_files(tmp_path, monkeypatch, capsysbinary):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / '-').write_text('not ours')
+    for compress in (False, True):
+        export_solutions('-', 8, 'text', compress, cancelled=lambda: True)
+    assert (tmp_path / '-').read_text() == 'not ours'
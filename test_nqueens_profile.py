@@ -0,0 +1,69 @@
+import cProfile
+import json
+import os
+import threading
+
+import pytest
+
+import nqueens_profile
+from nqueens_profile import profile_section
+
+
+@pytest.fixture(autouse=True)
+def profiling_off():
+    nqueens_profile.disable()
+    yield
+    nqueens_profile.disable()
+
+
+def test_disabled_sections_share_a_no_op_context():
+    assert not nqueens_profile.enabled()
+    assert profile_section('a') is profile_section('b')
+    with profile_section('a'):
+        pass
+
+
+def test_timer_mode(tmp_path):
+    nqueens_profile.enable(str(tmp_path), 'timer')
+    with profile_section('solve-n8'):
+        pass
+
+    def rebuild():
+        with profile_section('rebuild'):
+            pass
+
+    thread = threading.Thread(target=rebuild, name='worker')
+    thread.start()
+    thread.join()
+    records = [json.loads(line) for line in (tmp_path / 'timings.jsonl').read_text().splitlines()]
+    sections = [(record['section'], record['thread']) for record in records]
+    assert sections == [('solve-n8', 'MainThread'), ('rebuild', 'worker')]
+    assert all(record['seconds'] >= 0 for record in records)
+
+
+def test_cprofile_mode(tmp_path):
+    nqueens_profile.enable(str(tmp_path))
+    with profile_section('solve-n8'):
+        sum(range(1000))
+    names = sorted(os.listdir(tmp_path))
+    assert len(names) == 2 and names[0].startswith('solve-n8-') and names[0].endswith('.prof')
+    assert 'cumulative' in (tmp_path / names[1]).read_text()
+
+
+def test_overlapping_section_is_timed(tmp_path, monkeypatch):
+    # Python 3.12+ refuses a second active profiler; simulate that anywhere.
+    def refuse(self):
+        raise ValueError('Another profiling tool is already active')
+
+    monkeypatch.setattr(cProfile.Profile, 'enable', refuse)
+    nqueens_profile.enable(str(tmp_path))
+    with profile_section('rebuild'):
+        pass
+    assert os.listdir(tmp_path) == ['timings.jsonl']
+    assert json.loads((tmp_path / 'timings.jsonl').read_text())['section'] == 'rebuild'
+
+
+def test_unknown_mode(tmp_path):
+    with pytest.raises(ValueError):
+        nqueens_profile.enable(str(tmp_path), 'sampling')
+    assert not nqueens_profile.enabled()
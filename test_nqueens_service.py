@@ -0,0 +1,160 @@
+import asyncio
+import os
+import socket
+import threading
+import time
+
+import pytest
+
+from nqueens_cache import SolutionCache
+from nqueens_service import (RemoteSolutions, ServiceJob, ServiceUnavailable, SolverClient, SolverService,
+                             _claim_socket_path, parse_address, serve)
+from nqueens_solver import solve_bitmask
+from nqueens_store import SolutionStore
+
+pytestmark = pytest.mark.skipif(not hasattr(socket, 'AF_UNIX'), reason='needs Unix sockets')
+
+
+@pytest.fixture
+def server(tmp_path):
+    service = SolverService(SolutionCache(str(tmp_path / 'cache')))
+    address = 'unix:' + str(tmp_path / 'solver.sock')
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    ready = threading.Event()
+    future = asyncio.run_coroutine_threadsafe(serve(address, service, lambda _: ready.set()), loop)
+    assert ready.wait(5)
+    client = SolverClient(address)
+    yield client, service
+    client.close()
+    future.cancel()
+    # Let the cancelled server unlink its socket before the loop stops.
+    deadline = time.monotonic() + 5
+    while os.path.exists(address[5:]) and time.monotonic() < deadline:
+        time.sleep(0.01)
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join(5)
+    loop.close()
+
+
+def test_parse_address():
+    assert parse_address('unix:/tmp/s.sock') == ('unix', '/tmp/s.sock')
+    assert parse_address('./s.sock') == ('unix', './s.sock')
+    assert parse_address('8742') == ('tcp', ('127.0.0.1', 8742))
+    assert parse_address('localhost:9000') == ('tcp', ('localhost', 9000))
+    with pytest.raises(ValueError):
+        parse_address('localhost:port')
+
+
+def test_requests(server):
+    client, _ = server
+    solutions = list(solve_bitmask(8))
+    assert client.ping()['version'] == 1
+    assert client.count(8) == 92
+    assert client.page(8, 10, 5) == solutions[10:15]
+    assert client.page(8, 90, 10) == solutions[90:]
+    assert client.solution(8, 50) == solutions[50]
+    for call in (lambda: client.count(0), lambda: client.count(17), lambda: client.solution(8, 92),
+                 lambda: client.call('shuffle', n=8), lambda: client.call('count', n='8')):
+        with pytest.raises(ValueError):
+            call()
+    # Errors leave the connection usable.
+    assert client.count(6) == 4
+
+
+def test_running_service_keeps_its_socket(server):
+    client, _ = server
+    with pytest.raises(OSError):
+        _claim_socket_path(parse_address(client.address)[1])
+    assert client.available()
+
+
+def test_cached_set_is_served(server):
+    client, service = server
+    # A cached set is used as is, so a partial one shows where answers come from.
+    partial = list(solve_bitmask(6))[:2]
+    service.cache.save(6, SolutionStore.from_solutions(6, partial))
+    assert client.count(6) == 2
+    assert client.page(6, 0, 10) == partial
+
+
+def test_identical_requests_are_coalesced():
+    service = SolverService(cache=object())
+
+    def slow(value):
+        time.sleep(0.1)
+        return value
+
+    async def ask():
+        return await asyncio.gather(service.coalesced('key', slow, 1), service.coalesced('key', slow, 2),
+                                    service.coalesced('other', slow, 3))
+
+    assert asyncio.run(ask()) == [1, 1, 3]
+    assert service.stats['computed'] == 2 and service.stats['coalesced'] == 1
+
+
+def test_remote_solutions(server):
+    client, _ = server
+    solutions = list(solve_bitmask(9))
+    remote = RemoteSolutions(client, 9, client.count(9), page_size=50, max_pages=2)
+    assert len(remote) == 352
+    assert list(remote) == solutions
+    assert remote[-1] == solutions[-1]
+    with pytest.raises(IndexError):
+        remote[352]
+
+
+def test_pages_are_fetched_in_the_background(server):
+    client, _ = server
+    solutions = list(solve_bitmask(8))
+    remote = RemoteSolutions(client, 8, 92, page_size=10)
+    assert remote.cached(45) is None
+    errors = []
+    arrived = threading.Event()
+    remote.fetch(45, lambda error: (errors.append(error), arrived.set()))
+    assert arrived.wait(5) and errors == [None]
+    assert remote.cached(45) == solutions[45]
+
+
+def test_service_job(server):
+    client, _ = server
+    result = {}
+    job = ServiceJob(8, client, on_done=lambda solutions, progress, cancelled: result.update(
+        solutions=solutions, progress=progress))
+    job.start()
+    job.join(10)
+    assert list(result['solutions']) == list(solve_bitmask(8))
+    assert result['progress'].solutions == 92
+
+
+def test_unreachable_service(tmp_path):
+    client = SolverClient('unix:' + str(tmp_path / 'missing.sock'))
+    assert not client.available()
+    with pytest.raises(ServiceUnavailable):
+        RemoteSolutions(client, 8, 92)[0]
+    solutions = list(solve_bitmask(8))
+    remote = RemoteSolutions(client, 8, 92, fallback=lambda: solutions)
+    assert remote[91] == solutions[91]
+    assert remote.cached(3) == solutions[3]
+    errors = []
+    arrived = threading.Event()
+    RemoteSolutions(client, 8, 92).fetch(0, lambda error: (errors.append(error), arrived.set()))
+    assert arrived.wait(5) and isinstance(errors[0], ServiceUnavailable)
+
+
+def test_claim_socket_path(tmp_path):
+    missing = str(tmp_path / 'new' / 'solver.sock')
+    _claim_socket_path(missing)
+    assert os.path.isdir(os.path.dirname(missing))
+    regular = tmp_path / 'notes.txt'
+    regular.write_text('keep me')
+    with pytest.raises(OSError):
+        _claim_socket_path(str(regular))
+    assert regular.read_text() == 'keep me'
+    stale = str(tmp_path / 'stale.sock')
+    sock = socket.socket(socket.AF_UNIX)
+    sock.bind(stale)
+    sock.close()
+    _claim_socket_path(stale)
+    assert not os.path.exists(stale)
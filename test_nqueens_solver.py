@@ -0,0 +1,384 @@
+import random
+import time
+
+import pytest
+
+from nqueens_cache import SolutionCache
+from nqueens_dlx import first_dlx_solution, make_variant
+from nqueens_solver import (BACKTRACK, ENGINES, FIRST_SOLUTION_MAX_N, FIRST_SOLUTION_METHODS, ORDERED_ENGINES,
+                            PLACE, SOLUTION, ConflictIndex, FirstSolutionJob, HintJob, IndexJob, SolutionIndex,
+                            SolverJob, SymmetricSolutionSet, TraceJob, completion_masks, conflicting_queens,
+                            construct_solution, count_bitmask, count_completions, count_parallel, first_completion,
+                            first_solution, get_engine, hint, is_valid_solution, iter_unique, load_index,
+                            solve_bitmask, solve_completions, solve_parallel, solve_symmetric, symmetries,
+                            trace_search)
+
+# OEIS A000170 and A002562.
+TOTALS = [1, 0, 0, 2, 10, 4, 40, 92, 352, 724]
+UNIQUE = [1, 0, 0, 1, 2, 1, 6, 12, 46, 92]
+
+
+@pytest.mark.parametrize('engine', sorted(ENGINES))
+def test_engine_counts(engine):
+    for n, total in enumerate(TOTALS, 1):
+        solutions = list(ENGINES[engine](n))
+        assert len(solutions) == total
+        assert all(is_valid_solution(solution) for solution in solutions)
+
+
+@pytest.mark.parametrize('engine', sorted(ORDERED_ENGINES))
+def test_ordered_engines_are_lexicographic(engine):
+    solutions = [tuple(solution) for solution in ENGINES[engine](8)]
+    assert solutions == sorted(solutions)
+    assert solutions == [tuple(solution) for solution in solve_bitmask(8)]
+
+
+def test_count_bitmask():
+    assert [count_bitmask(n) for n in range(1, 11)] == TOTALS
+
+
+def test_prefix_fixes_first_rows():
+    solutions = list(solve_bitmask(8, (0, 4)))
+    assert solutions and all(solution[:2] == [0, 4] for solution in solutions)
+    assert count_bitmask(8, (0, 4)) == len(solutions)
+
+
+def test_is_valid_solution():
+    assert is_valid_solution([1, 3, 0, 2])
+    assert not is_valid_solution([0, 1, 2, 3])
+    assert not is_valid_solution([1, 3, 0, 4])
+    assert not is_valid_solution([1, 3, 0], 4)
+
+
+def test_unknown_engine():
+    with pytest.raises(ValueError):
+        get_engine('quantum')
+
+
+def test_symmetries():
+    images = symmetries([1, 3, 0, 2])
+    assert len(images) == 8
+    assert set(images) == {(1, 3, 0, 2), (2, 0, 3, 1)}
+    assert all(is_valid_solution(image) for image in symmetries([0, 4, 7, 5, 2, 6, 1, 3]))
+
+
+@pytest.mark.parametrize('engine', sorted(ORDERED_ENGINES))
+def test_unique_counts(engine):
+    assert [sum(1 for _ in iter_unique(n, engine)) for n in range(1, 11)] == UNIQUE
+
+
+@pytest.mark.parametrize('n', [1, 4, 6, 8])
+def test_symmetric_set_expands_every_solution(n):
+    expanded = solve_symmetric(n)
+    assert expanded.unique_count == UNIQUE[n - 1]
+    assert len(expanded) == TOTALS[n - 1]
+    assert sorted(map(tuple, expanded)) == sorted(map(tuple, solve_bitmask(n)))
+
+
+def test_symmetric_set_order():
+    expanded = SymmetricSolutionSet(8, list(iter_unique(8)))
+    members = list(expanded)
+    # Ordered by canonical solution, then by the sorted members of its class.
+    assert members[0] == list(expanded.unique[0])
+    start = 0
+    for k in range(expanded.unique_count):
+        size = len(expanded.class_members(k))
+        block = [tuple(member) for member in members[start:start + size]]
+        assert block == sorted(block) and block[0] == tuple(expanded.unique[k])
+        start += size
+    assert expanded[-1] == members[-1]
+    assert expanded[3:6] == members[3:6]
+    with pytest.raises(IndexError):
+        expanded[len(members)]
+
+
+def run_job(job):
+    result = {}
+    job.on_done = lambda solutions, progress, cancelled: result.update(
+        solutions=solutions, progress=progress, cancelled=cancelled)
+    job.start()
+    job.join(30)
+    return result
+
+
+def test_solver_job():
+    first, progress = [], []
+    job = SolverJob(8, on_solution=first.append, on_progress=progress.append)
+    result = run_job(job)
+    assert list(result['solutions']) == list(solve_bitmask(8))
+    assert first == [result['solutions'][0]]
+    assert result['progress'].solutions == 92 and result['progress'].nodes > 0
+    assert not result['cancelled']
+    assert [update.branch for update in progress if update.branch is not None][-1] == 7
+
+
+def test_solver_job_symmetric():
+    result = run_job(SolverJob(8, symmetric=True))
+    assert isinstance(result['solutions'], SymmetricSolutionSet)
+    assert len(result['solutions']) == 92 and result['solutions'].unique_count == 12
+
+
+def test_solver_job_cancel():
+    job = SolverJob(12)
+    job.on_solution = lambda solution: job.cancel()
+    result = run_job(job)
+    assert job.cancelled and result['cancelled']
+    assert len(result['solutions']) < 14200
+
+
+@pytest.mark.parametrize('depth', [None, 1, 2])
+def test_solve_parallel_keeps_serial_order(depth):
+    assert list(solve_parallel(9, workers=2, depth=depth)) == list(solve_bitmask(9))
+
+
+def test_solve_parallel_symmetric():
+    solutions = solve_parallel(9, workers=2, symmetric=True)
+    assert list(solutions.unique) == list(iter_unique(9))
+    assert len(solutions) == 352
+
+
+def test_count_parallel():
+    assert count_parallel(10, workers=2) == 724
+    assert count_parallel(3, workers=2) == 0
+
+
+@pytest.mark.parametrize('symmetric', [False, True])
+def test_parallel_solver_job(symmetric):
+    progress = []
+    result = run_job(SolverJob(8, symmetric=symmetric, workers=2, on_progress=progress.append))
+    assert len(result['solutions']) == 92 and not result['cancelled']
+    if not symmetric:
+        assert list(result['solutions']) == list(solve_bitmask(8))
+    assert [update.branch for update in progress] == list(range(4 if symmetric else 8))
+
+
+def test_parallel_solver_job_cancel():
+    job = SolverJob(12, workers=2)
+    job.on_solution = lambda solution: job.cancel()
+    result = run_job(job)
+    assert result['cancelled'] and len(result['solutions']) < 14200
+
+
+def test_solver_job_reuses_the_cache(tmp_path):
+    cache = SolutionCache(str(tmp_path))
+    first = SolverJob(8, cache=cache)
+    solved = run_job(first)
+    assert not first.cached and len(solved['solutions']) == 92
+    again = SolverJob(8, cache=cache)
+    reused = run_job(again)
+    assert again.cached
+    assert list(reused['solutions']) == list(solved['solutions'])
+    assert reused['progress'].solutions == 92 and not reused['cancelled']
+
+
+def test_cancelled_solve_is_not_cached(tmp_path):
+    cache = SolutionCache(str(tmp_path))
+    job = SolverJob(10, cache=cache)
+    job.on_solution = lambda solution: job.cancel()
+    run_job(job)
+    assert cache.load(10) is None
+
+
+def test_conflict_index_reports_changes():
+    index = ConflictIndex([(0, 0)])
+    assert index.add((1, 2)) == {(1, 2): False}
+    assert index.add((3, 2)) == {(1, 2): True, (3, 2): True}
+    assert index.add((4, 4)) == {(0, 0): True, (4, 4): True}
+    assert index.remove((3, 2)) == {(3, 2): False, (1, 2): False}
+    assert index.conflicted == {(0, 0), (4, 4)}
+    assert (4, 4) in index and (3, 2) not in index and len(index) == 3
+    assert index.queens_in_row(1) == {(1, 2)}
+    index.clear()
+    assert len(index) == 0 and not index.conflicted
+
+
+def test_conflict_index_matches_a_full_rescan():
+    rng = random.Random(0)
+    index = ConflictIndex()
+    placed = set()
+    states = {}
+    for _ in range(2000):
+        square = (rng.randrange(8), rng.randrange(8))
+        if square in placed:
+            placed.discard(square)
+            changed = index.remove(square)
+            states.pop(square)
+        else:
+            placed.add(square)
+            changed = index.add(square)
+        for position, is_conflict in changed.items():
+            if position in placed:
+                states[position] = is_conflict
+        expected = conflicting_queens(placed)
+        assert index.conflicted == expected
+        assert {position for position, is_conflict in states.items() if is_conflict} == expected
+
+
+def replay(events, n):
+    # Rebuilds the board from the trace, collecting it at every SOLUTION.
+    board, solutions = [], []
+    for event in events:
+        if event.kind == PLACE:
+            assert event.row == len(board)
+            board.append(event.col)
+        elif event.kind == BACKTRACK:
+            assert board[-1] == event.col and event.row == len(board) - 1
+            board.pop()
+        elif event.kind == SOLUTION:
+            assert len(board) == n and (event.row, event.col) == (n - 1, board[-1])
+            solutions.append(list(board))
+    assert board == []
+    return solutions
+
+
+@pytest.mark.parametrize('n', [1, 4, 6, 8])
+def test_trace_replays_the_search(n):
+    assert replay(trace_search(n), n) == list(solve_bitmask(n))
+
+
+def test_trace_job_hands_over_every_event():
+    job = TraceJob(6, buffer_chunks=2, chunk_size=16)
+    job.start()
+    events = []
+    deadline = time.monotonic() + 10
+    while not job.exhausted and time.monotonic() < deadline:
+        events.extend(job.next_events(limit=50))
+        time.sleep(0.001)
+    assert events == list(trace_search(6))
+    assert job.next_events() == []
+
+
+def test_trace_job_cancel():
+    job = TraceJob(12, buffer_chunks=1, chunk_size=8)
+    job.start()
+    assert len(job.next_events(limit=4)) <= 4
+    job.cancel()
+    job.join(5)
+    assert job.cancelled and not job._thread.is_alive()
+
+
+@pytest.mark.parametrize('method', sorted(FIRST_SOLUTION_METHODS))
+def test_first_solution_methods(method):
+    for n in (1, 4, 8, 9, 14, 20, 27):
+        assert is_valid_solution(first_solution(n, method), n)
+    assert first_solution(2, method) is None and first_solution(3, method) is None
+
+
+def test_constructive_covers_every_remainder():
+    for n in range(4, 200):
+        assert is_valid_solution(construct_solution(n), n)
+    assert is_valid_solution(first_solution(10 ** 5 + 1, 'constructive'))
+
+
+def test_first_solution_limits():
+    for method, limit in FIRST_SOLUTION_MAX_N.items():
+        with pytest.raises(ValueError):
+            first_solution(limit + 1, method)
+    with pytest.raises(ValueError):
+        first_solution(8, 'unknown')
+
+
+def run_first(n, method):
+    result = []
+    job = FirstSolutionJob(n, method, on_done=lambda columns, report: result.append((columns, report)))
+    job.start()
+    job.join(30)
+    return result[0]
+
+
+def test_first_solution_job():
+    columns, report = run_first(1000, 'constructive')
+    assert report.valid and report.error is None and is_valid_solution(columns)
+    columns, report = run_first(10 ** 6, 'min-conflicts')
+    assert columns is None and not report.valid and 'up to 100,000' in report.error
+
+
+def test_completions():
+    fixed = {(0, 0), (1, 4)}
+    completions = list(solve_completions(8, fixed))
+    assert completions == list(solve_bitmask(8, (0, 4)))
+    assert count_completions(8, fixed) == len(completions)
+    assert first_completion(8, fixed) == tuple(completions[0])
+    # Fixed queens may sit in any rows, not just the first ones.
+    scattered = {(3, 0), (6, 5)}
+    assert list(solve_completions(8, scattered)) == [solution for solution in solve_bitmask(8)
+                                                     if solution[3] == 0 and solution[6] == 5]
+
+
+def test_conflicting_placements_have_no_completion():
+    assert completion_masks(8, {(0, 0), (1, 1)}) is None
+    assert count_completions(8, {(0, 0), (1, 1)}) == 0
+    assert first_completion(8, {(0, 0), (2, 0)}) is None
+
+
+@pytest.mark.parametrize('n', [8, 14, 40])
+def test_hint_extends_to_a_solution(n):
+    fixed = {(0, 1)}
+    row, col = hint(n, fixed)
+    assert row != 0
+    assert first_dlx_solution(n, make_variant(n, fixed=fixed | {(row, col)})) is not None
+    assert hint(n, {(0, 0), (1, 1)}) is None
+
+
+def test_hint_on_a_full_board():
+    solution = list(solve_bitmask(6))[0]
+    assert hint(6, set(enumerate(solution))) is None
+
+
+def test_hint_job():
+    result = []
+    job = HintJob(8, {(0, 0)}, on_done=lambda square, timed_out: result.append((square, timed_out)))
+    job.start()
+    job.join(10)
+    (square, timed_out), = result
+    assert square is not None and not timed_out
+    assert first_completion(8, {(0, 0), square}) is not None
+
+
+@pytest.mark.parametrize('depth', [None, 1, 3])
+def test_solution_index_matches_enumeration(depth):
+    solutions = list(solve_bitmask(9))
+    index = SolutionIndex.build(9, depth)
+    assert len(index) == len(solutions)
+    assert list(index) == solutions
+    assert index[-1] == solutions[-1]
+    assert [index.rank(solution) for solution in solutions[::41]] == list(range(0, len(solutions), 41))
+    with pytest.raises(ValueError):
+        index.rank([0] * 9)
+    with pytest.raises(IndexError):
+        index[len(solutions)]
+
+
+def test_solution_index_build_cancel():
+    assert SolutionIndex.build(10, cancelled=lambda: True) is None
+
+
+def test_load_index_saves_counts(tmp_path):
+    cache = SolutionCache(str(tmp_path))
+    built, cached = load_index(10, cache)
+    assert not cached and len(built) == 724
+    loaded, cached = load_index(10, cache)
+    assert cached and loaded[500] == built[500]
+
+
+def test_index_job(tmp_path):
+    result = {}
+    job = IndexJob(9, SolutionCache(str(tmp_path)), on_done=lambda index, progress, cancelled: result.update(
+        index=index, progress=progress, cancelled=cancelled))
+    job.start()
+    job.join(30)
+    assert len(result['index']) == 352 and result['progress'].solutions == 352
+    assert not job.cached and not result['cancelled']
+
+
+def test_solver_job_does_not_cache_dlx(tmp_path):
+    cache = SolutionCache(str(tmp_path))
+    result = run_job(SolverJob(6, engine='dlx', cache=cache))
+    assert sorted(map(tuple, result['solutions'])) == sorted(map(tuple, solve_bitmask(6)))
+    assert cache.load(6) is None
+
+
+def test_solver_job_variant():
+    variant = make_variant(5, toroidal=True)
+    result = run_job(SolverJob(5, variant=variant, symmetric=True, workers=2))
+    assert len(result['solutions']) == 10 and not isinstance(result['solutions'], SymmetricSolutionSet)
@@ -0,0 +1,45 @@
+import pytest
+
+from nqueens_solver import solve_bitmask
+from nqueens_store import SolutionStore, record_width
+
+
+@pytest.mark.parametrize('n', [1, 5, 8, 16, 17])
+def test_round_trip(n):
+    solutions = [[(row * 3 + k) % n for row in range(n)] for k in range(5)]
+    store = SolutionStore.from_solutions(n, solutions)
+    assert len(store) == 5
+    assert list(store) == solutions
+    assert store[-1] == solutions[-1]
+    assert store[1:4] == solutions[1:4]
+    assert store.nbytes == 5 * record_width(n)
+    assert list(SolutionStore(n, store.tobytes())) == solutions
+
+
+def test_record_width():
+    assert [record_width(n) for n in (1, 2, 7, 16, 17, 255)] == [1, 1, 4, 8, 17, 255]
+
+
+def test_extend_and_chunks():
+    solutions = list(solve_bitmask(8))
+    store = SolutionStore.from_solutions(8, solutions)
+    copy = SolutionStore(8)
+    copy.extend(store)
+    assert list(copy) == solutions
+    chunks = list(store.chunks(10))
+    assert len(chunks) == 10
+    rebuilt = SolutionStore(8)
+    for chunk in chunks:
+        rebuilt.frombytes(chunk)
+    assert list(rebuilt) == solutions
+
+
+def test_rejects_bad_input():
+    with pytest.raises(ValueError):
+        SolutionStore(256)
+    with pytest.raises(ValueError):
+        SolutionStore(8, b'\x00' * 5)
+    with pytest.raises(ValueError):
+        SolutionStore(8).frombytes(b'\x00' * 3)
+    with pytest.raises(IndexError):
+        SolutionStore(8)[0]